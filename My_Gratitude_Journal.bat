@@ -32,6 +32,8 @@
 ::
 ::978f952a14a936cc963da21a135fa983
 @echo off
+rem With "journal serve" running (e.g. started from the Startup folder) the window
+rem only connects to it instead of opening and scanning the journal itself
 cd /d "C:\_tools\Gratitude_Journal"
 python gratitude_journal.py
 pause
\ No newline at end of file
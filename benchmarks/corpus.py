@@ -0,0 +1,122 @@
+"""Synthetic journal corpus generator for the benchmarks.
+
+Writes entries in both on-disk formats - the native "## Three things I'm
+grateful for today:" files and the "Imported from Presently" files - plus
+matching Presently backup CSVs. Output is deterministic for a given seed:
+dates count back from a fixed anchor day, and large corpora put several
+entries on each day so a million entries still span about ten years.
+
+    python benchmarks/corpus.py journal OUT_DIR --entries 10000
+    python benchmarks/corpus.py presently OUT.csv --rows 10000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal_entries import format_presently_entry  # noqa: E402
+from journal_writer import FilenameAllocator  # noqa: E402
+
+WORDS = (
+    "family friends morning coffee sunshine walk music kindle book garden rain "
+    "dinner laughter health sleep music practice piano guitar river park dog cat "
+    "colleagues conversation patience kindness home quiet evening tea bike ride "
+    "mountains sea holiday train letter phone call mum dad sister brother partner "
+    "neighbour community progress lesson recovery routine gratitude breakfast"
+).split()
+
+NATIVE_HEADERS = {
+    1: "## One thing I'm grateful for today:",
+    2: "## Two things I'm grateful for today:",
+    3: "## Three things I'm grateful for today:",
+}
+
+# Newest corpus date; fixed so a seed always gives the same files
+ANCHOR_DATE = date(2024, 12, 31)
+
+# Days a corpus spans at most before days start holding several entries
+SPAN_DAYS = 3650
+
+
+def random_item(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(5, 30))]
+    return "I'm grateful for " + " ".join(words) + "."
+
+
+def iter_dated_entries(count, seed=0, presently_share=0.3):
+    """Yield (date_str, items, is_presently) going back a day at a time from ANCHOR_DATE.
+
+    Each day holds count / SPAN_DAYS entries (at least one) and about one day
+    in ten one more, so the _N counter suffixes are exercised too and the
+    dates never run past SPAN_DAYS back, however large count is.
+    """
+    rng = random.Random(seed)
+    per_day = max(1, -(-count // SPAN_DAYS))
+    day = ANCHOR_DATE
+    produced = 0
+    while produced < count:
+        for _ in range(per_day + (1 if rng.random() < 0.1 else 0)):
+            if produced >= count:
+                break
+            items = [random_item(rng) for _ in range(rng.choice((1, 2, 3, 3, 3, 4)))]
+            yield day.isoformat(), items, rng.random() < presently_share
+            produced += 1
+        day -= timedelta(days=1)
+
+
+def native_content(items):
+    header = NATIVE_HEADERS.get(len(items), f"## {len(items)} things I'm grateful for today:")
+    gratitude_list = "\n".join([f"{i+1}. {item}" for i, item in enumerate(items)])
+    return f"{header}\n{gratitude_list}\n\n---\nTags: #gratitude"
+
+
+def write_journal(folder_path, count, seed=0, presently_share=0.3):
+    """Write count entry files into folder_path; returns the number written."""
+    os.makedirs(folder_path, exist_ok=True)
+    allocator = FilenameAllocator(folder_path)
+    for date_str, items, is_presently in iter_dated_entries(count, seed, presently_share):
+        content = format_presently_entry(items) if is_presently else native_content(items)
+        with open(allocator.allocate(date_str), 'w', encoding='utf-8') as f:
+            f.write(content)
+    return count
+
+
+def write_presently_csv(csv_path, rows, seed=1):
+    """Write a Presently backup CSV with rows entries; returns rows."""
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['entryDate', 'entryContent'])
+        for date_str, items, _ in iter_dated_entries(rows, seed):
+            writer.writerow([date_str, "\n\n".join(items)])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic gratitude journal corpus.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    journal_parser = subparsers.add_parser('journal', help="write .md entry files")
+    journal_parser.add_argument('folder')
+    journal_parser.add_argument('--entries', type=int, default=1000)
+    journal_parser.add_argument('--presently-share', type=float, default=0.3)
+    journal_parser.add_argument('--seed', type=int, default=0)
+
+    presently_parser = subparsers.add_parser('presently', help="write a Presently backup CSV")
+    presently_parser.add_argument('csv_path')
+    presently_parser.add_argument('--rows', type=int, default=1000)
+    presently_parser.add_argument('--seed', type=int, default=1)
+
+    args = parser.parse_args(argv)
+    if args.command == 'journal':
+        write_journal(args.folder, args.entries, args.seed, args.presently_share)
+    else:
+        write_presently_csv(args.csv_path, args.rows, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""Headless benchmark suite for the gratitude journal.
+
+Generates synthetic journals (see corpus.py) at each requested size and times
+startup, random-entry lookups, the save path, Presently import throughput,
+search, statistics and whole-journal loads, without opening any Tk windows. Results are
+written as JSON so runs can be compared across versions:
+
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --output bench.json
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import corpus  # noqa: E402
+from journal_archive import PackedArchive  # noqa: E402
+from journal_core import Journal  # noqa: E402
+from journal_import import PresentlyImporter  # noqa: E402
+from journal_index import INDEX_FILENAME, discard_index, open_journal_index  # noqa: E402
+from journal_loader import EntryLoader  # noqa: E402
+from journal_search import SearchIndex  # noqa: E402
+from journal_stats import JournalStats  # noqa: E402
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def latency_summary(samples):
+    samples = sorted(samples)
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p95_ms': samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000,
+    }
+
+
+def peak_memory(fn, *args):
+    """Peak Python heap allocation in MiB while running fn."""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_startup(runs=5):
+    """Interpreter start plus importing the app module (no window is created)."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", "import gratitude_journal"],
+            cwd=REPO_DIR, check=True
+        )
+        samples.append(time.perf_counter() - started)
+    return latency_summary(samples)
+
+
+def bench_size(size, work_dir, lookups, saves, measure_memory):
+    journal_dir = os.path.join(work_dir, f"journal_{size}")
+    results = {'entries': size}
+
+    results['generate_s'], _ = timed(corpus.write_journal, journal_dir, size)
+
+    results['index_cold_build_s'], index = timed(open_journal_index, [journal_dir])
+    index.close()
+    results['index_warm_open_s'], index = timed(open_journal_index, [journal_dir])
+    if measure_memory:
+        # Windows will not delete a database that is still open
+        index.close()
+        discard_index(os.path.join(journal_dir, INDEX_FILENAME))
+        results['index_cold_build_peak_mib'] = peak_memory(
+            lambda: open_journal_index([journal_dir]).close()
+        )
+        index = open_journal_index([journal_dir])
+
+    # show_random_entry minus the widgets: index pick + cached load, then
+    # viewing the same entries again, which should be served from the cache
+    app = Journal([journal_dir], watch=True)
+    app_index = app.get_index()
+    cold, warm, seen = [], [], []
+    for _ in range(lookups):
+        seconds, entry = timed(app.load_random_entry)
+        cold.append(seconds)
+        seen.append(entry.path)
+    for path in seen:
+        indexed = app_index.get_by_path(path)
+        seconds, _ = timed(app.entry_loader.load, path, (indexed.mtime, indexed.size))
+        warm.append(seconds)
+    results['random_entry'] = latency_summary(cold)
+    results['random_entry_repeat'] = latency_summary(warm)
+    stats = app.entry_loader.stats()
+    results['random_entry_cache'] = {'hits': stats.hits, 'misses': stats.misses}
+
+    save_samples = []
+    for number in range(saves):
+        seconds, _ = timed(app.write_entry, [f"benchmark save {number}", "two", "three"])
+        save_samples.append(seconds)
+    results['save'] = latency_summary(save_samples)
+    app.close()
+
+    search = SearchIndex(index)
+    query_samples = []
+    for query in ("family", "morning coffee", '"long walk"', "music from:2020-01-01"):
+        for _ in range(5):
+            seconds, _ = timed(search.search, query)
+            query_samples.append(seconds)
+    results['search'] = latency_summary(query_samples)
+
+    stats = JournalStats(index)
+    results['stats_rebuild_s'], _ = timed(stats.rebuild)
+    results['stats_summary_s'], _ = timed(stats.summary)
+
+    loader = EntryLoader(max_entries=0)
+    results['load_all_markdown_s'], _ = timed(
+        lambda: [loader.load(entry.path) for entry in index.all_entries()]
+    )
+    archive = PackedArchive(journal_dir)
+    results['archive_build_s'], _ = timed(archive.rebuild, index.all_entries())
+    results['archive_load_all_s'], _ = timed(archive.load_all)
+    index.close()
+
+    csv_path = os.path.join(work_dir, f"presently_{size}.csv")
+    corpus.write_presently_csv(csv_path, size)
+    import_dir = os.path.join(work_dir, f"import_{size}")
+    os.makedirs(import_dir)
+    importer = PresentlyImporter(csv_path, import_dir)
+    import_result = importer.run()
+    results['import'] = {
+        'rows': import_result.imported + import_result.skipped + import_result.failed,
+        'seconds': import_result.elapsed,
+        'rows_per_second': (import_result.imported + import_result.skipped + import_result.failed) / max(import_result.elapsed, 1e-9),
+    }
+    if measure_memory:
+        shutil.rmtree(import_dir)
+        os.makedirs(import_dir)
+        results['import']['peak_mib'] = peak_memory(PresentlyImporter(csv_path, import_dir).run)
+
+    shutil.rmtree(journal_dir)
+    shutil.rmtree(import_dir)
+    os.remove(csv_path)
+    return results
+
+
+def compare(old_path, new_path):
+    """Print the relative change of every numeric timing between two result files."""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = {run['entries']: run for run in json.load(f)['runs']}
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = {run['entries']: run for run in json.load(f)['runs']}
+
+    def flatten(prefix, value, out):
+        if isinstance(value, dict):
+            for key, inner in value.items():
+                flatten(f"{prefix}.{key}" if prefix else key, inner, out)
+        elif isinstance(value, (int, float)):
+            out[prefix] = value
+        return out
+
+    for size in sorted(set(old) & set(new)):
+        before, after = flatten("", old[size], {}), flatten("", new[size], {})
+        print(f"{size} entries")
+        for key in sorted(set(before) & set(after)):
+            if before[key]:
+                change = (after[key] - before[key]) / before[key] * 100
+                print(f"  {key:40s} {before[key]:12.4f} -> {after[key]:12.4f} ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the gratitude journal headless.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help="journal sizes in entries (1k to 1M)")
+    parser.add_argument('--lookups', type=int, default=200, help="random-entry lookups per size")
+    parser.add_argument('--saves', type=int, default=20, help="saves per size")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc passes")
+    parser.add_argument('--work-dir', help="where to generate corpora (default: a temp dir)")
+    parser.add_argument('--output', help="write the JSON results here instead of stdout")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two result files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="gratitude_bench_")
+    try:
+        report = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'startup': bench_startup(),
+            'runs': [],
+        }
+        for size in args.sizes:
+            print(f"Benchmarking {size} entries...", file=sys.stderr)
+            report['runs'].append(
+                bench_size(size, work_dir, args.lookups, args.saves, not args.no_memory)
+            )
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,528 @@
+import time
+
+# Taken before anything else is imported, for the startup timing report
+_MODULE_START = time.perf_counter()
+
 import tkinter as tk
-from tkinter import messagebox, ttk, filedialog
+from tkinter import messagebox
 from datetime import datetime
+import json
 import os
 import sys
-import random
-import glob
-import re
-import csv
+
+# Only the modules needed to show the entry field are imported up front; the
+# index, search, import, archive and executor modules (and ttk, filedialog and
+# re) are imported on first use to keep the daily launch fast.
+import journal_trace
+from journal_core import Journal
+from journal_folders import load_folder_config
+from journal_trace import traced
+
+STARTUP_REPORT_ENV_VAR = "GRATITUDE_STARTUP_REPORT"
+STARTUP_LOG_FILENAME = "startup_times.jsonl"
+
+
+def _process_age():
+    """Seconds since this process was created, or None if the OS won't say."""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+            creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.GetProcessTimes(
+                kernel32.GetCurrentProcess(), ctypes.byref(creation),
+                ctypes.byref(exit_time), ctypes.byref(kernel), ctypes.byref(user)
+            ):
+                return None
+            # FILETIME counts 100ns ticks since 1601-01-01
+            ticks = (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+            return time.time() - (ticks / 10_000_000 - 11_644_473_600)
+        with open('/proc/self/stat', 'r') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupTimer:
+    """Records launch milestones when --startup-report or GRATITUDE_STARTUP_REPORT is set
+
+    Times are relative to this module starting to load; the interpreter's own
+    start-up, where the OS reports it, is added as "interpreter". Each report
+    is printed and appended to startup_times.jsonl next to the app so cold
+    (first launch after boot) and warm launches can be compared over time.
+    """
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.marks = []
+        if enabled:
+            process_age = _process_age()
+            self.interpreter = None
+            if process_age is not None:
+                self.interpreter = max(process_age - (time.perf_counter() - _MODULE_START), 0.0)
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - _MODULE_START))
+
+    def report(self):
+        if not self.enabled:
+            return
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'interpreter_ms': None if self.interpreter is None else round(self.interpreter * 1000, 1),
+        }
+        print("Startup timing (ms since module load):")
+        if self.interpreter is not None:
+            print(f"  {'interpreter':16s} {self.interpreter * 1000:8.1f} (before module load)")
+        for name, seconds in self.marks:
+            record[f"{name}_ms"] = round(seconds * 1000, 1)
+            print(f"  {name:16s} {seconds * 1000:8.1f}")
+
+        log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), STARTUP_LOG_FILENAME)
+        try:
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Could not write {log_path}: {str(e)}")
+
+
+class ProgressDialog:
+    """Modal progress window for long-running background work"""
+
+    def __init__(self, parent, title, on_cancel=None):
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry("360x150")
+        self.window.resizable(False, False)
+        self.window.configure(bg='#f0f8ff')
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.on_cancel = on_cancel
+
+        self.status_label = tk.Label(
+            self.window,
+            text="Starting...",
+            font=("Arial", 10),
+            bg='#f0f8ff',
+            fg='#2c3e50',
+            justify='center'
+        )
+        self.status_label.pack(pady=(15, 5))
+
+        from tkinter import ttk
+        self.progress_bar = ttk.Progressbar(self.window, length=300, mode='determinate', maximum=1.0)
+        self.progress_bar.pack(pady=5)
+
+        self.cancel_btn = tk.Button(
+            self.window,
+            text="Cancel",
+            command=self.cancel,
+            font=("Arial", 10),
+            bg='#95a5a6',
+            fg='white',
+            padx=15,
+            pady=3,
+            relief='raised',
+            bd=2,
+            cursor='hand2'
+        )
+        self.cancel_btn.pack(pady=10)
+        self.window.grab_set()
+
+    def update_progress(self, fraction, text):
+        self.progress_bar['value'] = fraction
+        self.status_label.config(text=text)
+
+    def cancel(self):
+        if self.on_cancel is not None:
+            self.on_cancel()
+        self.cancel_btn.config(state='disabled', text="Cancelling...")
+
+    def close(self):
+        self.window.grab_release()
+        self.window.destroy()
+
+
+class RandomEntryViewer:
+    """The random entry window, built once and refilled in place for each entry
+
+    Item labels are pooled: showing an entry reconfigures the existing labels,
+    creates more only when an entry is longer than any shown before, and
+    hides the spares. Closing the window only withdraws it.
+    """
+
+    def __init__(self, parent, on_another):
+        # Create new window
+        self.window = tk.Toplevel(parent)
+        self.window.title("Random Gratitude Entry")
+        self.window.geometry("450x400")
+        self.window.resizable(True, True)
+        self.window.configure(bg='#f0f8ff')
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        # Center the window
+        self.window.update_idletasks()
+        x = (self.window.winfo_screenwidth() // 2) - (450 // 2)
+        y = (self.window.winfo_screenheight() // 2) - (400 // 2)
+        self.window.geometry(f"450x400+{x}+{y}")
+
+        # Title
+        title_label = tk.Label(
+            self.window,
+            text="Random Gratitude Entry",
+            font=("Arial", 16, "bold"),
+            bg='#f0f8ff',
+            fg='#2c3e50'
+        )
+        title_label.pack(pady=15)
+
+        # Date
+        self.date_label = tk.Label(
+            self.window,
+            text="",
+            font=("Arial", 12),
+            bg='#f0f8ff',
+            fg='#7f8c8d'
+        )
+        self.date_label.pack(pady=5)
+
+        # Button frame FIRST (to reserve space at bottom)
+        button_frame = tk.Frame(self.window, bg='#f0f8ff')
+        button_frame.pack(side='bottom', pady=10, fill='x')
+
+        # Main container frame (fills remaining space)
+        main_container = tk.Frame(self.window, bg='#f0f8ff')
+        main_container.pack(pady=(10,0), padx=20, fill='both', expand=True)
+
+        # Create canvas and scrollbar for scrollable content
+        self.canvas = tk.Canvas(main_container, bg='#f0f8ff', highlightthickness=0)
+        scrollbar = tk.Scrollbar(main_container, orient="vertical", command=self.canvas.yview)
+        self.scrollable_frame = tk.Frame(self.canvas, bg='#f0f8ff')
+
+        self.scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        )
+
+        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+
+        # Pack canvas and scrollbar
+        self.canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Pooled item labels, reused from entry to entry
+        self.item_labels = []
+        self.items_shown = 0
+
+        # Create an inner frame to center the buttons
+        inner_button_frame = tk.Frame(button_frame, bg='#f0f8ff')
+        inner_button_frame.pack()
+
+        # View Another Random Entry button
+        self.another_btn = tk.Button(
+            inner_button_frame,
+            text="View Another Random Entry",
+            command=on_another,
+            font=("Arial", 10),
+            bg='#3498db',
+            fg='white',
+            padx=15,
+            pady=5,
+            relief='raised',
+            bd=2,
+            cursor='hand2'
+        )
+        self.another_btn.pack(side='left', padx=5)
+
+        # Close button
+        close_btn = tk.Button(
+            inner_button_frame,
+            text="Close",
+            command=self.hide,
+            font=("Arial", 10),
+            bg='#95a5a6',
+            fg='white',
+            padx=15,
+            pady=5,
+            relief='raised',
+            bd=2,
+            cursor='hand2'
+        )
+        close_btn.pack(side='left', padx=5)
+
+        # Bind mousewheel to canvas for scrolling, for this window only
+        def _on_mousewheel(event):
+            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+
+        self.window.bind("<MouseWheel>", _on_mousewheel)
+
+    def exists(self):
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def show(self, date_str, gratitude_items):
+        self.date_label.config(text=date_str)
+
+        for i, item in enumerate(gratitude_items, 1):
+            if i > len(self.item_labels):
+                self.item_labels.append(tk.Label(
+                    self.scrollable_frame,
+                    font=("Arial", 11),
+                    bg='#f0f8ff',
+                    fg='#2c3e50',
+                    wraplength=380,
+                    justify='left'
+                ))
+            label = self.item_labels[i - 1]
+            label.config(text=f"{i}. {item.strip()}")
+            if i > self.items_shown:
+                label.pack(pady=8, anchor='w', padx=10)
+
+        # Spare labels stay in the pool, just not on screen
+        for label in self.item_labels[len(gratitude_items):self.items_shown]:
+            label.pack_forget()
+        self.items_shown = len(gratitude_items)
+
+        self.canvas.yview_moveto(0)
+        self.set_loading(False)
+        self.window.deiconify()
+        self.window.lift()
+
+    def set_loading(self, loading):
+        self.another_btn.config(text="Loading..." if loading else "View Another Random Entry")
+
+    def hide(self):
+        self.window.withdraw()
+
+
+class TimelineWindow:
+    """Chronological browser over every entry, drawing only the rows in view
+
+    Rows have a fixed height, so the scroll position maps straight to a
+    timeline position. A pool of row widgets just big enough to fill the
+    window is placed at the visible offsets and refilled as it scrolls;
+    pages of entries are loaded on the I/O executor and rows show
+    "Loading..." until theirs arrives.
+    """
+
+    ROW_HEIGHT = 96
+
+    def __init__(self, parent, timeline, io, on_open_entry):
+        self.timeline = timeline
+        self.io = io
+        self.on_open_entry = on_open_entry
+        self.top = 0  # scroll position in pixels
+        self.rows = []
+        self.pending_pages = set()
+        self.reloading = False
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Journal Timeline")
+        self.window.geometry("520x560")
+        self.window.configure(bg='#f0f8ff')
+
+        # Jump-to-date row
+        jump_frame = tk.Frame(self.window, bg='#f0f8ff')
+        jump_frame.pack(pady=(15, 5), padx=20, fill='x')
+
+        self.jump_var = tk.StringVar()
+        jump_field = tk.Entry(
+            jump_frame,
+            textvariable=self.jump_var,
+            font=("Arial", 11),
+            width=14,
+            relief='ridge',
+            bd=2
+        )
+        jump_field.pack(side='left')
+        jump_field.bind('<Return>', lambda event: self.go_to_date())
+
+        jump_btn = tk.Button(
+            jump_frame,
+            text="Go to Date",
+            command=self.go_to_date,
+            font=("Arial", 10),
+            bg='#3498db',
+            fg='white',
+            padx=10,
+            pady=1,
+            relief='raised',
+            bd=2,
+            cursor='hand2'
+        )
+        jump_btn.pack(side='left', padx=(10, 0))
+
+        self.count_label = tk.Label(
+            jump_frame,
+            text="",
+            font=("Arial", 9),
+            bg='#f0f8ff',
+            fg='#7f8c8d'
+        )
+        self.count_label.pack(side='right')
+
+        # Viewport: rows are placed inside it, the scrollbar is virtual
+        body = tk.Frame(self.window, bg='#f0f8ff')
+        body.pack(pady=(5, 15), padx=20, fill='both', expand=True)
+        self.scrollbar = tk.Scrollbar(body, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport = tk.Frame(body, bg='#f0f8ff')
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind('<Configure>', lambda event: self.render())
+
+        self.window.bind('<MouseWheel>', lambda event: self.scroll_by(-event.delta / 120 * self.ROW_HEIGHT / 2))
+        self.window.bind('<Up>', lambda event: self.scroll_by(-self.ROW_HEIGHT))
+        self.window.bind('<Down>', lambda event: self.scroll_by(self.ROW_HEIGHT))
+        self.window.bind('<Prior>', lambda event: self.scroll_by(-self.viewport.winfo_height()))
+        self.window.bind('<Next>', lambda event: self.scroll_by(self.viewport.winfo_height()))
+
+    def exists(self):
+        try:
+            return bool(self.window.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def make_row(self):
+        frame = tk.Frame(self.viewport, bg='#f0f8ff', bd=1, relief='groove', cursor='hand2')
+        date_label = tk.Label(
+            frame,
+            font=("Arial", 10, "bold"),
+            bg='#f0f8ff',
+            fg='#2c3e50',
+            anchor='w'
+        )
+        date_label.pack(fill='x', padx=8, pady=(4, 0))
+        text_label = tk.Label(
+            frame,
+            font=("Arial", 10),
+            bg='#f0f8ff',
+            fg='#2c3e50',
+            wraplength=430,
+            justify='left',
+            anchor='nw'
+        )
+        text_label.pack(fill='both', expand=True, padx=8, pady=(0, 4))
+        row = {'frame': frame, 'date': date_label, 'text': text_label, 'entry': None}
+        for widget in (frame, date_label, text_label):
+            widget.bind('<Button-1>', lambda event, row=row: row['entry'] and self.on_open_entry(row['entry']))
+        return row
+
+    def render(self):
+        if not self.exists():
+            return
+        if self.timeline.stale and not self.reloading:
+            # Entries were saved, imported or synced: pick up the new order
+            self.reloading = True
+            self.io.submit(self.timeline.reload, on_success=self.on_reloaded,
+                           description="Reloading the timeline", quiet=True)
+
+        count = len(self.timeline)
+        view_height = max(self.viewport.winfo_height(), 1)
+        total_height = max(count * self.ROW_HEIGHT, 1)
+        self.top = max(0, min(self.top, total_height - view_height))
+
+        # Just enough rows to cover the viewport, reused as it scrolls
+        needed = view_height // self.ROW_HEIGHT + 2
+        while len(self.rows) < needed:
+            self.rows.append(self.make_row())
+
+        first, offset = divmod(int(self.top), self.ROW_HEIGHT)
+        for i, row in enumerate(self.rows):
+            position = first + i
+            if i >= needed or position >= count:
+                row['frame'].place_forget()
+                continue
+            entry = self.timeline.entry_at(position)
+            if entry is None:
+                self.request_page(position // self.timeline.page_size)
+            self.fill_row(row, entry)
+            row['frame'].place(x=0, y=i * self.ROW_HEIGHT - offset, relwidth=1.0, height=self.ROW_HEIGHT - 4)
+
+        # Warm the page after the last visible row
+        next_position = first + needed
+        if next_position < count:
+            self.request_page(next_position // self.timeline.page_size)
+
+        self.scrollbar.set(self.top / total_height, min((self.top + view_height) / total_height, 1.0))
+        self.count_label.config(text=f"{count} entries")
+
+    def fill_row(self, row, entry):
+        if entry is row['entry'] and entry is not None:
+            return
+        row['entry'] = entry
+        if entry is None:
+            row['date'].config(text="")
+            row['text'].config(text="Loading...")
+            return
+        row['date'].config(text=entry.date or "Unknown Date")
+        text = "\n".join(f"{i}. {item}" for i, item in enumerate(entry.items, 1))
+        row['text'].config(text=text if len(text) <= 240 else text[:237] + "...")
+
+    def request_page(self, page_number):
+        if page_number in self.pending_pages or self.timeline.cached_page(page_number) is not None:
+            return
+        self.pending_pages.add(page_number)
+
+        def loaded(page):
+            self.pending_pages.discard(page_number)
+            self.render()
+
+        def failed(error):
+            self.pending_pages.discard(page_number)
+            print(f"Could not load timeline page {page_number}: {str(error)}")
+
+        self.io.submit(self.timeline.load_page, page_number, on_success=loaded, on_error=failed,
+                       description="Loading timeline entries", quiet=True)
+
+    def on_reloaded(self, result=None):
+        self.reloading = False
+        self.pending_pages.clear()
+        self.render()
+
+    def scroll_by(self, pixels):
+        self.top += pixels
+        self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.top = float(amount) * len(self.timeline) * self.ROW_HEIGHT
+        elif unit == 'pages':
+            self.top += int(amount) * self.viewport.winfo_height()
+        else:
+            self.top += int(amount) * self.ROW_HEIGHT
+        self.render()
+
+    def go_to_date(self):
+        date_str = self.jump_var.get().strip()
+        if not date_str or not len(self.timeline):
+            return
+        self.top = self.timeline.position_of(date_str) * self.ROW_HEIGHT
+        self.render()
+
 
 class GratitudeJournal:
-    JOURNAL_FOLDER_PATHS = [
-        r"E:\.shortcut-targets-by-id\1SfWBu4Xcf-45vCVl2D6nlal18FFde6c5\62.50 Gratitude Journal",
-        r"D:\.shortcut-targets-by-id\1SfWBu4Xcf-45vCVl2D6nlal18FFde6c5\62.50 Gratitude Journal",
-        r"G:\.shortcut-targets-by-id\1SfWBu4Xcf-45vCVl2D6nlal18FFde6c5\62.50 Gratitude Journal"
-    ]
-    SAVE_FOLDER_PATHS = JOURNAL_FOLDER_PATHS[1:]  # exclude C: drive for saving
-
-    def __init__(self):
+    # See journal_folders.py for the defaults and how to override them
+    JOURNAL_FOLDER_PATHS, SAVE_FOLDER_PATHS = load_folder_config()
+
+    # Seconds to wait on the journal drives before giving up
+    DRIVE_TIMEOUT = 20
+
+    def __init__(self, startup_timer=None, no_service=False):
+        self.startup_timer = startup_timer or StartupTimer(False)
+        self.startup_timer.mark("imports")
+
         self.root = tk.Tk()
         self.root.title("My Gratitude Journal")
         self.root.geometry("500x400")
@@ -37,11 +543,128 @@ class GratitudeJournal:
         # Variables to store gratitude entries
         self.gratitude_entries = []
         self.current_entry = 0
+
+        # Everything that is not UI lives in the headless core (see journal_cli.py)
+        self.journal = Journal(self.JOURNAL_FOLDER_PATHS, self.SAVE_FOLDER_PATHS, watch=True)
+        # A running "journal serve" answers random entries, saves and searches
+        # from its warm index, so this window never has to open its own
+        self.service = None if no_service else self.connect_service()
+
+        # All disk I/O runs on a background executor, created on first use, so
+        # slow or offline drives never freeze the window
+        self._io = None
+        self.foreground_task = None
+
+        self.timeline_window = None
+
+        # The random entry window and the entry prefetched for its next click
+        self.random_viewer = None
+        self.prefetched_entry = None
+        self.prefetch_task = None
+        self.waiting_for_prefetch = False
+        # When the current click asked for an entry, while tracing
+        self.random_requested_at = None
+        # The first index build, and the actions waiting for it to finish
+        self.index_task = None
+        self.waiting_for_index = []
+        self.startup_timer.mark("window")
         
-        # Create the UI
+        # Create the UI: the entry field first, everything else once it is shown
         self.create_menu()
         self.create_widgets()
-        
+        self.startup_timer.mark("entry_ready")
+        self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        self.startup_timer.mark("first_paint")
+        self.create_secondary_widgets()
+        self.startup_timer.mark("secondary_ready")
+        self.startup_timer.report()
+
+        if self.service is None:
+            # Without a warm service, index the journal now so the first
+            # shuffle or search does not have to
+            self.start_index_build()
+
+        if len(self.journal.mirror_folder_paths) > 1:
+            # Copy over whatever a mirror drive missed while it was offline
+            self.io.submit(
+                self.journal.reconcile_mirrors,
+                on_error=lambda error: print(f"Could not reconcile mirror folders: {str(error)}"),
+                description="Reconciling mirror folders",
+                quiet=True,
+                cancellable=False
+            )
+
+    def start_index_build(self):
+        """Open (on a first run, build) the entry index in the background.
+
+        On a large journal on Drive this takes longer than DRIVE_TIMEOUT, so
+        it runs without one; actions needing the index wait for it through
+        wait_for_index() instead of timing out while it is still going.
+        """
+        if self.index_task is not None or self.journal.index is not None:
+            return
+
+        def finished(result=None):
+            waiting, self.waiting_for_index = self.waiting_for_index, []
+            for action, args in waiting:
+                action(*args)
+
+        def failed(error):
+            print(f"Could not open the entry index: {str(error)}", file=sys.stderr)
+            # Each action retries and reports the problem itself
+            finished()
+
+        self.index_task = self.io.submit(
+            self.journal.warm_up,
+            on_success=finished,
+            on_error=failed,
+            description="Indexing the journal",
+            cancellable=False
+        )
+
+    def wait_for_index(self, action, *args):
+        """Run action(*args) once the index build is done; False if it already is.
+
+        Call first thing in an action that reads the index:
+        "if self.wait_for_index(self.open_x): return".
+        """
+        if self.journal.index is not None:
+            return False
+        self.start_index_build()
+        if self.index_task.finished:
+            return False
+        self.waiting_for_index.append((action, args))
+        return True
+
+    def connect_service(self):
+        from journal_service import RemoteJournal, ServiceClient
+
+        client = ServiceClient.connect()
+        return None if client is None else RemoteJournal(client)
+
+    def via_service(self, name, *args):
+        """Call Journal.name(*args) on the running service if connected, otherwise here."""
+        service = self.service
+        if service is not None:
+            try:
+                return getattr(service, name)(*args)
+            except ConnectionError:
+                # The service has stopped, or timed out; carry on without it.
+                # A save cut off mid-request may be written twice, which
+                # dedupe tidies up.
+                self.service = None
+                service.close()
+        return getattr(self.journal, name)(*args)
+
+    @property
+    def io(self):
+        if self._io is None:
+            from journal_tasks import BackgroundExecutor
+            self._io = BackgroundExecutor(self.root, on_busy_changed=self.set_busy)
+        return self._io
+
     def center_window(self):
         self.root.update_idletasks()
         x = (self.root.winfo_screenwidth() // 2) - (500 // 2)
@@ -55,6 +678,30 @@ class GratitudeJournal:
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Import from Presently", command=self.import_from_presently)
+        file_menu.add_command(label="Import Markdown Vault...", command=self.import_markdown_vault)
+        file_menu.add_command(label="Export Journal...", command=self.export_journal)
+        file_menu.add_command(label="Build Packed Archive", command=self.build_packed_archive)
+        file_menu.add_command(label="Remove Duplicate Entries...", command=self.remove_duplicate_entries)
+
+        view_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="View", menu=view_menu)
+        view_menu.add_command(label="Search Entries...", command=self.open_search_window)
+        view_menu.add_command(label="Timeline...", command=self.open_timeline_window)
+        view_menu.add_command(label="On This Day...", command=self.open_on_this_day_window)
+        view_menu.add_command(label="This Week, Years Ago...", command=lambda: self.open_on_this_day_window(1))
+        view_menu.add_command(label="Statistics...", command=self.open_stats_window)
+
+        # How the shuffle button picks entries (see journal_deck.py)
+        self.random_mode_var = tk.StringVar(value=self.journal.random_mode)
+        random_menu = tk.Menu(view_menu, tearoff=0)
+        view_menu.add_cascade(label="Random Entries", menu=random_menu)
+        for label, mode in (("Shuffle (no repeats)", "shuffle"),
+                            ("Favour Older Entries", "older"),
+                            ("Favour Rarely Seen Entries", "rarely_seen")):
+            random_menu.add_radiobutton(
+                label=label, value=mode, variable=self.random_mode_var,
+                command=lambda: self.set_random_mode(self.random_mode_var.get())
+            )
 
     def create_widgets(self):
         # Title
@@ -156,6 +803,7 @@ class GratitudeJournal:
         )
         self.progress_label.pack(pady=10)
 
+    def create_secondary_widgets(self):
         # Shuffle button (bottom right corner)
         self.shuffle_btn = tk.Button(
             self.root,
@@ -174,6 +822,32 @@ class GratitudeJournal:
 
         # Create tooltip for shuffle button
         self.create_tooltip(self.shuffle_btn, "View random entry")
+
+        # Busy indicator (bottom left corner), click to cancel
+        self.busy_label = tk.Label(
+            self.root,
+            text="",
+            font=("Arial", 9),
+            bg='#f0f8ff',
+            fg='#7f8c8d',
+            cursor='hand2'
+        )
+        self.busy_label.place(x=10, y=375)
+        self.busy_label.bind('<Button-1>', lambda event: self.cancel_foreground_task())
+
+    def set_busy(self, busy, cancellable=True):
+        if busy:
+            self.busy_label.config(text="Working... (click to cancel)" if cancellable else "Working...")
+            self.root.config(cursor='watch')
+        else:
+            self.busy_label.config(text="")
+            self.root.config(cursor='')
+
+    def cancel_foreground_task(self):
+        # Only reads are foreground tasks; a save always runs to completion
+        if self.foreground_task is not None and not self.foreground_task.finished:
+            self.foreground_task.cancel()
+        self.foreground_task = None
     
     def submit_entry(self):
         entry_text = self.entry_var.get().strip()
@@ -207,76 +881,46 @@ class GratitudeJournal:
             # All entries collected, save the file
             self.save_gratitude_journal()
     
+    @traced()
     def save_gratitude_journal(self):
-        try:
-            folder_path = None
-            for path in self.SAVE_FOLDER_PATHS:
-                try:
-                    os.makedirs(path, exist_ok=True)
-                    folder_path = path
-                    break
-                except OSError:
-                    continue
-            
-            if folder_path is None:
-                raise OSError("None of the specified drives are accessible")
-            
-            # Generate filename with today's date and counter
-            today = datetime.now().strftime("%Y-%m-%d")
-            base_filename = f"{today} Gratitude"
-            counter = 0
-
-            # Find the next available filename
-            while True:
-                if counter == 0:
-                    filename = f"{base_filename}.md"
-                else:
-                    filename = f"{base_filename}_{counter}.md"
-
-                filepath = os.path.join(folder_path, filename)
-
-                if not os.path.exists(filepath):
-                    break
-
-                counter += 1
-
-            # Create the content with variable number of entries
-            num_entries = len(self.gratitude_entries)
-            if num_entries == 3:
-                header = "## Three things I'm grateful for today:"
-            elif num_entries == 1:
-                header = "## One thing I'm grateful for today:"
-            elif num_entries == 2:
-                header = "## Two things I'm grateful for today:"
-            else:
-                header = f"## {num_entries} things I'm grateful for today:"
-
-            gratitude_list = "\n".join([f"{i+1}. {entry}" for i, entry in enumerate(self.gratitude_entries)])
+        self.submit_btn.config(state='disabled')
+        save_started = journal_trace.clock()
+
+        def saved(result):
+            journal_trace.complete("save: click to saved", save_started)
+            self.on_journal_saved(result)
+
+        # No timeout and no cancel: the worker cannot be stopped, so Finish
+        # stays disabled until it reports back rather than inviting a retry
+        # that would save the entry twice
+        self.io.submit(
+            self.via_service,
+            'write_entry',
+            list(self.gratitude_entries),
+            on_success=saved,
+            on_error=self.on_journal_save_failed,
+            description="Saving the gratitude journal",
+            cancellable=False
+        )
 
-            content = f"""{header}
-{gratitude_list}
+    def on_journal_saved(self, saved):
+        filename, folder_path = saved
 
----
-Tags: #gratitude"""
-            
-            # Write the file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Show success message
-            messagebox.showinfo(
-                "Success!", 
-                f"Your gratitude journal has been saved!\n\nFile: {filename}\nLocation: {folder_path}"
-            )
-            
-            # Close the application
-            self.root.quit()
-            
-        except Exception as e:
-            messagebox.showerror(
-                "Error", 
-                f"Could not save the gratitude journal:\n{str(e)}\n\nPlease check if the C:, D:, or G: drive is accessible."
-            )
+        # Show success message
+        messagebox.showinfo(
+            "Success!", 
+            f"Your gratitude journal has been saved!\n\nFile: {filename}\nLocation: {folder_path}"
+        )
+        
+        # Close the application
+        self.root.quit()
+
+    def on_journal_save_failed(self, error):
+        self.submit_btn.config(state='normal')
+        messagebox.showerror(
+            "Error", 
+            f"Could not save the gratitude journal:\n{str(error)}\n\nPlease check if the C:, D:, or G: drive is accessible."
+        )
     
     def create_tooltip(self, widget, text):
         def show_tooltip(event):
@@ -306,194 +950,542 @@ Tags: #gratitude"""
         widget.bind('<Enter>', show_tooltip)
         widget.bind('<Leave>', hide_tooltip)
 
-    def show_random_entry(self):
-        try:
-            all_files = []
-            for folder_path in self.JOURNAL_FOLDER_PATHS:
-                if os.path.exists(folder_path):
-                    pattern = os.path.join(folder_path, "*Gratitude*.md")
-                    files = glob.glob(pattern)
-                    all_files.extend(files)
-
-            if not all_files:
-                messagebox.showinfo("No Entries", "No gratitude journal entries found to display.")
+    def build_packed_archive(self):
+        self.io.submit(
+            self.journal.build_packed_archive,
+            on_success=lambda built: messagebox.showinfo(
+                "Packed Archive",
+                f"Packed {built[0]} entries into:\n{built[1]}\n\n"
+                "It will be kept up to date as you save and import."
+            ),
+            on_error=lambda error: messagebox.showerror(
+                "Error", f"Could not build the packed archive:\n{str(error)}"
+            ),
+            description="Building the packed archive",
+            cancellable=False
+        )
+
+    def remove_duplicate_entries(self):
+        def confirm_removal(duplicates):
+            if not duplicates:
+                messagebox.showinfo("Remove Duplicates", "No duplicate entries found.")
+                return
+            if not messagebox.askyesno(
+                "Remove Duplicates",
+                f"Found {len(duplicates)} entries that repeat an earlier entry's date and content.\n\n"
+                "Delete these duplicate files? The earliest copy of each is kept."
+            ):
                 return
+            self.io.submit(
+                lambda: self.journal.remove_duplicates(duplicates),
+                on_success=lambda outcome: messagebox.showinfo(
+                    "Remove Duplicates",
+                    f"Removed {len(outcome[0])} duplicate entries."
+                    + (f"\n{len(outcome[1])} could not be removed." if outcome[1] else "")
+                ),
+                on_error=lambda error: messagebox.showerror(
+                    "Error", f"Could not remove duplicates:\n{str(error)}"
+                ),
+                description="Removing duplicate entries",
+                cancellable=False
+            )
 
-            # Select a random file
-            random_file = random.choice(all_files)
+        self.io.submit(
+            self.journal.find_duplicates,
+            on_success=confirm_removal,
+            on_error=lambda error: messagebox.showerror(
+                "Error", f"Could not look for duplicates:\n{str(error)}"
+            ),
+            description="Looking for duplicate entries"
+        )
 
-            # Read the content
-            with open(random_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+    @traced()
+    def show_random_entry(self):
+        if self.random_requested_at is None:
+            self.random_requested_at = journal_trace.clock()
+        if self.service is None and self.wait_for_index(self.show_random_entry):
+            return
+        # Use the entry prefetched while the last one was on screen, if any
+        if self.prefetched_entry is not None:
+            entry, self.prefetched_entry = self.prefetched_entry, None
+            self.on_random_entry_loaded(entry)
+            return
+        if self.prefetch_task is not None and not self.prefetch_task.finished:
+            # Already on its way; show it as soon as it arrives
+            self.waiting_for_prefetch = True
+            if self.random_viewer is not None and self.random_viewer.exists():
+                self.random_viewer.set_loading(True)
+            return
 
-            # Extract the gratitude items using regex
-            pattern = r'\d+\.\s+(.+?)(?=\n\d+\.|\n---|\Z)'
-            matches = re.findall(pattern, content, re.DOTALL)
+        mode = self.journal.random_mode
+        self.foreground_task = self.io.submit(
+            self.via_service,
+            'peek_random_entry',
+            mode,
+            on_success=lambda entry: self.on_random_entry_loaded(entry, mode),
+            on_error=self.on_random_entry_failed,
+            timeout=self.DRIVE_TIMEOUT,
+            description="Loading a random entry"
+        )
+
+    def on_random_entry_loaded(self, entry, mode=None):
+        if entry is None:
+            self.random_requested_at = None
+            messagebox.showinfo("No Entries", "No gratitude journal entries found to display.")
+            return
 
-            if matches:
-                # Create a new window to display the random entry
-                self.display_random_entry_window(random_file, matches)
+        if entry.items:
+            self.display_random_entry_window(entry.path, entry.items)
+            self.prefetch_random_entry(entry.path, mode or self.journal.random_mode)
+        else:
+            messagebox.showinfo("Error", "Could not parse the selected gratitude entry.")
+
+    def set_random_mode(self, mode):
+        self.journal.random_mode = mode
+        # The prefetched entry was peeked under the old mode; it was never
+        # taken out of the deck, so dropping it loses nothing
+        self.prefetched_entry = None
+
+    def prefetch_random_entry(self, shown_path, shown_mode):
+        """Use up the entry now on screen, then load and parse the next one while it is read.
+
+        The next entry is only peeked, so it stays in the deck until it is
+        shown in turn.
+        """
+        mode = self.journal.random_mode
+
+        def mark_and_peek():
+            # One task, so the peek cannot overtake the mark and return the same entry
+            self.via_service('mark_entry_shown', shown_path, shown_mode)
+            return self.via_service('peek_random_entry', mode)
+
+        def prefetched(entry):
+            self.prefetch_task = None
+            if mode != self.journal.random_mode:
+                entry = None  # peeked under the previous mode; fetch afresh
+            if self.waiting_for_prefetch:
+                self.waiting_for_prefetch = False
+                if entry is None:
+                    self.show_random_entry()
+                else:
+                    self.on_random_entry_loaded(entry, mode)
             else:
-                messagebox.showinfo("Error", "Could not parse the selected gratitude entry.")
+                self.prefetched_entry = entry
+
+        def prefetch_failed(error):
+            self.prefetch_task = None
+            if self.waiting_for_prefetch:
+                self.waiting_for_prefetch = False
+                if self.random_viewer is not None and self.random_viewer.exists():
+                    self.random_viewer.set_loading(False)
+                self.on_random_entry_failed(error)
+
+        self.prefetched_entry = None
+        self.prefetch_task = self.io.submit(
+            mark_and_peek,
+            on_success=prefetched,
+            on_error=prefetch_failed,
+            timeout=self.DRIVE_TIMEOUT,
+            description="Prefetching a random entry",
+            quiet=True
+        )
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load random entry:\n{str(e)}")
+    def on_random_entry_failed(self, error):
+        self.random_requested_at = None
+        messagebox.showerror("Error", f"Could not load random entry:\n{str(error)}")
 
-    def display_random_entry_window(self, filename, gratitude_items):
-        # Create new window
-        random_window = tk.Toplevel(self.root)
-        random_window.title("Random Gratitude Entry")
-        random_window.geometry("450x400")
-        random_window.resizable(True, True)
-        random_window.configure(bg='#f0f8ff')
+    def open_search_window(self):
+        if self.service is not None:
+            self.display_search_window(lambda query: self.via_service('search', query))
+            return
+        if self.wait_for_index(self.open_search_window):
+            return
+        self.foreground_task = self.io.submit(
+            self.journal.get_search_index,
+            on_success=lambda search_index: self.display_search_window(search_index and search_index.search),
+            on_error=lambda error: messagebox.showerror(
+                "Error", f"Could not open the search index:\n{str(error)}"
+            ),
+            timeout=self.DRIVE_TIMEOUT,
+            description="Opening the search index"
+        )
 
-        # Center the window
-        random_window.update_idletasks()
-        x = (random_window.winfo_screenwidth() // 2) - (450 // 2)
-        y = (random_window.winfo_screenheight() // 2) - (400 // 2)
-        random_window.geometry(f"450x400+{x}+{y}")
+    def display_search_window(self, search):
+        """search(query) returns SearchResults, or None when no folder is reachable."""
+        if search is None:
+            messagebox.showinfo("No Entries", "No gratitude journal entries found to search.")
+            return
 
-        # Extract date from filename
-        filename_only = os.path.basename(filename)
-        date_match = re.match(r'(\d{4}-\d{2}-\d{2})', filename_only)
-        date_str = date_match.group(1) if date_match else "Unknown Date"
+        search_window = tk.Toplevel(self.root)
+        search_window.title("Search Entries")
+        search_window.geometry("520x480")
+        search_window.configure(bg='#f0f8ff')
 
-        # Title
-        title_label = tk.Label(
-            random_window,
-            text="Random Gratitude Entry",
-            font=("Arial", 16, "bold"),
-            bg='#f0f8ff',
-            fg='#2c3e50'
-        )
-        title_label.pack(pady=15)
+        # Query row
+        query_frame = tk.Frame(search_window, bg='#f0f8ff')
+        query_frame.pack(pady=(15, 5), padx=20, fill='x')
 
-        # Date
-        date_label = tk.Label(
-            random_window,
-            text=date_str,
+        query_var = tk.StringVar()
+        query_field = tk.Entry(
+            query_frame,
+            textvariable=query_var,
             font=("Arial", 12),
+            relief='ridge',
+            bd=2
+        )
+        query_field.pack(side='left', fill='x', expand=True)
+        query_field.focus()
+
+        hint_label = tk.Label(
+            search_window,
+            text='Words, "exact phrases", from:YYYY-MM-DD, to:YYYY-MM-DD',
+            font=("Arial", 9),
             bg='#f0f8ff',
             fg='#7f8c8d'
         )
-        date_label.pack(pady=5)
-
-        # Button frame FIRST (to reserve space at bottom)
-        button_frame = tk.Frame(random_window, bg='#f0f8ff')
-        button_frame.pack(side='bottom', pady=10, fill='x')
-
-        # Main container frame (fills remaining space)
-        main_container = tk.Frame(random_window, bg='#f0f8ff')
-        main_container.pack(pady=(10,0), padx=20, fill='both', expand=True)
+        hint_label.pack(padx=20, anchor='w')
 
-        # Create canvas and scrollbar for scrollable content
-        canvas = tk.Canvas(main_container, bg='#f0f8ff', highlightthickness=0)
-        scrollbar = tk.Scrollbar(main_container, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg='#f0f8ff')
+        # Results list
+        results_list = tk.Listbox(search_window, font=("Arial", 10), height=10, activestyle='none')
+        results_list.pack(pady=5, padx=20, fill='both', expand=True)
 
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        status_label = tk.Label(
+            search_window,
+            text="",
+            font=("Arial", 9),
+            bg='#f0f8ff',
+            fg='#7f8c8d'
         )
+        status_label.pack(padx=20, anchor='w')
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        # Pack canvas and scrollbar
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Display gratitude items in scrollable frame
-        for i, item in enumerate(gratitude_items, 1):
-            item_label = tk.Label(
-                scrollable_frame,
-                text=f"{i}. {item.strip()}",
-                font=("Arial", 11),
-                bg='#f0f8ff',
-                fg='#2c3e50',
-                wraplength=380,
-                justify='left'
+        # Selected entry
+        detail_label = tk.Label(
+            search_window,
+            text="",
+            font=("Arial", 11),
+            bg='#f0f8ff',
+            fg='#2c3e50',
+            wraplength=470,
+            justify='left',
+            anchor='nw'
+        )
+        detail_label.pack(pady=(5, 15), padx=20, fill='x')
+
+        results = []
+
+        def timed_search(query):
+            started = time.perf_counter()
+            found = search(query) or []
+            return found, (time.perf_counter() - started) * 1000
+
+        def run_search(event=None):
+            status_label.config(text="Searching...")
+            self.io.submit(
+                timed_search,
+                query_var.get(),
+                on_success=show_results,
+                on_error=lambda error: messagebox.showerror(
+                    "Error", f"Search failed:\n{str(error)}", parent=search_window
+                ),
+                timeout=self.DRIVE_TIMEOUT,
+                description="Searching"
             )
-            item_label.pack(pady=8, anchor='w', padx=10)
-
-        # Create an inner frame to center the buttons
-        inner_button_frame = tk.Frame(button_frame, bg='#f0f8ff')
-        inner_button_frame.pack()
 
-        # View Another Random Entry button
-        another_btn = tk.Button(
-            inner_button_frame,
-            text="View Another Random Entry",
-            command=lambda: self.view_another_random_entry(random_window),
+        def show_results(outcome):
+            if not search_window.winfo_exists():
+                return
+            found, elapsed_ms = outcome
+            results[:] = found
+
+            results_list.delete(0, 'end')
+            for result in results:
+                first_item = result.entry.items[result.matched_items[0]] if result.matched_items else (
+                    result.entry.items[0] if result.entry.items else ""
+                )
+                results_list.insert('end', f"{result.entry.date or 'Unknown Date'}  {first_item[:70]}")
+            status_label.config(text=f"{len(results)} result(s) in {elapsed_ms:.1f} ms")
+            detail_label.config(text="")
+
+        def show_selected(event=None):
+            selection = results_list.curselection()
+            if not selection:
+                return
+            entry = results[selection[0]].entry
+            detail_label.config(text="\n".join(
+                f"{i}. {item}" for i, item in enumerate(entry.items, 1)
+            ))
+
+        search_btn = tk.Button(
+            query_frame,
+            text="Search",
+            command=run_search,
             font=("Arial", 10),
             bg='#3498db',
             fg='white',
             padx=15,
-            pady=5,
+            pady=2,
             relief='raised',
             bd=2,
             cursor='hand2'
         )
-        another_btn.pack(side='left', padx=5)
+        search_btn.pack(side='left', padx=(10, 0))
 
-        # Close button
-        close_btn = tk.Button(
-            inner_button_frame,
-            text="Close",
-            command=random_window.destroy,
-            font=("Arial", 10),
-            bg='#95a5a6',
-            fg='white',
-            padx=15,
-            pady=5,
-            relief='raised',
-            bd=2,
-            cursor='hand2'
+        query_field.bind('<Return>', run_search)
+        results_list.bind('<<ListboxSelect>>', show_selected)
+
+    def open_timeline_window(self):
+        if self.timeline_window is not None and self.timeline_window.exists():
+            self.timeline_window.lift()
+            return
+        if self.wait_for_index(self.open_timeline_window):
+            return
+        self.foreground_task = self.io.submit(
+            self.journal.get_timeline,
+            on_success=self.display_timeline_window,
+            on_error=lambda error: messagebox.showerror(
+                "Error", f"Could not open the timeline:\n{str(error)}"
+            ),
+            timeout=self.DRIVE_TIMEOUT,
+            description="Opening the timeline"
         )
-        close_btn.pack(side='left', padx=5)
 
-        # Bind mousewheel to canvas for scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+    def display_timeline_window(self, timeline):
+        if timeline is None or not len(timeline):
+            messagebox.showinfo("No Entries", "No gratitude journal entries found to display.")
+            return
+        # Clicking an entry shows it in full in the random entry window
+        self.timeline_window = TimelineWindow(
+            self.root, timeline, self.io,
+            lambda entry: self.display_random_entry_window(entry.path, entry.items)
+        )
 
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    def open_on_this_day_window(self, years=None):
+        """Entries from today's date in earlier years, or with years, from this week that many years ago"""
+        if self.wait_for_index(self.open_on_this_day_window, years):
+            return
+        self.foreground_task = self.io.submit(
+            self.journal.get_anniversaries,
+            on_success=lambda anniversaries: self.display_on_this_day_window(anniversaries, years),
+            on_error=lambda error: messagebox.showerror(
+                "Error", f"Could not open the journal:\n{str(error)}"
+            ),
+            timeout=self.DRIVE_TIMEOUT,
+            description="Opening the journal"
+        )
 
-    def view_another_random_entry(self, current_window):
-        """Load and display another random entry, replacing the current content"""
-        try:
-            all_files = []
-            for folder_path in self.JOURNAL_FOLDER_PATHS:
-                if os.path.exists(folder_path):
-                    pattern = os.path.join(folder_path, "*Gratitude*.md")
-                    files = glob.glob(pattern)
-                    all_files.extend(files)
-
-            if not all_files:
-                messagebox.showinfo("No Entries", "No gratitude journal entries found to display.")
+    def display_on_this_day_window(self, anniversaries, years=None):
+        if anniversaries is None or not len(anniversaries):
+            messagebox.showinfo("No Entries", "No gratitude journal entries found to display.")
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("On This Day" if years is None else "This Week, Years Ago")
+        window.geometry("520x480")
+        window.configure(bg='#f0f8ff')
+
+        title_label = tk.Label(
+            window,
+            text="",
+            font=("Arial", 14, "bold"),
+            bg='#f0f8ff',
+            fg='#2c3e50'
+        )
+        title_label.pack(pady=(15, 5))
+
+        years_var = tk.IntVar(value=years or 1)
+        if years is not None:
+            years_frame = tk.Frame(window, bg='#f0f8ff')
+            years_frame.pack(padx=20, anchor='w')
+            tk.Spinbox(
+                years_frame,
+                from_=1,
+                to=100,
+                width=4,
+                textvariable=years_var,
+                font=("Arial", 10)
+            ).pack(side='left')
+            tk.Label(
+                years_frame,
+                text="years ago",
+                font=("Arial", 10),
+                bg='#f0f8ff',
+                fg='#2c3e50'
+            ).pack(side='left', padx=(5, 0))
+
+        entries_list = tk.Listbox(window, font=("Arial", 10), height=10, activestyle='none')
+        entries_list.pack(pady=5, padx=20, fill='both', expand=True)
+
+        # Selected entry
+        detail_label = tk.Label(
+            window,
+            text="",
+            font=("Arial", 11),
+            bg='#f0f8ff',
+            fg='#2c3e50',
+            wraplength=470,
+            justify='left',
+            anchor='nw'
+        )
+        detail_label.pack(pady=(5, 15), padx=20, fill='x')
+
+        entries = []
+
+        def look_up(years_ago):
+            today = datetime.now().date()
+            if years_ago is None:
+                return f"{today:%d %B} in earlier years", anniversaries.on_this_day(today)
+            monday, sunday, found = anniversaries.week_years_ago(years_ago, today)
+            return f"{monday:%d %b} to {sunday:%d %b %Y}", found
+
+        def load_entries(*args):
+            years_ago = None
+            if years is not None:
+                try:
+                    years_ago = max(years_var.get(), 1)
+                except tk.TclError:
+                    return  # not a number yet
+            self.io.submit(
+                look_up,
+                years_ago,
+                on_success=show_entries,
+                on_error=lambda error: messagebox.showerror(
+                    "Error", f"Could not load the entries:\n{str(error)}", parent=window
+                ),
+                timeout=self.DRIVE_TIMEOUT,
+                description="Loading entries"
+            )
+
+        def show_entries(outcome):
+            if not window.winfo_exists():
+                return
+            title, found = outcome
+            entries[:] = found
+            title_label.config(text=title)
+
+            entries_list.delete(0, 'end')
+            for entry in entries:
+                entries_list.insert('end', f"{entry.date}  {entry.items[0][:70]}")
+            if not entries:
+                entries_list.insert('end', "No entries")
+            detail_label.config(text="")
+
+        def show_selected(event=None):
+            selection = entries_list.curselection()
+            if not selection or selection[0] >= len(entries):
                 return
+            entry = entries[selection[0]]
+            detail_label.config(text="\n".join(
+                f"{i}. {item}" for i, item in enumerate(entry.items, 1)
+            ))
+
+        entries_list.bind('<<ListboxSelect>>', show_selected)
+        if years is not None:
+            years_var.trace_add('write', load_entries)
+        load_entries()
+
+    def open_stats_window(self):
+        if self.wait_for_index(self.open_stats_window):
+            return
+        self.foreground_task = self.io.submit(
+            self.journal.stats_summary,
+            on_success=self.display_stats_window,
+            on_error=lambda error: messagebox.showerror(
+                "Error", f"Could not load the statistics:\n{str(error)}"
+            ),
+            timeout=self.DRIVE_TIMEOUT,
+            description="Loading statistics"
+        )
 
-            # Select a random file
-            random_file = random.choice(all_files)
+    def display_stats_window(self, summary):
+        if summary is None or not summary.entries:
+            messagebox.showinfo("No Entries", "No gratitude journal entries found to summarise.")
+            return
 
-            # Read the content
-            with open(random_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+        stats_window = tk.Toplevel(self.root)
+        stats_window.title("Journal Statistics")
+        stats_window.geometry("480x520")
+        stats_window.configure(bg='#f0f8ff')
 
-            # Extract the gratitude items using regex - handle both original and imported formats
-            pattern = r'\d+\.\s+(.+?)(?=\n\d+\.|\n---|\Z)'
-            matches = re.findall(pattern, content, re.DOTALL)
+        title_label = tk.Label(
+            stats_window,
+            text="Journal Statistics",
+            font=("Arial", 16, "bold"),
+            bg='#f0f8ff',
+            fg='#2c3e50'
+        )
+        title_label.pack(pady=(15, 5))
+
+        longest = f"{summary.longest_streak} days"
+        if summary.longest_streak_end:
+            longest += f" (ending {summary.longest_streak_end})"
+        overview = "\n".join([
+            f"{summary.entries} entries, {summary.items} items "
+            f"({summary.average_items:.1f} per entry)",
+            f"From {summary.first_date or 'Unknown Date'} to {summary.last_date or 'Unknown Date'}",
+            f"Current streak: {summary.current_streak} days",
+            f"Longest streak: {longest}",
+        ])
+        overview_label = tk.Label(
+            stats_window,
+            text=overview,
+            font=("Arial", 11),
+            bg='#f0f8ff',
+            fg='#2c3e50',
+            justify='left'
+        )
+        overview_label.pack(pady=5, padx=20, anchor='w')
+
+        # Text bar charts of the last twelve weeks and months
+        def bars(rows):
+            peak = max((count for _, count in rows), default=0) or 1
+            return "\n".join(f"{label:9s} {'#' * max(1, round(count / peak * 20)):20s} {count}" for label, count in rows)
+
+        charts = tk.Label(
+            stats_window,
+            text="Entries per week\n" + bars(summary.entries_per_week[-12:])
+                 + "\n\nEntries per month\n" + bars(summary.entries_per_month[-12:]),
+            font=("Courier", 9),
+            bg='#f0f8ff',
+            fg='#2c3e50',
+            justify='left'
+        )
+        charts.pack(pady=5, padx=20, anchor='w')
 
-            if matches:
-                # Close the current window and open a new one with the new entry
-                current_window.destroy()
-                self.display_random_entry_window(random_file, matches)
-            else:
-                messagebox.showinfo("Error", "Could not parse the selected gratitude entry.")
+        top_label = tk.Label(
+            stats_window,
+            text="Top words: " + ", ".join(term for term, _ in summary.top_words)
+                 + "\nTop people: " + ", ".join(term for term, _ in summary.top_people),
+            font=("Arial", 10),
+            bg='#f0f8ff',
+            fg='#7f8c8d',
+            wraplength=440,
+            justify='left'
+        )
+        top_label.pack(pady=(5, 15), padx=20, anchor='w')
+
+    @traced()
+    def display_random_entry_window(self, filename, gratitude_items):
+        from journal_entries import parse_entry_filename
+
+        # Extract date from filename
+        date_str = parse_entry_filename(os.path.basename(filename))[0] or "Unknown Date"
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load random entry:\n{str(e)}")
+        # One window for the whole session, refilled in place
+        if self.random_viewer is None or not self.random_viewer.exists():
+            self.random_viewer = RandomEntryViewer(self.root, self.view_another_random_entry)
+        self.random_viewer.show(date_str, gratitude_items)
+        journal_trace.complete("random entry: click to display", self.random_requested_at)
+        self.random_requested_at = None
 
+    @traced()
+    def view_another_random_entry(self):
+        """Show the next random entry in the same window, from the prefetch if it is ready"""
+        self.show_random_entry()
+
+    @traced()
     def import_from_presently(self):
+        from tkinter import filedialog
+
         file_path = filedialog.askopenfilename(
             title="Select Presently Backup File",
             filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
@@ -501,92 +1493,118 @@ Tags: #gratitude"""
 
         if not file_path:
             return
+        self.open_presently_importer(file_path)
 
-        try:
-            imported_count = 0
-            skipped_count = 0
-
-            with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-
-                for row in csv_reader:
-                    entry_date = row['entryDate'].strip()
-                    entry_content = row['entryContent'].strip()
-
-                    if entry_date and entry_content:
-                        success = self.create_gratitude_file_from_presently(entry_date, entry_content)
-                        if success:
-                            imported_count += 1
-                        else:
-                            skipped_count += 1
-
-            messagebox.showinfo(
-                "Import Complete",
-                f"Import completed!\n\n"
-                f"Successfully imported: {imported_count} entries\n"
-                f"Skipped (already exist): {skipped_count} entries"
-            )
-
-        except Exception as e:
-            messagebox.showerror(
-                "Import Error",
-                f"Could not import the Presently backup file:\n{str(e)}"
-            )
+    def open_presently_importer(self, file_path):
+        if self.wait_for_index(self.open_presently_importer, file_path):
+            return
+        self.io.submit(
+            self.journal.presently_importer,
+            file_path,
+            on_success=lambda importer: self.start_import(importer, "Importing from Presently", "rows"),
+            on_error=self.on_import_failed,
+            timeout=self.DRIVE_TIMEOUT,
+            description="Opening the journal folder"
+        )
 
-    def create_gratitude_file_from_presently(self, entry_date, entry_content):
-        try:
-            # Split entry content by double line-breaks to get individual gratitude items
-            # Handle both \r\n\r\n and \n\n patterns
-            gratitude_items = re.split(r'\r?\n\r?\n', entry_content.strip())
+    def export_journal(self):
+        from tkinter import filedialog
 
-            # Filter out empty items and strip whitespace
-            gratitude_items = [item.strip() for item in gratitude_items if item.strip()]
+        out_path = filedialog.asksaveasfilename(
+            title="Export Journal",
+            defaultextension=".csv",
+            initialfile=f"gratitude_journal_{datetime.now().strftime('%Y-%m-%d')}.csv",
+            filetypes=[
+                ("Presently CSV", "*.csv"), ("Compressed CSV", "*.csv.gz"),
+                ("JSON Lines", "*.jsonl"), ("Compressed JSON Lines", "*.jsonl.gz")
+            ]
+        )
 
-            folder_path = None
-            for path in self.JOURNAL_FOLDER_PATHS:
-                try:
-                    os.makedirs(path, exist_ok=True)
-                    folder_path = path
-                    break
-                except OSError:
-                    continue
+        if not out_path:
+            return
 
-            if folder_path is None:
-                raise OSError("None of the specified drives are accessible")
+        self.io.submit(
+            self.journal.export,
+            out_path,
+            on_success=lambda result: messagebox.showinfo(
+                "Export Complete",
+                f"Exported {result.exported} entries to:\n{result.path}"
+            ),
+            on_error=lambda error: messagebox.showerror(
+                "Export Error", f"Could not export the journal:\n{str(error)}"
+            ),
+            description="Exporting the journal",
+            cancellable=False
+        )
 
-            base_filename = f"{entry_date} Gratitude"
-            counter = 0
+    def import_markdown_vault(self):
+        from tkinter import filedialog
 
-            while True:
-                if counter == 0:
-                    filename = f"{base_filename}.md"
-                else:
-                    filename = f"{base_filename}_{counter}.md"
+        vault_path = filedialog.askdirectory(title="Select Markdown Vault Folder")
 
-                filepath = os.path.join(folder_path, filename)
+        if not vault_path:
+            return
+        self.open_vault_importer(vault_path)
 
-                if not os.path.exists(filepath):
-                    break
+    def open_vault_importer(self, vault_path):
+        if self.wait_for_index(self.open_vault_importer, vault_path):
+            return
+        self.io.submit(
+            self.journal.vault_importer,
+            vault_path,
+            on_success=lambda importer: self.start_import(importer, "Importing Markdown Vault", "notes"),
+            on_error=self.on_import_failed,
+            timeout=self.DRIVE_TIMEOUT,
+            description="Opening the journal folder"
+        )
 
-                counter += 1
+    def start_import(self, importer, title, unit):
+        dialog = ProgressDialog(self.root, title, on_cancel=importer.cancel)
+        import_started = journal_trace.clock()
 
-            # Create content with numbered list of gratitude items
-            gratitude_list = "\n".join([f"{i+1}. {item}" for i, item in enumerate(gratitude_items)])
+        def import_finished(result):
+            journal_trace.complete("import: start to finish", import_started, rows=result.imported + result.skipped)
+            dialog.close()
+            title = "Import Cancelled" if result.cancelled else "Import Complete"
+            heading = "Import cancelled." if result.cancelled else "Import completed!"
+            messagebox.showinfo(
+                title,
+                f"{heading}\n\n"
+                f"Successfully imported: {result.imported} entries\n"
+                f"Skipped (already exist or no items): {result.skipped} {unit}"
+                + (f"\nFailed: {result.failed} entries" if result.failed else "")
+            )
 
-            content = f"""## Things I'm grateful for today (Imported from Presently):
-{gratitude_list}
+        def import_failed(error):
+            dialog.close()
+            self.on_import_failed(error)
 
----
-Tags: #gratitude #imported-presently"""
+        # No timeout: the dialog's Cancel button stops the importer cooperatively
+        import_task = self.io.submit(
+            importer.run,
+            on_success=import_finished,
+            on_error=import_failed,
+            description=title
+        )
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+        def poll_import():
+            if import_task.finished:
+                return
+            progress = importer.progress()
+            dialog.update_progress(
+                progress.fraction,
+                f"{progress.rows} {unit} read, {progress.imported} imported\n"
+                f"{progress.rows_per_second:.0f} {unit}/second"
+            )
+            self.root.after(100, poll_import)
 
-            return True
+        poll_import()
 
-        except Exception as e:
-            print(f"Error creating file for {entry_date}: {str(e)}")
-            return False
+    def on_import_failed(self, error):
+        messagebox.showerror(
+            "Import Error",
+            f"Could not complete the import:\n{str(error)}"
+        )
 
     def cancel(self):
         if messagebox.askyesno("Cancel", "Are you sure you want to cancel?"):
@@ -594,7 +1612,14 @@ Tags: #gratitude #imported-presently"""
     
     def run(self):
         self.root.mainloop()
+        if self._io is not None:
+            self._io.shutdown()
+        if self.service is not None:
+            self.service.close()
+        self.journal.close()
 
 if __name__ == "__main__":
-    app = GratitudeJournal()
+    startup_report = '--startup-report' in sys.argv[1:] or bool(os.environ.get(STARTUP_REPORT_ENV_VAR))
+    journal_trace.start_from_environment('--trace' in sys.argv[1:])
+    app = GratitudeJournal(StartupTimer(startup_report), no_service='--no-service' in sys.argv[1:])
     app.run()
\ No newline at end of file
@@ -0,0 +1,3 @@
+@echo off
+rem Headless journal commands, e.g.: journal random --count 10 --json
+python "%~dp0journal_cli.py" %*
@@ -0,0 +1,138 @@
+"""Month-day index behind the "On this day" and "this week, N years ago" views.
+
+Every dated entry is held as a (MM-DD, date, counter, id) key in one list
+sorted by month and day, so a day's entries from every year are a single
+bisect range and a week's are at most two (a week can span New Year). Dates
+come from the entry index, which has already parsed them from the filenames
+(counter suffixes such as _2 included, and Presently imports are named the
+same way), so opening a view never lists or parses the folders. The list is
+built once and kept current from the index's change notifications: each new
+entry is inserted with insort and each removed one deleted by bisect.
+
+Entries with no items and undated files are left out, as are copies of an
+entry on other mirrored folders when a ContentHashIndex is given.
+"""
+import threading
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+
+from journal_dedupe import MIRROR_COPY_IDS
+
+# Sorts after any date, counter and id in a key
+_AFTER = ("~",)
+
+
+def month_day(date_str):
+    """'MM-DD' of a 'YYYY-MM-DD' date."""
+    return date_str[5:10]
+
+
+def years_before(day, years):
+    """The same day years earlier; 29 February falls back to the 28th."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+class AnniversaryIndex:
+    def __init__(self, journal_index, content_hashes=None):
+        """With a ContentHashIndex, copies of an entry on other folders are left out."""
+        self.index = journal_index
+        self.content_hashes = content_hashes
+        self._lock = threading.Lock()
+        self.reload()
+        journal_index.add_listener(self._on_index_changes)
+
+    def reload(self):
+        """Rebuild the sorted keys from the index."""
+        condition = "date IS NOT NULL AND items != '[]'"
+        if self.content_hashes is not None:
+            condition += f" AND id NOT IN ({MIRROR_COPY_IDS})"
+        with self.index.lock:
+            rows = self.index.conn.execute(
+                f"SELECT id, date, counter FROM entries WHERE {condition}"
+            ).fetchall()
+        keys = sorted(
+            (month_day(entry_date), entry_date, counter or 0, entry_id) for entry_id, entry_date, counter in rows
+        )
+        with self._lock:
+            self.keys = keys
+            self.ids = {key[3] for key in keys}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _key(self, entry):
+        return (month_day(entry.date), entry.date, entry.counter or 0, entry.id)
+
+    def _is_copy(self, entry_id):
+        return self.content_hashes is not None and self.content_hashes.is_mirror_copy(entry_id)
+
+    def _on_index_changes(self, changes):
+        # A changed entry keeps its path and so its date, but may have gained
+        # or lost its items
+        stale = changes.removed + changes.changed
+        fresh = [
+            entry for entry in changes.added + changes.changed
+            if entry.date and entry.items and not self._is_copy(entry.id)
+        ]
+        with self._lock:
+            for entry in stale:
+                if entry.id not in self.ids or not entry.date:
+                    continue
+                key = self._key(entry)
+                position = bisect_left(self.keys, key)
+                if position < len(self.keys) and self.keys[position] == key:
+                    del self.keys[position]
+                    self.ids.discard(entry.id)
+            for entry in fresh:
+                insort(self.keys, self._key(entry))
+                self.ids.add(entry.id)
+
+    def _ids_between(self, first, last, keep):
+        """Ids of entries from month-day first to last (wrapping past 12-31) whose date passes keep."""
+        if first > last:
+            return self._ids_between(first, "12-31", keep) + self._ids_between("01-01", last, keep)
+        with self._lock:
+            start = bisect_left(self.keys, (first,))
+            end = bisect_left(self.keys, (last,) + _AFTER)
+            return [key[3] for key in self.keys[start:end] if keep(key[1])]
+
+    def _entries(self, entry_ids):
+        """The entries for entry_ids, newest first."""
+        entries = self.index.get_many(entry_ids)
+        entries.sort(key=lambda entry: (entry.date, entry.counter or 0), reverse=True)
+        return entries
+
+    def on_this_day(self, day=None):
+        """Entries from day's month and day in earlier years, newest first.
+
+        On 28 February of a non-leap year, 29 February entries are included.
+        """
+        day = day or date.today()
+        first = last = day.strftime("%m-%d")
+        if first == "02-28" and not _is_leap(day.year):
+            last = "02-29"
+        this_year = f"{day.year:04d}"
+        return self._entries(self._ids_between(first, last, lambda entry_date: entry_date[:4] < this_year))
+
+    def week_years_ago(self, years=1, day=None):
+        """Entries from the Monday-to-Sunday week holding day, years earlier, newest first.
+
+        Returns (monday, sunday, entries).
+        """
+        if years < 1:
+            raise ValueError("years must be at least 1")
+        then = years_before(day or date.today(), years)
+        monday = then - timedelta(days=then.weekday())
+        sunday = monday + timedelta(days=6)
+        first, last = monday.isoformat(), sunday.isoformat()
+        entries = self._entries(self._ids_between(
+            month_day(first), month_day(last), lambda entry_date: first <= entry_date <= last
+        ))
+        return monday, sunday, entries
@@ -0,0 +1,187 @@
+"""Optional packed archive holding the parsed items of every journal entry.
+
+The markdown files stay the source of truth; the archive sits beside them so
+that loading the whole journal is one sequential read of a single file
+instead of thousands of open/read/close round-trips on a synced folder.
+
+Layout:
+
+    .gratitude_archive.pack     b"GJPACK01" then records of
+                                <u32 little-endian length><UTF-8 JSON payload>
+    .gratitude_archive.offsets  array('Q') of record offsets, native byte order
+
+The pack is append-only: a changed entry is appended again and a deleted one
+gets a tombstone record (items = null); the last record for a path wins.
+Reading maps the pack with mmap and slices records out of it through a
+memoryview. compact() rewrites it without superseded records.
+
+Its reader is the entry index: when it has to parse many files at once,
+e.g. when its database was deleted or lost and it is built again, it
+takes every file the archive holds unchanged from the archive instead.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections import namedtuple
+
+PACK_FILENAME = ".gratitude_archive.pack"
+OFFSETS_FILENAME = ".gratitude_archive.offsets"
+PACK_MAGIC = b"GJPACK01"
+RECORD_HEADER = struct.Struct('<I')
+
+ArchivedEntry = namedtuple('ArchivedEntry', ['path', 'date', 'counter', 'size', 'mtime', 'items'])
+
+
+def _encode(entry):
+    payload = json.dumps({
+        'path': entry.path, 'date': entry.date, 'counter': entry.counter,
+        'size': entry.size, 'mtime': entry.mtime, 'items': entry.items
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return RECORD_HEADER.pack(len(payload)) + payload
+
+
+def _tombstone(path):
+    payload = json.dumps({'path': path, 'items': None}).encode('utf-8')
+    return RECORD_HEADER.pack(len(payload)) + payload
+
+
+class PackedArchive:
+    def __init__(self, folder_path):
+        self.pack_path = os.path.join(folder_path, PACK_FILENAME)
+        self.offsets_path = os.path.join(folder_path, OFFSETS_FILENAME)
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.pack_path) and os.path.exists(self.offsets_path)
+
+    def _read_offsets(self):
+        offsets = array('Q')
+        with open(self.offsets_path, 'rb') as f:
+            data = f.read()
+        # Ignore a torn trailing write
+        usable = len(data) - len(data) % offsets.itemsize
+        offsets.frombytes(data[:usable])
+        return offsets
+
+    def iter_records(self):
+        """Yield every record's decoded payload in file order, superseded ones included."""
+        offsets = self._read_offsets()
+        with open(self.pack_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= len(PACK_MAGIC):
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped[:len(PACK_MAGIC)] != PACK_MAGIC:
+                    raise ValueError(f"{self.pack_path} is not a journal archive")
+                view = memoryview(mapped)
+                try:
+                    for offset in offsets:
+                        if offset + RECORD_HEADER.size > len(mapped):
+                            break  # offset written but record lost in a crash
+                        (length,) = RECORD_HEADER.unpack_from(mapped, offset)
+                        start = offset + RECORD_HEADER.size
+                        if start + length > len(mapped):
+                            break
+                        yield json.loads(view[start:start + length].tobytes())
+                finally:
+                    view.release()
+
+    def load_all(self):
+        """Return {path: ArchivedEntry} for every live entry in the archive."""
+        entries = {}
+        for record in self.iter_records():
+            if record['items'] is None:
+                entries.pop(record['path'], None)
+            else:
+                entries[record['path']] = ArchivedEntry(
+                    record['path'], record['date'], record['counter'],
+                    record['size'], record['mtime'], record['items']
+                )
+        return entries
+
+    def _append(self, records):
+        if not records:
+            return
+        with self._lock:
+            with open(self.pack_path, 'ab') as pack:
+                offset = pack.tell()
+                if offset == 0:
+                    pack.write(PACK_MAGIC)
+                    offset = len(PACK_MAGIC)
+                offsets = array('Q')
+                for record in records:
+                    offsets.append(offset)
+                    pack.write(record)
+                    offset += len(record)
+            # Offsets go after the records so they never point past the pack.
+            # Not fsynced: the archive is a cache and a torn tail is skipped
+            with open(self.offsets_path, 'ab') as f:
+                offsets.tofile(f)
+
+    def on_index_changes(self, changes):
+        """JournalIndex listener keeping the archive in step with saves and imports."""
+        self._append(
+            [_encode(entry) for entry in changes.added + changes.changed]
+            + [_tombstone(entry.path) for entry in changes.removed]
+        )
+
+    def rebuild(self, entries):
+        """Write a fresh archive from (index) entries, replacing the old one atomically."""
+        pack_tmp = self.pack_path + ".tmp"
+        offsets_tmp = self.offsets_path + ".tmp"
+        offsets = array('Q')
+        with open(pack_tmp, 'wb') as pack:
+            pack.write(PACK_MAGIC)
+            offset = len(PACK_MAGIC)
+            for entry in entries:
+                record = _encode(entry)
+                offsets.append(offset)
+                pack.write(record)
+                offset += len(record)
+            pack.flush()
+            os.fsync(pack.fileno())
+        with open(offsets_tmp, 'wb') as f:
+            offsets.tofile(f)
+        with self._lock:
+            os.replace(pack_tmp, self.pack_path)
+            os.replace(offsets_tmp, self.offsets_path)
+        return len(offsets)
+
+    def compact(self):
+        """Rewrite the archive keeping only the live record for each entry."""
+        return self.rebuild(self.load_all().values())
+
+
+def attach_archive(journal_index, folder_path):
+    """Keep an existing archive in folder_path in step with the index from now on.
+
+    Nothing is read here. The index reads the archive only when it has many
+    files to parse, and only uses records whose (size, mtime) still match the
+    file, so an archive that missed some changes is never wrong, just less
+    useful until compacted or rebuilt. Returns the PackedArchive, or None when
+    none has been built there.
+    """
+    archive = PackedArchive(folder_path)
+    if not archive.exists():
+        return None
+    journal_index.archive = archive
+    journal_index.add_listener(archive.on_index_changes)
+    return archive
+
+
+def build_archive(journal_index, folder_path, folder_paths, archive=None):
+    """Rebuild the archive from the markdown files and keep it in sync from now on.
+
+    Every folder is re-listed and changed files re-parsed first; entry ids
+    stay as they are. Pass the already attached archive, if any, so it is
+    not subscribed twice.
+    """
+    journal_index.refresh(folder_paths, force=True)
+    if archive is None:
+        archive = PackedArchive(folder_path)
+        journal_index.archive = archive
+        journal_index.add_listener(archive.on_index_changes)
+    archive.rebuild(journal_index.all_entries())
+    return archive
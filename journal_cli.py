@@ -0,0 +1,346 @@
+"""Command-line entry point for batch work on the journal, without Tk.
+
+    python journal_cli.py add "first thing" "second thing" "third thing"
+    python journal_cli.py import backup.csv --workers 8
+    python journal_cli.py import-vault ~/Obsidian --rules rules.json
+    python journal_cli.py random --count 10 --json
+    python journal_cli.py random --mode rarely_seen
+    python journal_cli.py search "morning coffee from:2024-01-01"
+    python journal_cli.py stats --json
+    python journal_cli.py on-this-day
+    python journal_cli.py on-this-day --years-ago 2
+    python journal_cli.py dedupe --dry-run
+    python journal_cli.py export backup.csv.gz
+    python journal_cli.py mirror
+    python journal_cli.py serve
+
+While "journal serve" is running, add, random, search and on-this-day are
+answered by that warm service instead of opening the journal (see
+journal_service.py); --no-service does the work locally regardless.
+
+(journal.bat wraps this as plain "journal ..." on Windows.) Output is written
+line by line as results arrive so it can be piped; progress goes to stderr.
+--trace (or GRATITUDE_TRACE) records timing spans; see journal_trace.py.
+Exit codes: 0 success, 1 failure, 2 bad usage, 130 interrupted.
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+import journal_trace
+from journal_core import Journal
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def emit(line):
+    print(line, flush=True)
+
+
+def entry_record(entry):
+    return {'date': entry.date, 'path': entry.path, 'items': entry.items}
+
+
+def format_entry(entry):
+    lines = [entry.date or "Unknown Date"]
+    lines.extend(f"  {i}. {item}" for i, item in enumerate(entry.items, 1))
+    return "\n".join(lines)
+
+
+def entry_date(value):
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a YYYY-MM-DD date")
+    return value
+
+
+def cmd_add(journal, args):
+    items = [item.strip() for item in args.items if item.strip()]
+    if not items:
+        print("Nothing to save: every item was empty.", file=sys.stderr)
+        return EXIT_USAGE
+    filename, folder_path = journal.write_entry(items, args.date)
+    emit(json.dumps({'file': filename, 'folder': folder_path}) if args.json else f"Saved {filename} to {folder_path}")
+    return EXIT_OK
+
+
+def cmd_import(journal, args):
+    importer = journal.presently_importer(
+        args.csv_path, workers=args.workers, batch_size=args.batch_size, fsync_every=args.fsync_every
+    )
+    return run_importer(importer, args, "rows")
+
+
+def cmd_import_vault(journal, args):
+    from journal_vault import load_vault_rules
+
+    rules = load_vault_rules(args.rules) if args.rules else None
+    importer = journal.vault_importer(args.vault_path, workers=args.workers, batch_size=args.batch_size, rules=rules)
+    return run_importer(importer, args, "notes")
+
+
+def run_importer(importer, args, unit):
+    # Import on a worker thread so the main thread can report progress and catch Ctrl+C
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = importer.run()
+        except Exception as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=run, name="PresentlyImport", daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.5)
+            if not args.quiet:
+                progress = importer.progress()
+                print(
+                    f"\r{progress.fraction * 100:5.1f}%  {progress.rows} {unit} read, "
+                    f"{progress.imported} imported, {progress.rows_per_second:.0f} {unit}/second",
+                    end="", file=sys.stderr, flush=True
+                )
+    except KeyboardInterrupt:
+        importer.cancel()
+        worker.join()
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    if 'error' in outcome:
+        raise outcome['error']
+    result = outcome['result']
+    if args.json:
+        emit(json.dumps(result._asdict()))
+    else:
+        emit(f"Imported {result.imported} entries, skipped {result.skipped} {unit} (no new items), "
+             f"{result.failed} failed in {result.elapsed:.1f} s{' (cancelled)' if result.cancelled else ''}")
+    if result.cancelled:
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if result.failed else EXIT_OK
+
+
+def cmd_random(journal, args):
+    for _ in range(args.count):
+        entry = journal.load_random_entry(args.mode)
+        if entry is None:
+            print("No gratitude journal entries found.", file=sys.stderr)
+            return EXIT_FAILED
+        emit(json.dumps(entry_record(entry), ensure_ascii=False) if args.json else format_entry(entry))
+    return EXIT_OK
+
+
+def cmd_search(journal, args):
+    started = time.perf_counter()
+    results = journal.search(args.query, limit=args.limit)
+    if results is None:
+        print("No gratitude journal entries found.", file=sys.stderr)
+        return EXIT_FAILED
+    for result in results:
+        if args.json:
+            record = entry_record(result.entry)
+            record['score'] = result.score
+            emit(json.dumps(record, ensure_ascii=False))
+        else:
+            emit(format_entry(result.entry))
+    print(f"{len(results)} result(s) in {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_on_this_day(journal, args):
+    day = datetime.strptime(args.date, "%Y-%m-%d").date() if args.date else None
+    if args.years_ago is None:
+        entries = journal.on_this_day(day)
+    else:
+        week = journal.week_years_ago(args.years_ago, day)
+        entries = None if week is None else week[2]
+    if entries is None:
+        print("No gratitude journal entries found.", file=sys.stderr)
+        return EXIT_FAILED
+    for entry in entries:
+        emit(json.dumps(entry_record(entry), ensure_ascii=False) if args.json else format_entry(entry))
+    if args.years_ago is None:
+        print(f"{len(entries)} entries on this day in earlier years", file=sys.stderr)
+    else:
+        print(f"{len(entries)} entries from {week[0]} to {week[1]}", file=sys.stderr)
+    return EXIT_OK
+
+
+def cmd_stats(journal, args):
+    summary = journal.stats_summary()
+    if summary is None or not summary.entries:
+        print("No gratitude journal entries found.", file=sys.stderr)
+        return EXIT_FAILED
+    if args.json:
+        emit(json.dumps(summary._asdict(), ensure_ascii=False))
+        return EXIT_OK
+    emit(f"{summary.entries} entries, {summary.items} items ({summary.average_items:.1f} per entry)")
+    emit(f"From {summary.first_date} to {summary.last_date}")
+    emit(f"Current streak: {summary.current_streak} days")
+    emit(f"Longest streak: {summary.longest_streak} days (ending {summary.longest_streak_end})")
+    for label, count in summary.entries_per_month[-12:]:
+        emit(f"  {label}  {count}")
+    emit("Top words: " + ", ".join(f"{term} ({count})" for term, count in summary.top_words))
+    emit("Top people: " + ", ".join(f"{term} ({count})" for term, count in summary.top_people))
+    return EXIT_OK
+
+
+def cmd_dedupe(journal, args):
+    duplicates = journal.find_duplicates()
+    for entry in duplicates:
+        emit(json.dumps(entry_record(entry), ensure_ascii=False) if args.json else entry.path)
+    if args.dry_run:
+        print(f"{len(duplicates)} duplicate entries found", file=sys.stderr)
+        return EXIT_OK
+    removed, failed = journal.remove_duplicates(duplicates)
+    print(f"Removed {len(removed)} duplicate entries, {len(failed)} could not be removed", file=sys.stderr)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def cmd_export(journal, args):
+    result = journal.export(args.out_path, args.format, args.gzip or None)
+    if args.json:
+        emit(json.dumps(result._asdict()))
+    else:
+        emit(f"Exported {result.exported} entries to {result.path} in {result.elapsed:.1f} s"
+             + (f" ({result.skipped} empty, undated or duplicate entries left out)" if result.skipped else ""))
+    return EXIT_OK
+
+
+def cmd_mirror(journal, args):
+    if len(journal.mirror_folder_paths) < 2:
+        print("No mirror folders configured (set mirror_folders in the config file).", file=sys.stderr)
+        return EXIT_USAGE
+    copied = journal.reconcile_mirrors()
+    reachable = journal.mirror_folders.reachable()
+    if args.json:
+        emit(json.dumps({'copied': copied, 'reachable': reachable}))
+    else:
+        emit(f"Copied {copied} entries across {len(reachable)} of {len(journal.mirror_folder_paths)} mirror folders")
+    return EXIT_OK
+
+
+def cmd_serve(journal, args):
+    from journal_service import JournalService
+
+    service = JournalService(journal, port=args.port, socket_path=args.socket)
+    service.warm_up()
+    address = service.address.get('path') or f"{service.address['host']}:{service.address['port']}"
+    print(f"Journal service listening on {address} (Ctrl+C to stop)", file=sys.stderr, flush=True)
+    service.serve_forever()
+    return EXIT_OK
+
+
+def build_parser():
+    from journal_service import DEFAULT_PORT
+
+    parser = argparse.ArgumentParser(prog="journal", description="Work with the gratitude journal from the command line.")
+    parser.add_argument('--json', action='store_true', help="write one JSON object per line")
+    parser.add_argument('--no-service', action='store_true',
+                        help="do not hand add/random/search/on-this-day to a running 'journal serve'")
+    parser.add_argument('--trace', action='store_true',
+                        help="write a Chrome trace and latency summary at exit (path: GRATITUDE_TRACE)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="save an entry made of the given items")
+    add.add_argument('items', nargs='+', help="the things you're grateful for")
+    add.add_argument('--date', type=entry_date, help="entry date as YYYY-MM-DD (default: today)")
+    add.set_defaults(handler=cmd_add)
+
+    imports = commands.add_parser('import', help="import a Presently backup CSV")
+    imports.add_argument('csv_path')
+    imports.add_argument('--workers', type=int, default=4, help="writer threads (default: 4)")
+    imports.add_argument('--batch-size', type=int, default=200, help="files per batch (default: 200)")
+    imports.add_argument('--fsync-every', type=int, help="flush to disk once per N files (default: batch size)")
+    imports.add_argument('--quiet', action='store_true', help="no progress on stderr")
+    imports.set_defaults(handler=cmd_import)
+
+    vault = commands.add_parser('import-vault', help="import gratitude notes from a folder of markdown notes")
+    vault.add_argument('vault_path')
+    vault.add_argument('--workers', type=int, help="parser processes (default: one per core)")
+    vault.add_argument('--batch-size', type=int, default=200, help="notes per batch (default: 200)")
+    vault.add_argument('--rules', help="JSON rule set to use instead of the built-in rules")
+    vault.add_argument('--quiet', action='store_true', help="no progress on stderr")
+    vault.set_defaults(handler=cmd_import_vault)
+
+    random_entries = commands.add_parser('random', help="print random entries")
+    random_entries.add_argument('--count', type=int, default=1)
+    random_entries.add_argument('--mode', choices=("shuffle", "older", "rarely_seen"), default="shuffle",
+                                help="no-repeat shuffle, or favour older or rarely seen entries")
+    random_entries.set_defaults(handler=cmd_random)
+
+    search = commands.add_parser('search', help='search entries (words, "phrases", from:/to: dates)')
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=50)
+    search.set_defaults(handler=cmd_search)
+
+    on_this_day = commands.add_parser('on-this-day', help="entries from this date in earlier years")
+    on_this_day.add_argument('--date', type=entry_date, help="look back from YYYY-MM-DD instead of today")
+    on_this_day.add_argument('--years-ago', type=int, metavar='N',
+                             help="instead show the whole of this week N years ago")
+    on_this_day.set_defaults(handler=cmd_on_this_day)
+
+    stats = commands.add_parser('stats', help="entry counts, streaks and most frequent words and people")
+    stats.set_defaults(handler=cmd_stats)
+
+    dedupe = commands.add_parser('dedupe', help="remove entries repeating an earlier entry's date and content")
+    dedupe.add_argument('--dry-run', action='store_true', help="only list the duplicates")
+    dedupe.set_defaults(handler=cmd_dedupe)
+
+    export = commands.add_parser('export', help="write every entry, in date order, to a CSV or JSONL file")
+    export.add_argument('out_path', help="output file; .jsonl selects JSONL and .gz compresses")
+    export.add_argument('--format', choices=("csv", "jsonl"),
+                        help="csv (Presently's format, re-importable) or jsonl (default: from the file name)")
+    export.add_argument('--gzip', action='store_true', help="gzip the output even without a .gz suffix")
+    export.set_defaults(handler=cmd_export)
+
+    mirror = commands.add_parser('mirror', help="copy entries missing from any reachable mirror folder")
+    mirror.set_defaults(handler=cmd_mirror)
+
+    serve = commands.add_parser('serve', help="keep the journal warm in memory and answer other commands")
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT, help="localhost TCP port (default: %(default)s)")
+    serve.add_argument('--socket', help="listen on this Unix domain socket instead")
+    serve.set_defaults(handler=cmd_serve, journal_options={'watch': True})
+    # Answered by a running service when there is one
+    for subparser in (add, random_entries, search, on_this_day):
+        subparser.set_defaults(remote=True)
+
+    # Accept --json after the subcommand too
+    for subparser in (add, imports, vault, random_entries, search, on_this_day, stats, dedupe, export, mirror):
+        subparser.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                               help="write one JSON object per line")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    journal_trace.start_from_environment(args.trace)
+    journal = None
+    if getattr(args, 'remote', False) and not args.no_service:
+        from journal_service import RemoteJournal, ServiceClient
+        client = ServiceClient.connect()
+        if client is not None:
+            journal = RemoteJournal(client)
+    if journal is None:
+        journal = Journal(**getattr(args, 'journal_options', {}))
+    try:
+        return args.handler(journal, args)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"journal {args.command}: {str(e)}", file=sys.stderr)
+        return EXIT_FAILED
+    finally:
+        journal.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+"""UI-free journal operations shared by the Tk app and the command line.
+
+Nothing here imports tkinter. Heavier modules (the index, search, importer and
+archive) are imported on first use so short commands start quickly.
+"""
+import os
+import sys
+import threading
+from datetime import date, datetime
+
+from journal_folders import FolderResolver, load_folder_config, load_mirror_config
+from journal_trace import traced
+
+
+class Journal:
+    def __init__(self, journal_folder_paths=None, save_folder_paths=None, watch=False,
+                 mirror_folder_paths=None):
+        """Folders default to gratitude_journal_config.json / the environment.
+
+        With watch=True a JournalWatcher keeps the index current once opened.
+        Mirror folders are also read as journal folders.
+        """
+        if journal_folder_paths is None:
+            journal_folder_paths, configured_save_paths = load_folder_config()
+            save_folder_paths = save_folder_paths or configured_save_paths
+        if mirror_folder_paths is None:
+            mirror_folder_paths = load_mirror_config()
+        self.journal_folder_paths = list(journal_folder_paths)
+        self.save_folder_paths = list(save_folder_paths or journal_folder_paths)
+        self.mirror_folder_paths = list(mirror_folder_paths)
+        self.journal_folder_paths.extend(
+            path for path in self.mirror_folder_paths if path not in self.journal_folder_paths
+        )
+        self.watch = watch
+
+        # Drive probing is done once, concurrently, and cached
+        self.journal_folders = FolderResolver(self.journal_folder_paths)
+        self.import_folders = FolderResolver(self.journal_folder_paths, create=True)
+        self.save_folders = FolderResolver(self.save_folder_paths, create=True)
+        self.mirror_folders = FolderResolver(self.mirror_folder_paths, create=True)
+
+        # On-disk entry index, opened on first use, and the thread that keeps
+        # it in step with files synced in from other machines
+        self.index = None
+        self.watcher = None
+        self.search_index = None
+        self.stats = None
+        self.deck = None
+        self.timeline = None
+        self.anniversaries = None
+        self.content_hashes = None
+        self.mirror = None
+        # How load_random_entry picks: see journal_deck.MODES
+        self.random_mode = "shuffle"
+        self.packed_archive = None
+        self._entry_loader = None
+        self._writers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def entry_loader(self):
+        # Parsed entries shared by the index and the viewers
+        if self._entry_loader is None:
+            from journal_loader import EntryLoader
+            self._entry_loader = EntryLoader()
+        return self._entry_loader
+
+    @traced()
+    def get_index(self):
+        """The entry index, or None when no journal folder is reachable."""
+        from journal_index import JournalWatcher, open_journal_index
+        from journal_stats import JournalStats
+
+        # May be called from several threads, so only one opens the index
+        with self._lock:
+            if self.index is None:
+                self.index = open_journal_index(
+                    self.journal_folders.reachable(), self.entry_loader, self._attach_archive
+                )
+                if self.index is not None:
+                    # Attached up front so every save and import updates the totals
+                    self.stats = JournalStats(self.index)
+                    if self.watch:
+                        self.watcher = JournalWatcher(self.index, self.journal_folders.reachable)
+                        self.watcher.start()
+            return self.index
+
+    @traced()
+    def warm_up(self):
+        """Open the index, deck, search and month-day indexes now rather than on first use.
+
+        On a large journal the first open indexes every entry, which can
+        take far longer than any one click should wait. Returns the index.
+        """
+        index = self.get_index()
+        if index is not None:
+            self.get_deck()
+            self.get_search_index()
+            self.get_anniversaries()
+        return index
+
+    def _attach_archive(self, index):
+        from journal_archive import attach_archive
+
+        # Before the first refresh, so a rebuilt index can read from it
+        self.packed_archive = attach_archive(index, os.path.dirname(index.index_path))
+
+    def get_search_index(self):
+        from journal_search import SearchIndex
+
+        index = self.get_index()
+        if index is None:
+            return None
+        with self._lock:
+            if self.search_index is None:
+                self.search_index = SearchIndex(index)
+            return self.search_index
+
+    def get_deck(self):
+        from journal_deck import ShuffleDeck
+
+        # Entries on several folders are drawn once
+        content_hashes = self.get_content_hashes()
+        if content_hashes is None:
+            return None
+        with self._lock:
+            if self.deck is None:
+                self.deck = ShuffleDeck(content_hashes.index, content_hashes=content_hashes)
+            return self.deck
+
+    def get_timeline(self):
+        from journal_timeline import JournalTimeline
+
+        content_hashes = self.get_content_hashes()
+        if content_hashes is None:
+            return None
+        with self._lock:
+            if self.timeline is None:
+                self.timeline = JournalTimeline(content_hashes.index, content_hashes=content_hashes)
+            return self.timeline
+
+    def get_anniversaries(self):
+        from journal_anniversary import AnniversaryIndex
+
+        content_hashes = self.get_content_hashes()
+        if content_hashes is None:
+            return None
+        with self._lock:
+            if self.anniversaries is None:
+                self.anniversaries = AnniversaryIndex(content_hashes.index, content_hashes=content_hashes)
+            return self.anniversaries
+
+    def on_this_day(self, day=None):
+        """Entries from this date (or day) in earlier years, newest first; None when no folder is reachable."""
+        anniversaries = self.get_anniversaries()
+        if anniversaries is None:
+            return None
+        return anniversaries.on_this_day(day)
+
+    def week_years_ago(self, years=1, day=None):
+        """(monday, sunday, entries) for this week years ago; None when no folder is reachable."""
+        anniversaries = self.get_anniversaries()
+        if anniversaries is None:
+            return None
+        return anniversaries.week_years_ago(years, day)
+
+    def get_mirror(self, open_index=True):
+        """The JournalMirror, or None unless two or more mirror folders are configured.
+
+        With open_index=False the index is not opened; until it is, the
+        mirror can replicate new files but not reconcile.
+        """
+        from journal_mirror import JournalMirror
+
+        if len(self.mirror_folder_paths) < 2:
+            return None
+        index = self.get_index() if open_index else self.index
+        if index is None and open_index:
+            return None
+        with self._lock:
+            if self.mirror is None:
+                self.mirror = JournalMirror(self.mirror_folders, index)
+            elif self.mirror.index is None:
+                self.mirror.index = index
+            return self.mirror
+
+    def reconcile_mirrors(self):
+        """Copy entries missing from any reachable mirror folder; returns the number copied."""
+        mirror = self.get_mirror()
+        if mirror is None:
+            return 0
+        copies = mirror.reconcile()
+        if copies:
+            mirror.index.record_files(copies)
+        return len(copies)
+
+    def get_content_hashes(self):
+        from journal_dedupe import ContentHashIndex
+
+        index = self.get_index()
+        if index is None:
+            return None
+        with self._lock:
+            if self.content_hashes is None:
+                self.content_hashes = ContentHashIndex(index)
+            return self.content_hashes
+
+    def search(self, query, limit=50):
+        """SearchResults for query (see journal_search.parse_query), or None when no folder is reachable."""
+        search_index = self.get_search_index()
+        if search_index is None:
+            return None
+        return search_index.search(query, limit=limit)
+
+    def stats_summary(self):
+        """A StatsSummary of the whole journal, or None when no folder is reachable."""
+        if self.get_index() is None:
+            return None
+        return self.stats.summary()
+
+    def record_files(self, filepaths, open_index=True):
+        """Keep the entry index, and any mirror folders, in step with newly written files.
+
+        With open_index=False the index is only updated if it is already
+        open; otherwise the files, and their copies on the mirror folders,
+        are indexed when it is next opened.
+        """
+        index = None
+        if open_index or self.index is not None:
+            try:
+                index = self.get_index()
+                if index is not None:
+                    index.record_files(filepaths)
+            except Exception as e:
+                # The files themselves are saved; the index catches up on refresh
+                print(f"Could not update entry index for {len(filepaths)} file(s): {str(e)}", file=sys.stderr)
+                return
+
+        try:
+            mirror = self.get_mirror(open_index=False)
+            if mirror is not None:
+                copies = mirror.replicate(filepaths)
+                if copies and index is not None:
+                    index.record_files(copies)
+        except Exception as e:
+            # Caught up by the next reconcile
+            print(f"Could not mirror {len(filepaths)} file(s): {str(e)}", file=sys.stderr)
+
+    def get_writer(self, folder_path):
+        """The EntryWriter for folder_path, numbering new files from the index if it is open.
+
+        Saving never opens (let alone builds) the index: until it is open, or
+        if it cannot be read, the allocator numbers from a folder listing.
+        """
+        import sqlite3
+        from journal_writer import EntryWriter, FilenameAllocator
+
+        with self._lock:
+            writer = self._writers.get(folder_path)
+        if writer is None:
+            def lookup(date_str):
+                # The index may lag a file synced in moments ago; the writer
+                # then simply moves on to the next free counter
+                index = self.index
+                if index is None:
+                    return None
+                try:
+                    return index.next_counter(folder_path, date_str)
+                except sqlite3.Error:
+                    return None
+
+            with self._lock:
+                writer = self._writers.setdefault(
+                    folder_path, EntryWriter(folder_path, FilenameAllocator(folder_path, lookup))
+                )
+        return writer
+
+    @traced()
+    def write_entry(self, gratitude_entries, date_str=None):
+        """Save a journal entry; returns (filename, folder_path).
+
+        date_str must be an ISO date (YYYY-MM-DD); it becomes part of the
+        filename, so anything else raises ValueError.
+        """
+        from journal_entries import format_journal_entry
+
+        if date_str:
+            if not isinstance(date_str, str):
+                raise ValueError(f"Not a date: {date_str!r}")
+            date_str = date.fromisoformat(date_str).isoformat()
+        folder_path = self.save_folders.resolve()
+        date_str = date_str or datetime.now().strftime("%Y-%m-%d")
+
+        try:
+            filepath = self.get_writer(folder_path).write(date_str, format_journal_entry(gratitude_entries))
+        except OSError:
+            # The drive may have gone away; probe again next time
+            self.save_folders.invalidate()
+            raise
+
+        self.record_files([filepath], open_index=False)
+        return os.path.basename(filepath), folder_path
+
+    @traced()
+    def presently_importer(self, csv_path, workers=4, batch_size=200, fsync_every=None):
+        """Resolve the target folder and return a ready-to-run PresentlyImporter."""
+        from journal_import import PresentlyImporter
+
+        folder_path = self.import_folders.resolve()
+        # Open the index up front so the import threads only ever update it
+        content_hashes = self.get_content_hashes()
+        return PresentlyImporter(
+            csv_path, folder_path, workers=workers, batch_size=batch_size,
+            on_batch_written=self.record_files, fsync_every=fsync_every,
+            known_keys=content_hashes.keys() if content_hashes is not None else None
+        )
+
+    @traced()
+    def vault_importer(self, vault_path, workers=None, batch_size=200, rules=None):
+        """Resolve the target folder and return a ready-to-run VaultImporter.
+
+        workers defaults to one process per core.
+        """
+        from journal_vault import VaultImporter
+
+        folder_path = self.import_folders.resolve()
+        content_hashes = self.get_content_hashes()
+        return VaultImporter(
+            vault_path, folder_path, rules=rules,
+            # A journal folder inside the vault is already in the journal
+            exclude_paths=self.journal_folder_paths + [folder_path],
+            workers=workers or os.cpu_count() or 1, batch_size=batch_size,
+            on_batch_written=self.record_files,
+            known_keys=content_hashes.keys() if content_hashes is not None else None
+        )
+
+    @traced()
+    def load_random_entry(self, mode=None):
+        """Draw the next entry from the shuffle deck and load it through the entry cache."""
+        return self._load_from_deck(mode, draw=True)
+
+    @traced()
+    def peek_random_entry(self, mode=None):
+        """Load the entry load_random_entry() would return, leaving it in the deck.
+
+        Call mark_entry_shown() once it is on screen.
+        """
+        return self._load_from_deck(mode, draw=False)
+
+    def mark_entry_shown(self, filepath, mode=None):
+        """Use up an entry from peek_random_entry() now that it has been shown."""
+        deck = self.get_deck()
+        if deck is None:
+            return
+        entry = deck.index.get_by_path(filepath)
+        if entry is not None:
+            deck.mark_shown(entry.id, mode or self.random_mode)
+
+    def _load_from_deck(self, mode, draw):
+        deck = self.get_deck()
+        if deck is None:
+            return None
+
+        mode = mode or self.random_mode
+        for _ in range(5):
+            entry = deck.draw(mode) if draw else deck.peek(mode)
+            if entry is None:
+                return None
+            try:
+                # The index signature lets a cache hit skip the drive entirely
+                return self.entry_loader.load(entry.path, (entry.mtime, entry.size))
+            except FileNotFoundError:
+                # Deleted since it was indexed - forget it and pick again
+                deck.index.remove_path(entry.path)
+        return None
+
+    def export(self, out_path, fmt=None, compress=None):
+        """Stream the journal to a Presently CSV or JSONL file; returns an ExportResult."""
+        from journal_export import export_journal
+
+        index = self.get_index()
+        if index is None:
+            raise OSError("None of the specified drives are accessible")
+        return export_journal(index, out_path, fmt, compress)
+
+    def find_duplicates(self):
+        """Entries repeating an earlier entry's date and content; see ContentHashIndex."""
+        content_hashes = self.get_content_hashes()
+        if content_hashes is None:
+            raise OSError("None of the specified drives are accessible")
+        return content_hashes.find_duplicates()
+
+    def remove_duplicates(self, duplicates=None):
+        """Delete duplicate entry files; returns (removed, failed) path lists."""
+        content_hashes = self.get_content_hashes()
+        if content_hashes is None:
+            raise OSError("None of the specified drives are accessible")
+        removed, failed = content_hashes.remove_duplicates(duplicates)
+        for filepath in removed:
+            self.entry_loader.invalidate(filepath)
+        return removed, failed
+
+    def build_packed_archive(self):
+        """(Re)build the packed archive from the markdown files; returns (entries, path)."""
+        from journal_archive import build_archive
+
+        index = self.get_index()
+        if index is None:
+            raise OSError("None of the specified drives are accessible")
+        self.packed_archive = build_archive(
+            index,
+            os.path.dirname(index.index_path),
+            self.journal_folders.reachable(),
+            self.packed_archive
+        )
+        return index.count(), self.packed_archive.pack_path
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+        with self._lock:
+            if self.index is not None:
+                self.index.close()
+                self.index = None
@@ -0,0 +1,364 @@
+"""No-repeat shuffle deck and weighted sampling for the random-entry viewer.
+
+The deck is a random permutation of entry ids kept as an array('I') and
+stored, with a cursor, in the entry index database. Drawing reads the id at
+the cursor and advances it, so every entry is shown once before any repeats
+and a draw only writes the cursor back. A draw can be split into peek() and
+mark_shown() so an entry loaded ahead of time is only used up once shown.
+New entries are spliced in at a random position among those not yet drawn;
+deleted ones are skipped when drawn. When the deck runs out it is
+reshuffled.
+
+The weighted modes favour older or rarely seen entries instead. They sample
+from a Fenwick tree of per-entry weights, which makes a draw and a weight
+update O(log n).
+"""
+import random
+import time
+from array import array
+from datetime import date
+
+from journal_dedupe import MIRROR_COPY_IDS
+from journal_trace import traced
+
+MODE_SHUFFLE = "shuffle"
+MODE_OLDER = "older"
+MODE_RARELY_SEEN = "rarely_seen"
+MODES = (MODE_SHUFFLE, MODE_OLDER, MODE_RARELY_SEEN)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deck (
+    name TEXT PRIMARY KEY,
+    ids BLOB NOT NULL,
+    cursor INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deck_views (
+    entry_id INTEGER PRIMARY KEY,
+    views INTEGER NOT NULL,
+    last_seen REAL NOT NULL
+);
+"""
+
+_DECK_NAME = "random"
+
+
+class FenwickTree:
+    """Prefix sums over a growable array of non-negative weights."""
+
+    def __init__(self, weights=()):
+        self.weights = array('d', weights)
+        # 1-based tree, built in O(n)
+        self.tree = array('d', [0.0]) + self.weights
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return len(self.weights)
+
+    def _prefix(self, i):
+        """Sum of the first i weights."""
+        total = 0.0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def total(self):
+        return self._prefix(len(self.weights))
+
+    def set(self, slot, weight):
+        delta = weight - self.weights[slot]
+        self.weights[slot] = weight
+        i = slot + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def append(self, weight):
+        """Add a slot at the end; returns its number."""
+        i = len(self.tree)
+        self.weights.append(weight)
+        # The new node covers (i - lowbit(i), i]
+        self.tree.append(weight + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        return i - 1
+
+    def find(self, target):
+        """The slot whose cumulative weight range contains target (0 <= target < total)."""
+        position = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            following = position + step
+            if following < len(self.tree) and self.tree[following] <= target:
+                position = following
+                target -= self.tree[following]
+            step >>= 1
+        return min(position, len(self.weights) - 1)
+
+
+def age_weight(entry_date, today):
+    """Weight for MODE_OLDER: one plus the entry's age in years."""
+    try:
+        return 1.0 + max((today - date.fromisoformat(entry_date)).days, 0) / 365.0
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def rarity_weight(views):
+    """Weight for MODE_RARELY_SEEN: never-seen entries are the likeliest."""
+    return 1.0 / (1 + views)
+
+
+class ShuffleDeck:
+    def __init__(self, journal_index, rng=None, content_hashes=None):
+        """With a ContentHashIndex, copies of an entry on other folders are never drawn."""
+        self.index = journal_index
+        self.conn = journal_index.conn
+        self.random = rng or random.Random()
+        self.content_hashes = content_hashes
+        self._samplers = {}
+        with self.index.lock:
+            self.conn.executescript(_SCHEMA)
+            self._load()
+            self.sync()
+        journal_index.add_listener(self._on_index_changes)
+
+    def _load(self):
+        self.ids = array('I')
+        self.cursor = 0
+        row = self.conn.execute(
+            "SELECT ids, cursor FROM deck WHERE name = ?", (_DECK_NAME,)
+        ).fetchone()
+        if row is not None:
+            self.ids.frombytes(row[0])
+            self.cursor = min(row[1], len(self.ids))
+
+    def _save(self):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO deck (name, ids, cursor) VALUES (?, ?, ?)",
+                (_DECK_NAME, self.ids.tobytes(), self.cursor)
+            )
+
+    def _save_cursor(self):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE deck SET cursor = ? WHERE name = ?", (self.cursor, _DECK_NAME)
+            )
+
+    def _live_condition(self):
+        if self.content_hashes is None:
+            return "items != '[]'"
+        return f"items != '[]' AND id NOT IN ({MIRROR_COPY_IDS})"
+
+    def _is_copy(self, entry_id):
+        return self.content_hashes is not None and self.content_hashes.is_mirror_copy(entry_id)
+
+    def _live_ids(self):
+        return [row[0] for row in self.conn.execute(f"SELECT id FROM entries WHERE {self._live_condition()}")]
+
+    def sync(self):
+        """Splice in entries indexed while the deck was not listening."""
+        with self.index.lock:
+            live = self._live_ids()
+            if not self.ids:
+                self._shuffle(live)
+                return
+            in_deck = set(self.ids)
+            missing = [entry_id for entry_id in live if entry_id not in in_deck]
+            if missing:
+                self._splice(missing)
+
+    def _shuffle(self, entry_ids, avoid_first=None):
+        ids = array('I', entry_ids)
+        self.random.shuffle(ids)
+        # Do not show the last card of the old deck again straight away
+        if len(ids) > 1 and ids[0] == avoid_first:
+            swap = self.random.randrange(1, len(ids))
+            ids[0], ids[swap] = ids[swap], ids[0]
+        self.ids = ids
+        self.cursor = 0
+        self._save()
+
+    def _splice(self, entry_ids):
+        """Insert ids at random positions among the cards not drawn yet.
+
+        One merge pass, so splicing in a whole import is linear rather than
+        one array.insert per entry.
+        """
+        new_ids = list(entry_ids)
+        self.random.shuffle(new_ids)
+        remaining = len(self.ids) - self.cursor
+        positions = sorted(self.random.randint(0, remaining) for _ in new_ids)
+
+        merged = self.ids[:self.cursor]
+        previous = 0
+        for position, entry_id in zip(positions, new_ids):
+            merged.extend(self.ids[self.cursor + previous:self.cursor + position])
+            merged.append(entry_id)
+            previous = position
+        merged.extend(self.ids[self.cursor + previous:])
+        self.ids = merged
+        self._save()
+
+    def _on_index_changes(self, changes):
+        with self.index.lock:
+            # Removed entries stay in the deck and are skipped when drawn
+            added = [entry.id for entry in changes.added if entry.items and not self._is_copy(entry.id)]
+            if added:
+                self._splice(added)
+            for sampler in self._samplers.values():
+                sampler.update(changes)
+
+    @traced()
+    def draw(self, mode=MODE_SHUFFLE):
+        """Return the next JournalEntry to show, or None if there are none."""
+        with self.index.lock:
+            entry = self.peek(mode)
+            if entry is not None:
+                self.mark_shown(entry.id, mode)
+            return entry
+
+    def peek(self, mode=MODE_SHUFFLE):
+        """The JournalEntry draw() would return, left in the deck.
+
+        Nothing is counted as seen until mark_shown(), so an entry fetched
+        ahead of time and then thrown away is not used up.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown random mode {mode!r}; expected one of {', '.join(MODES)}")
+        with self.index.lock:
+            if mode == MODE_SHUFFLE:
+                return self._peek_shuffled()
+            return self._sampler(mode).draw()
+
+    def mark_shown(self, entry_id, mode=MODE_SHUFFLE):
+        """Take a peeked entry out of the deck and count it as seen."""
+        with self.index.lock:
+            if mode == MODE_SHUFFLE:
+                self._take(entry_id)
+            self._record_view(entry_id)
+
+    def _peek_shuffled(self):
+        reshuffled = skipped = False
+        while True:
+            if self.cursor >= len(self.ids):
+                if reshuffled:
+                    return None
+                last = self.ids[-1] if self.ids else None
+                self._shuffle(self._live_ids(), avoid_first=last)
+                reshuffled = True
+                if not self.ids:
+                    return None
+            entry = self.index.get(self.ids[self.cursor])
+            if entry is not None and entry.items and not self._is_copy(entry.id):
+                if skipped:
+                    self._save_cursor()
+                return entry
+            # Deleted since it was dealt; drop it for good
+            self.cursor += 1
+            skipped = True
+
+    def _take(self, entry_id):
+        """Move entry_id to the cursor, if it has not been drawn yet, and draw it."""
+        if self.cursor < len(self.ids) and self.ids[self.cursor] == entry_id:
+            self.cursor += 1
+            self._save_cursor()
+            return
+        # Drawn by someone else since it was peeked, or not peeked from this deck
+        try:
+            position = self.ids.index(entry_id, self.cursor)
+        except ValueError:
+            return
+        self.ids[self.cursor], self.ids[position] = self.ids[position], self.ids[self.cursor]
+        self.cursor += 1
+        self._save()
+
+    def _sampler(self, mode):
+        sampler = self._samplers.get(mode)
+        if sampler is None:
+            sampler = self._samplers[mode] = WeightedSampler(self, mode)
+        return sampler
+
+    def _record_view(self, entry_id):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO deck_views (entry_id, views, last_seen) VALUES (?, 1, ?) "
+                "ON CONFLICT(entry_id) DO UPDATE SET views = views + 1, last_seen = excluded.last_seen",
+                (entry_id, time.time())
+            )
+        sampler = self._samplers.get(MODE_RARELY_SEEN)
+        if sampler is not None:
+            sampler.viewed(entry_id)
+
+    def views(self, entry_id):
+        with self.index.lock:
+            row = self.conn.execute(
+                "SELECT views FROM deck_views WHERE entry_id = ?", (entry_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+
+class WeightedSampler:
+    """In-memory Fenwick tree over every entry's weight for one weighted mode."""
+
+    def __init__(self, deck, mode):
+        self.deck = deck
+        self.mode = mode
+        self.today = date.today()
+        self.slots = {}
+        self.entry_ids = []
+        self.view_counts = {}
+        weights = []
+        rows = deck.conn.execute(
+            "SELECT id, date, COALESCE(v.views, 0) FROM entries "
+            f"LEFT JOIN deck_views v ON v.entry_id = id WHERE {deck._live_condition()}"
+        ).fetchall()
+        for entry_id, entry_date, views in rows:
+            self.slots[entry_id] = len(self.entry_ids)
+            self.entry_ids.append(entry_id)
+            self.view_counts[entry_id] = views
+            weights.append(self._weight(entry_date, views))
+        self.tree = FenwickTree(weights)
+
+    def _weight(self, entry_date, views):
+        if self.mode == MODE_OLDER:
+            return age_weight(entry_date, self.today)
+        return rarity_weight(views)
+
+    def update(self, changes):
+        for entry in changes.removed:
+            slot = self.slots.get(entry.id)
+            if slot is not None:
+                self.tree.set(slot, 0.0)
+        for entry in changes.added + changes.changed:
+            live = entry.items and not self.deck._is_copy(entry.id)
+            weight = self._weight(entry.date, self.view_counts.get(entry.id, 0)) if live else 0.0
+            slot = self.slots.get(entry.id)
+            if slot is None:
+                self.slots[entry.id] = self.tree.append(weight)
+                self.entry_ids.append(entry.id)
+            else:
+                self.tree.set(slot, weight)
+
+    def viewed(self, entry_id):
+        slot = self.slots.get(entry_id)
+        if slot is None:
+            return
+        views = self.view_counts.get(entry_id, 0) + 1
+        self.view_counts[entry_id] = views
+        if self.tree.weights[slot] > 0:
+            self.tree.set(slot, rarity_weight(views))
+
+    def draw(self):
+        for _ in range(5):
+            total = self.tree.total()
+            if total <= 0:
+                return None
+            slot = self.tree.find(self.deck.random.random() * total)
+            entry = self.deck.index.get(self.entry_ids[slot])
+            if entry is not None and entry.items and not self.deck._is_copy(entry.id):
+                return entry
+            self.tree.set(slot, 0.0)  # gone since the tree was built
+        return None
@@ -0,0 +1,141 @@
+"""Content hashes of journal entries, for skipping and removing duplicates.
+
+Every indexed entry's items are normalised (whitespace collapsed, case
+folded) and hashed together with its date. The hashes are kept in the entry
+index database and follow its change notifications, so an import can load
+them into a set once and skip a row whose (date, content) is already in the
+journal without opening any files, and a one-off pass can find the existing
+copies left behind by earlier re-imports.
+
+The same hashes let browsing show an entry once when it exists on several
+journal folders (mirrored or synced drives): copies of an entry in another
+folder with a lower id are "mirror copies" and are hidden.
+"""
+import hashlib
+import os
+import sys
+from collections import defaultdict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_hashes (
+    entry_id INTEGER PRIMARY KEY,
+    date TEXT,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS content_hashes_by_hash ON content_hashes(date, hash);
+"""
+
+# True for content_hashes h / entries e when another folder has the same entry first
+_MIRROR_COPY_CONDITION = (
+    "EXISTS (SELECT 1 FROM content_hashes o JOIN entries oe ON oe.id = o.entry_id "
+    "WHERE o.date = h.date AND o.hash = h.hash AND o.entry_id < h.entry_id AND oe.folder != e.folder)"
+)
+# Ids of every mirror copy, for use in "id NOT IN (...)"
+MIRROR_COPY_IDS = (
+    "SELECT h.entry_id FROM content_hashes h JOIN entries e ON e.id = h.entry_id "
+    f"WHERE {_MIRROR_COPY_CONDITION}"
+)
+
+
+def normalize_items(items):
+    return "\n".join(" ".join(item.split()).casefold() for item in items if item.strip())
+
+
+def content_key(entry_date, items):
+    """The dedupe key for an entry: its date plus a hash of its normalised items."""
+    digest = hashlib.blake2b(normalize_items(items).encode('utf-8'), digest_size=16).hexdigest()
+    return f"{entry_date or ''}:{digest}"
+
+
+class ContentHashIndex:
+    def __init__(self, journal_index):
+        self.index = journal_index
+        self.conn = journal_index.conn
+        with self.index.lock:
+            self.conn.executescript(_SCHEMA)
+        journal_index.follow('content_hashes', self._remove, self._add)
+
+    def _remove(self, entry_ids):
+        self.conn.executemany(
+            "DELETE FROM content_hashes WHERE entry_id = ?", [(entry_id,) for entry_id in entry_ids]
+        )
+
+    def _add(self, entries):
+        rows = []
+        for entry in entries:
+            entry_date, digest = content_key(entry.date, entry.items).split(':', 1)
+            rows.append((entry.id, entry.date, digest, entry.size, entry.mtime))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO content_hashes (entry_id, date, hash, size, mtime) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def keys(self):
+        """Every content_key() in the journal, as a set for O(1) membership tests."""
+        with self.index.lock:
+            return {
+                f"{entry_date or ''}:{digest}"
+                for entry_date, digest in self.conn.execute("SELECT date, hash FROM content_hashes")
+            }
+
+    def contains(self, entry_date, items):
+        digest = content_key(entry_date, items).split(':', 1)[1]
+        with self.index.lock:
+            return self.conn.execute(
+                "SELECT 1 FROM content_hashes WHERE date IS ? AND hash = ? LIMIT 1",
+                (entry_date, digest)
+            ).fetchone() is not None
+
+    def is_mirror_copy(self, entry_id):
+        """True if the same entry is also in another folder, and shown from there."""
+        with self.index.lock:
+            return self.conn.execute(
+                f"{MIRROR_COPY_IDS} AND h.entry_id = ?", (entry_id,)
+            ).fetchone() is not None
+
+    def find_duplicates(self):
+        """Entries whose date and content repeat an earlier file in the same folder.
+
+        The copy with the lowest counter is kept. Entries with no items or
+        no date are never reported. Copies in different folders (e.g. mirrored
+        drives) are not duplicates.
+        """
+        with self.index.lock:
+            rows = self.conn.execute(
+                "SELECT e.id, e.folder, h.date, h.hash FROM content_hashes h "
+                "JOIN entries e ON e.id = h.entry_id "
+                "WHERE e.items != '[]' AND (h.date, h.hash) IN ("
+                "    SELECT date, hash FROM content_hashes GROUP BY date, hash HAVING COUNT(*) > 1"
+                ")"
+            ).fetchall()
+            groups = defaultdict(list)
+            for entry_id, folder, entry_date, digest in rows:
+                groups[(folder, entry_date, digest)].append(self.index.get(entry_id))
+
+        duplicates = []
+        for entries in groups.values():
+            entries.sort(key=lambda entry: (entry.counter, entry.path))
+            duplicates.extend(entries[1:])
+        duplicates.sort(key=lambda entry: (entry.date or "", entry.counter))
+        return duplicates
+
+    def remove_duplicates(self, duplicates=None):
+        """Delete duplicate entry files; returns (removed, failed) path lists."""
+        if duplicates is None:
+            duplicates = self.find_duplicates()
+        removed, failed = [], []
+        for entry in duplicates:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Could not remove {entry.path}: {str(e)}", file=sys.stderr)
+                failed.append(entry.path)
+                continue
+            self.index.remove_path(entry.path)
+            removed.append(entry.path)
+        return removed, failed
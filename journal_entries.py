@@ -0,0 +1,118 @@
+"""Filename and content formats shared by the journal app, its index and importers."""
+import fnmatch
+import re
+
+ENTRY_GLOB = "*Gratitude*.md"
+
+# Numbered gratitude items - handles both original and imported formats
+ITEM_PATTERN = re.compile(r'\d+\.\s+(.+?)(?=\n\d+\.|\n---|\Z)', re.DOTALL)
+DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+COUNTER_PATTERN = re.compile(r'_(\d+)\.md$', re.IGNORECASE)
+HEADER_PATTERN = re.compile(r'^##\s+(.+?)\s*$', re.MULTILINE)
+TAGS_PATTERN = re.compile(r'^Tags:(.*)$', re.MULTILINE)
+
+HEADER_TYPE_JOURNAL = "journal"
+HEADER_TYPE_PRESENTLY = "presently"
+HEADER_TYPE_UNKNOWN = "unknown"
+
+
+def is_entry_filename(name):
+    """Match the same names as glob("*Gratitude*.md") would."""
+    return not name.startswith('.') and fnmatch.fnmatch(name, ENTRY_GLOB)
+
+
+def parse_entry_filename(name):
+    """Return (date, counter) for a name like '2025-09-22 Gratitude_2.md'.
+
+    date is None when the name does not start with a date; counter is 0 for
+    the first entry of a day.
+    """
+    date_match = DATE_PATTERN.match(name)
+    counter_match = COUNTER_PATTERN.search(name)
+    date_str = date_match.group(1) if date_match else None
+    counter = int(counter_match.group(1)) if counter_match else 0
+    return date_str, counter
+
+
+def parse_entry_items(content):
+    """Extract the numbered gratitude items from an entry's markdown."""
+    return [item.strip() for item in ITEM_PATTERN.findall(content)]
+
+
+def parse_entry_header(content):
+    """Return (header text, header type) for the first '## ' heading."""
+    header_match = HEADER_PATTERN.search(content)
+    if header_match is None:
+        return None, HEADER_TYPE_UNKNOWN
+    header = header_match.group(1)
+    if "Imported from Presently" in header:
+        return header, HEADER_TYPE_PRESENTLY
+    return header, HEADER_TYPE_JOURNAL
+
+
+def parse_entry_tags(content):
+    """Return the hashtags on the 'Tags:' line, without the leading '#'."""
+    tags_match = TAGS_PATTERN.search(content)
+    if tags_match is None:
+        return []
+    return re.findall(r'#([\w-]+)', tags_match.group(1))
+
+
+def entry_filename(date_str, counter):
+    """Build the filename for the counter-th entry of a day (0 = no suffix)."""
+    if counter == 0:
+        return f"{date_str} Gratitude.md"
+    return f"{date_str} Gratitude_{counter}.md"
+
+
+def split_presently_content(entry_content):
+    """Split a Presently entry into its gratitude items.
+
+    Items are separated by double line-breaks (both \\r\\n\\r\\n and \\n\\n).
+    """
+    gratitude_items = re.split(r'\r?\n\r?\n', entry_content.strip())
+    return [item.strip() for item in gratitude_items if item.strip()]
+
+
+def format_presently_entry(gratitude_items):
+    """Render imported Presently items in the journal's markdown format."""
+    gratitude_list = "\n".join([f"{i+1}. {item}" for i, item in enumerate(gratitude_items)])
+
+    return f"""## Things I'm grateful for today (Imported from Presently):
+{gratitude_list}
+
+---
+Tags: #gratitude #imported-presently"""
+
+
+def format_journal_entry(gratitude_entries):
+    """Render the items typed into the app in the journal's markdown format."""
+    # Create the content with variable number of entries
+    num_entries = len(gratitude_entries)
+    if num_entries == 3:
+        header = "## Three things I'm grateful for today:"
+    elif num_entries == 1:
+        header = "## One thing I'm grateful for today:"
+    elif num_entries == 2:
+        header = "## Two things I'm grateful for today:"
+    else:
+        header = f"## {num_entries} things I'm grateful for today:"
+
+    gratitude_list = "\n".join([f"{i+1}. {entry}" for i, entry in enumerate(gratitude_entries)])
+
+    return f"""{header}
+{gratitude_list}
+
+---
+Tags: #gratitude"""
+
+
+def format_vault_entry(gratitude_items):
+    """Render items found in a markdown vault note in the journal's markdown format."""
+    gratitude_list = "\n".join([f"{i+1}. {item}" for i, item in enumerate(gratitude_items)])
+
+    return f"""## Things I'm grateful for today (Imported from markdown):
+{gratitude_list}
+
+---
+Tags: #gratitude #imported-markdown"""
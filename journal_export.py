@@ -0,0 +1,134 @@
+"""Streaming export of the whole journal to a Presently-style CSV or to JSONL.
+
+Entries pass through a generator pipeline: pages of parsed entries are read
+from the entry index, copies of the same entry on mirrored folders are
+dropped, and each entry is serialized to one CSV row or JSON line as it is
+written. Memory therefore stays flat however large the journal is. Output is
+in date order, optionally gzip-compressed, and is written to a temporary
+file that replaces the target only once complete.
+
+The CSV has Presently's entryDate,entryContent columns, with the items
+joined by blank lines, so importing it with the Presently importer gives the
+same dated entries back. Blank lines inside an item are folded to single
+line breaks so they do not split it. Presently rows need a date, so undated
+entries are only included in JSONL.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import time
+from collections import namedtuple
+
+from journal_dedupe import content_key
+from journal_trace import traced
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+
+PRESENTLY_COLUMNS = ['entryDate', 'entryContent']
+
+BLANK_LINES_PATTERN = re.compile(r'(?:[ \t]*\r?\n){2,}')
+
+# skipped counts entries left out: empty, duplicate copies, or undated (CSV only)
+ExportResult = namedtuple('ExportResult', ['exported', 'skipped', 'path', 'elapsed'])
+
+
+def export_format(path):
+    """FORMAT_JSONL for a .jsonl or .jsonl.gz path, else FORMAT_CSV."""
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    return FORMAT_JSONL if name.endswith('.jsonl') else FORMAT_CSV
+
+
+def presently_content(items):
+    return "\n\n".join(BLANK_LINES_PATTERN.sub("\n", item) for item in items)
+
+
+def unique_entries(entries, counts, require_date=False):
+    """Drop empty entries and repeated copies of an entry (e.g. on mirrored folders).
+
+    Only the current date's keys are kept, which is enough because entries
+    arrive in date order. counts['skipped'] is incremented for each drop.
+    """
+    current_date, seen = None, set()
+    for entry in entries:
+        if not entry.items or (require_date and entry.date is None):
+            counts['skipped'] += 1
+            continue
+        if entry.date != current_date:
+            current_date, seen = entry.date, set()
+        key = content_key(entry.date, entry.items)
+        if key in seen:
+            counts['skipped'] += 1
+            continue
+        seen.add(key)
+        yield entry
+
+
+def csv_chunks(entries):
+    """Serialize entries as a Presently CSV, header first, one row per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(PRESENTLY_COLUMNS)
+    for entry in entries:
+        writer.writerow([entry.date, presently_content(entry.items)])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_chunks(entries):
+    for entry in entries:
+        yield json.dumps(
+            {'date': entry.date, 'items': entry.items, 'file': os.path.basename(entry.path)},
+            ensure_ascii=False
+        ) + "\n"
+
+
+def _open_output(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+@traced()
+def export_journal(journal_index, out_path, fmt=None, compress=None, page_size=500):
+    """Write every entry to out_path; returns an ExportResult.
+
+    fmt and compress default to what out_path's suffix says (see export_format).
+    """
+    started = time.perf_counter()
+    fmt = fmt or export_format(out_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if compress is None:
+        compress = out_path.lower().endswith('.gz')
+
+    counts = {'exported': 0, 'skipped': 0}
+    entries = unique_entries(journal_index.iter_entries(page_size), counts, require_date=fmt == FORMAT_CSV)
+
+    def counted(entries):
+        for entry in entries:
+            counts['exported'] += 1
+            yield entry
+
+    serialize = csv_chunks if fmt == FORMAT_CSV else jsonl_chunks
+    temp_path = f"{out_path}.part"
+    try:
+        with _open_output(temp_path, compress) as f:
+            for chunk in serialize(counted(entries)):
+                f.write(chunk)
+        os.replace(temp_path, out_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return ExportResult(counts['exported'], counts['skipped'], out_path, time.perf_counter() - started)
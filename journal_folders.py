@@ -0,0 +1,140 @@
+"""Journal folder configuration and cached, time-limited drive resolution.
+
+The candidate folders default to the Google Drive shortcut paths below and can
+be overridden with a gratitude_journal_config.json next to the app:
+
+    {"journal_folders": ["D:\\\\Journal", "G:\\\\Journal"], "save_folders": ["D:\\\\Journal"]}
+
+or with the GRATITUDE_JOURNAL_FOLDERS / GRATITUDE_SAVE_FOLDERS environment
+variables (paths separated by os.pathsep, i.e. ';' on Windows).
+
+Folders listed under "mirror_folders" (or GRATITUDE_MIRROR_FOLDERS) are kept
+as copies of each other; see journal_mirror.py. None are by default.
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+from journal_trace import traced
+
+DEFAULT_JOURNAL_FOLDER_PATHS = [
+    r"E:\.shortcut-targets-by-id\1SfWBu4Xcf-45vCVl2D6nlal18FFde6c5\62.50 Gratitude Journal",
+    r"D:\.shortcut-targets-by-id\1SfWBu4Xcf-45vCVl2D6nlal18FFde6c5\62.50 Gratitude Journal",
+    r"G:\.shortcut-targets-by-id\1SfWBu4Xcf-45vCVl2D6nlal18FFde6c5\62.50 Gratitude Journal"
+]
+DEFAULT_SAVE_FOLDER_PATHS = DEFAULT_JOURNAL_FOLDER_PATHS[1:]  # exclude E: drive for saving
+
+CONFIG_FILENAME = "gratitude_journal_config.json"
+JOURNAL_FOLDERS_ENV_VAR = "GRATITUDE_JOURNAL_FOLDERS"
+SAVE_FOLDERS_ENV_VAR = "GRATITUDE_SAVE_FOLDERS"
+MIRROR_FOLDERS_ENV_VAR = "GRATITUDE_MIRROR_FOLDERS"
+
+
+def _read_config(config_dir):
+    config_path = os.path.join(
+        config_dir or os.path.dirname(os.path.abspath(__file__)), CONFIG_FILENAME
+    )
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable {config_path}: {str(e)}", file=sys.stderr)
+    return {}
+
+
+def load_folder_config(config_dir=None):
+    """Return (journal_folder_paths, save_folder_paths) from env, config file or defaults."""
+    config = _read_config(config_dir)
+
+    journal_paths = _env_paths(JOURNAL_FOLDERS_ENV_VAR) or config.get('journal_folders')
+    save_paths = _env_paths(SAVE_FOLDERS_ENV_VAR) or config.get('save_folders')
+
+    if not journal_paths:
+        journal_paths = list(DEFAULT_JOURNAL_FOLDER_PATHS)
+        save_paths = save_paths or list(DEFAULT_SAVE_FOLDER_PATHS)
+    return list(journal_paths), list(save_paths or journal_paths)
+
+
+def load_mirror_config(config_dir=None):
+    """Return the mirror folder paths from env or config file; empty unless configured."""
+    return list(_env_paths(MIRROR_FOLDERS_ENV_VAR) or _read_config(config_dir).get('mirror_folders') or [])
+
+
+def _env_paths(name):
+    value = os.environ.get(name, "")
+    return [path for path in value.split(os.pathsep) if path.strip()]
+
+
+def _probe(path, create):
+    if create:
+        os.makedirs(path, exist_ok=True)
+        return True
+    return os.path.isdir(path)
+
+
+class FolderResolver:
+    """Pick the first usable folder from a preference-ordered candidate list.
+
+    All candidates are probed at once on daemon threads (an unmounted drive
+    letter can block for seconds and must not hold up the others or the app's
+    exit). The answer is cached for ttl seconds, and invalidate() forces a
+    re-probe after a caller hits an I/O error.
+    """
+
+    def __init__(self, candidate_paths, create=False, timeout=3.0, ttl=300.0):
+        self.candidate_paths = list(candidate_paths)
+        self.create = create
+        self.timeout = timeout
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._reachable = None
+        self._probed_at = 0.0
+
+    @traced("FolderResolver.probe_drives")
+    def _probe_all(self):
+        results = [None] * len(self.candidate_paths)
+        done = [threading.Event() for _ in self.candidate_paths]
+
+        def probe(position, path):
+            try:
+                results[position] = _probe(path, self.create)
+            except OSError:
+                results[position] = False
+            finally:
+                done[position].set()
+
+        for position, path in enumerate(self.candidate_paths):
+            threading.Thread(
+                target=probe, args=(position, path), name="FolderProbe", daemon=True
+            ).start()
+
+        # Wait for every probe, but never past one shared deadline
+        deadline = time.monotonic() + self.timeout
+        for event in done:
+            event.wait(max(deadline - time.monotonic(), 0))
+        return [path for path, ok in zip(self.candidate_paths, results) if ok]
+
+    def reachable(self):
+        """All candidates that answered within the timeout, in preference order."""
+        with self._lock:
+            now = time.monotonic()
+            if self._reachable is None or now - self._probed_at > self.ttl:
+                self._reachable = self._probe_all()
+                self._probed_at = time.monotonic()
+            return list(self._reachable)
+
+    def resolve(self):
+        """The preferred usable folder; raises OSError if none respond."""
+        reachable = self.reachable()
+        if not reachable:
+            self.invalidate()
+            raise OSError("None of the specified drives are accessible")
+        return reachable[0]
+
+    def invalidate(self):
+        with self._lock:
+            self._reachable = None
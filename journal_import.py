@@ -0,0 +1,218 @@
+"""Streaming importer for Presently backup CSVs.
+
+The CSV is read lazily row by row, the target folder is resolved once, and the
+existing filenames are loaded into memory up front so that picking a free
+"{date} Gratitude_N.md" name never touches the disk. Files are written in
+batches by a small worker pool, through the atomic EntryWriter with fsync
+grouped per batch, while the caller polls progress and may cancel. Given the
+journal's content keys (see journal_dedupe.py), rows already in the journal,
+or repeated within the backup, are skipped without opening any files. Rows
+whose date is not a YYYY-MM-DD date are counted as failed, never written.
+
+EntryImporter holds the progress, cancellation, dedupe and batch-writing
+parts, which the markdown vault importer (journal_vault.py) shares.
+"""
+import csv
+import io
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from journal_dedupe import content_key
+from journal_entries import format_presently_entry, split_presently_content
+from journal_trace import traced
+from journal_writer import EntryWriter, FilenameAllocator
+
+ImportProgress = namedtuple(
+    'ImportProgress', ['rows', 'imported', 'skipped', 'fraction', 'rows_per_second']
+)
+# skipped counts rows already in the journal, failed counts rows that could not be imported
+ImportResult = namedtuple(
+    'ImportResult', ['imported', 'skipped', 'failed', 'cancelled', 'elapsed']
+)
+
+
+class _ByteCounter(io.RawIOBase):
+    """Raw stream wrapper that counts bytes so progress can be a fraction of the file."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.raw.readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+    def close(self):
+        self.raw.close()
+        super().close()
+
+
+def valid_date(candidate):
+    """candidate as a YYYY-MM-DD date, or None if it is not an ISO date."""
+    try:
+        return date.fromisoformat(candidate).isoformat()
+    except ValueError:
+        return None
+
+
+def iter_presently_rows(csv_file):
+    """Yield (entry_date, entry_content) for every non-empty row of a Presently CSV."""
+    for row in csv.DictReader(csv_file):
+        entry_date = (row.get('entryDate') or '').strip()
+        entry_content = (row.get('entryContent') or '').strip()
+        if entry_date and entry_content:
+            yield entry_date, entry_content
+
+
+class EntryImporter:
+    """Shared bookkeeping for importers that write new entries into folder_path.
+
+    Call run() (typically on a background thread); progress() and cancel() are
+    safe to call from any other thread. on_batch_written(paths) is called from
+    the writing threads after each batch, e.g. to update the entry index.
+    known_keys is a set of content_key()s already in the journal; it is
+    extended as entries are imported.
+    """
+
+    def __init__(self, folder_path, workers=4, batch_size=200, on_batch_written=None,
+                 fsync_every=None, known_keys=None):
+        """fsync_every defaults to batch_size: one grouped flush per batch."""
+        self.folder_path = folder_path
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.fsync_every = fsync_every or self.batch_size
+        self.on_batch_written = on_batch_written
+        self.known_keys = known_keys
+
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._rows = 0
+        self._imported = 0
+        self._skipped = 0
+        self._failed = 0
+        self._fraction = 0.0
+        self._started = None
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def progress(self):
+        with self._lock:
+            elapsed = time.perf_counter() - self._started if self._started else 0.0
+            rate = self._rows / elapsed if elapsed > 0 else 0.0
+            return ImportProgress(self._rows, self._imported, self._skipped, self._fraction, rate)
+
+    def format_entry(self, items):
+        return format_presently_entry(items)
+
+    def _is_known(self, entry_date, items):
+        """True if the entry is already in the journal; otherwise remember it."""
+        if self.known_keys is None:
+            return False
+        key = content_key(entry_date, items)
+        if key in self.known_keys:
+            return True
+        self.known_keys.add(key)
+        return False
+
+    def _result(self):
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._fraction = 1.0
+            return ImportResult(
+                self._imported, self._skipped, self._failed, self._cancelled.is_set(),
+                time.perf_counter() - self._started
+            )
+
+    @traced()
+    def _write_batch(self, writer, batch):
+        written = []
+        failed = 0
+        for entry_date, filepath, items in batch:
+            if self._cancelled.is_set():
+                break
+            try:
+                content = self.format_entry(items)
+                written.append(writer.write(entry_date, content, filepath))
+            except Exception as e:
+                print(f"Error creating file {filepath}: {str(e)}", file=sys.stderr)
+                failed += 1
+
+        with self._lock:
+            self._imported += len(written)
+            self._failed += failed
+
+        if written and self.on_batch_written is not None:
+            try:
+                self.on_batch_written(written)
+            except Exception as e:
+                print(f"Could not record imported batch: {str(e)}", file=sys.stderr)
+
+
+class PresentlyImporter(EntryImporter):
+    """Import a Presently CSV into folder_path; see EntryImporter."""
+
+    def __init__(self, csv_path, folder_path, **options):
+        super().__init__(folder_path, **options)
+        self.csv_path = csv_path
+
+    @traced()
+    def run(self):
+        self._started = time.perf_counter()
+        allocator = FilenameAllocator(self.folder_path)
+        writer = EntryWriter(self.folder_path, allocator, fsync_every=self.fsync_every)
+        total_bytes = max(os.path.getsize(self.csv_path), 1)
+
+        # Bound the batches in flight so memory stays flat for huge backups
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+
+        def submit(executor, batch):
+            in_flight.acquire()
+            future = executor.submit(self._write_batch, writer, batch)
+            future.add_done_callback(lambda _: in_flight.release())
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            counter = _ByteCounter(open(self.csv_path, 'rb'))
+            with io.TextIOWrapper(io.BufferedReader(counter), encoding='utf-8', newline='') as csvfile:
+                batch = []
+                for entry_date, entry_content in iter_presently_rows(csvfile):
+                    if self._cancelled.is_set():
+                        break
+                    items = split_presently_content(entry_content)
+                    checked_date = valid_date(entry_date)
+                    if checked_date is None:
+                        # The date becomes the filename, so nothing else may get that far
+                        print(f"Invalid date {entry_date!r}; row not imported", file=sys.stderr)
+                        with self._lock:
+                            self._rows += 1
+                            self._failed += 1
+                        continue
+                    entry_date = checked_date
+                    if self._is_known(entry_date, items):
+                        with self._lock:
+                            self._rows += 1
+                            self._skipped += 1
+                        continue
+                    # Names are allocated here, in file order; the writer only
+                    # moves on to the next one if another machine took it meanwhile
+                    batch.append((entry_date, allocator.allocate(entry_date), items))
+                    with self._lock:
+                        self._rows += 1
+                        self._fraction = min(counter.bytes_read / total_bytes, 1.0)
+                    if len(batch) >= self.batch_size:
+                        submit(executor, batch)
+                        batch = []
+                if batch and not self._cancelled.is_set():
+                    submit(executor, batch)
+
+        writer.flush()
+        return self._result()
@@ -0,0 +1,504 @@
+"""Persistent SQLite index of journal entries.
+
+The index lives in the journal folder and records every entry's path, date,
+counter suffix, size, mtime and parsed items so that features such as the
+random-entry viewer can query it instead of listing the (slow, cloud-synced)
+journal folders on every click.
+
+Refreshing is incremental: a folder whose mtime matches the last snapshot is
+not listed at all, and within a changed folder only files whose (size, mtime)
+differ from the index are re-read and re-parsed. When many files need
+parsing at once (a first build, say) and a packed archive is attached, files
+it holds with the same (size, mtime) are taken from it in one sequential read
+instead of being opened one by one.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import namedtuple
+
+from journal_entries import is_entry_filename
+from journal_loader import EntryLoader
+from journal_trace import traced
+
+INDEX_FILENAME = ".gratitude_index.sqlite3"
+
+# Bump whenever the schema changes; the index is a cache and is rebuilt from
+# the markdown files when the version does not match.
+SCHEMA_VERSION = 2
+
+JournalEntry = namedtuple(
+    'JournalEntry', ['id', 'path', 'date', 'counter', 'size', 'mtime', 'items']
+)
+
+# Entries touched by a refresh or write, passed to index listeners
+IndexChanges = namedtuple('IndexChanges', ['added', 'changed', 'removed'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    date TEXT,
+    counter INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    items TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_date ON entries(date, counter);
+CREATE INDEX IF NOT EXISTS entries_by_folder ON entries(folder);
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_ENTRY_COLUMNS = "id, path, date, counter, size, mtime, items"
+
+# Files to parse in one refresh before the packed archive is read instead
+ARCHIVE_MIN_FILES = 50
+
+# Ids bound per "id IN (...)" query, well under SQLite's parameter limit
+ID_CHUNK_SIZE = 500
+
+
+class JournalIndex:
+    def __init__(self, index_path, loader=None):
+        self.index_path = index_path
+        # Parsing goes through the shared loader so freshly indexed entries
+        # are already in its cache
+        self.loader = loader or EntryLoader()
+        # Shared with the watcher thread; every access goes through self.lock
+        self.conn = sqlite3.connect(index_path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.listeners = []
+        # Optional PackedArchive; its records stand in for reading and parsing
+        # files it already holds unchanged (see _refresh_folder)
+        self.archive = None
+        self._archived = None
+        # Keep the rollback journal file around between transactions; creating
+        # and deleting it would bump the journal folder's mtime on every write
+        # and defeat the unchanged-folder shortcut in refresh()
+        self.conn.execute("PRAGMA journal_mode = PERSIST")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            # Stale cache from an older version - start again from the files
+            with self.conn:
+                for (table,) in self.conn.execute(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+                ).fetchall():
+                    self.conn.execute(f"DROP TABLE {table}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def add_listener(self, listener):
+        """Call listener(changes) with an IndexChanges after every update."""
+        self.listeners.append(listener)
+
+    def follow(self, table, remove, add):
+        """Keep an add-on table in step with the entries: catch up now, then after every update.
+
+        table has entry_id, size and mtime columns recording which version of
+        each entry its rows were built from. remove(entry_ids) drops the rows of
+        entries that are gone or changed and add(entries) builds rows for new
+        or changed ones; both run under the lock inside one transaction.
+        """
+        self.catch_up(table, remove, add)
+
+        def on_changes(changes):
+            with self.lock, self.conn:
+                remove([entry.id for entry in changes.removed + changes.changed])
+                add(changes.added + changes.changed)
+
+        self.add_listener(on_changes)
+
+    def catch_up(self, table, remove, add):
+        """Bring a table kept by follow() up to date with entries that changed
+        while nothing was listening. Returns whether anything changed."""
+        with self.lock:
+            stale_ids = [row[0] for row in self.conn.execute(
+                f"SELECT t.entry_id FROM {table} t "
+                "LEFT JOIN entries e ON e.id = t.entry_id "
+                "WHERE e.id IS NULL OR e.size != t.size OR e.mtime != t.mtime"
+            )]
+            missing_ids = [row[0] for row in self.conn.execute(
+                f"SELECT id FROM entries WHERE id NOT IN (SELECT entry_id FROM {table})"
+            )]
+            if not (stale_ids or missing_ids):
+                return False
+            with self.conn:
+                remove(stale_ids)
+                add(self.get_many(stale_ids + missing_ids))
+            return True
+
+    def _notify(self, changes):
+        if not (changes.added or changes.changed or changes.removed):
+            return
+        for listener in self.listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                print(f"Index listener failed: {str(e)}", file=sys.stderr)
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def rebuild(self, folder_paths):
+        """Forget everything and index all entries in the journal folders again."""
+        with self.lock:
+            removed = self._entries_where("1")
+            with self.conn:
+                self.conn.execute("DELETE FROM entries")
+                self.conn.execute("DELETE FROM folders")
+            self._notify(IndexChanges([], [], removed))
+            return self.refresh(folder_paths)
+
+    @traced()
+    def refresh(self, folder_paths, force=False):
+        """Bring the index up to date with the journal folders.
+
+        Only folders whose mtime changed since the last refresh are listed
+        (every folder with force=True), and only files whose (size, mtime)
+        changed are re-parsed. Unreachable folders are left as they are so an
+        offline drive does not empty the index. In-place edits that do not
+        touch the folder mtime are picked up by record_files() or a forced
+        refresh. Entry ids never change for a file that is still there.
+        """
+        added, changed, removed = [], [], []
+        with self.lock:
+            self._archived = None
+            for folder_path in folder_paths:
+                try:
+                    folder_mtime = os.stat(folder_path).st_mtime
+                except OSError:
+                    continue
+
+                row = self.conn.execute(
+                    "SELECT mtime FROM folders WHERE path = ?", (folder_path,)
+                ).fetchone()
+                if not force and row is not None and row[0] == folder_mtime:
+                    continue
+
+                folder_changes = self._refresh_folder(folder_path)
+                if folder_changes is None:
+                    continue
+                added.extend(folder_changes.added)
+                changed.extend(folder_changes.changed)
+                removed.extend(folder_changes.removed)
+
+                # Snapshot the mtime read before listing, so anything that
+                # arrived mid-scan is seen again next time
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO folders (path, mtime) VALUES (?, ?)",
+                        (folder_path, folder_mtime)
+                    )
+
+            self._archived = None
+            changes = IndexChanges(added, changed, removed)
+            self._notify(changes)
+        return changes
+
+    def _archived_entries(self, wanted):
+        """{path: ArchivedEntry} from the archive, read at most once per refresh.
+
+        Only worth a full read of the archive when many files need parsing,
+        e.g. building the index for the first time.
+        """
+        if self.archive is None or wanted < ARCHIVE_MIN_FILES:
+            return {}
+        if self._archived is None:
+            try:
+                self._archived = self.archive.load_all()
+            except (OSError, ValueError) as e:
+                print(f"Could not read the packed archive: {str(e)}", file=sys.stderr)
+                self._archived = {}
+        return self._archived
+
+    def _refresh_folder(self, folder_path):
+        on_disk = {}
+        try:
+            with os.scandir(folder_path) as it:
+                for dir_entry in it:
+                    if is_entry_filename(dir_entry.name) and dir_entry.is_file():
+                        stat = dir_entry.stat()
+                        on_disk[dir_entry.path] = (stat.st_size, stat.st_mtime)
+        except OSError as e:
+            print(f"Could not list {folder_path}: {str(e)}", file=sys.stderr)
+            return None
+
+        known = {
+            path: (size, mtime, entry_id)
+            for entry_id, path, size, mtime in self.conn.execute(
+                "SELECT id, path, size, mtime FROM entries WHERE folder = ?",
+                (folder_path,)
+            )
+        }
+
+        new_paths = [path for path in on_disk if path not in known]
+        changed_paths = [
+            path for path, signature in on_disk.items()
+            if path in known and known[path][:2] != signature
+        ]
+        removed_ids = [known[path][2] for path in known if path not in on_disk]
+
+        removed = [self.get(entry_id) for entry_id in removed_ids]
+        archived = self._archived_entries(len(new_paths) + len(changed_paths))
+        rows = []
+        for path in new_paths + changed_paths:
+            size, mtime = on_disk[path]
+            entry = archived.get(path)
+            if entry is not None and (entry.size, entry.mtime) == (size, mtime):
+                rows.append((path, folder_path, entry.date, entry.counter, size, mtime, json.dumps(entry.items)))
+            else:
+                row = self._read_row(path)
+                if row:
+                    rows.append(row)
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM entries WHERE id = ?", [(entry_id,) for entry_id in removed_ids]
+            )
+            self._upsert_rows(rows)
+
+        entries = {path: self.get_by_path(path) for path in new_paths + changed_paths}
+        return IndexChanges(
+            [entries[path] for path in new_paths if entries[path]],
+            [entries[path] for path in changed_paths if entries[path]],
+            removed
+        )
+
+    def _upsert_rows(self, rows):
+        self.conn.executemany(
+            "INSERT INTO entries (path, folder, date, counter, size, mtime, items) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET folder = excluded.folder, "
+            "date = excluded.date, counter = excluded.counter, size = excluded.size, "
+            "mtime = excluded.mtime, items = excluded.items",
+            rows
+        )
+
+    @traced()
+    def record_files(self, filepaths):
+        """Add or update a batch of freshly written entries in one transaction."""
+        rows = [row for row in map(self._read_row, filepaths) if row]
+        if not rows:
+            return []
+        added, changed = [], []
+        with self.lock:
+            existing = {row[0] for row in rows if self.get_by_path(row[0]) is not None}
+            with self.conn:
+                self._upsert_rows(rows)
+            for row in rows:
+                entry = self.get_by_path(row[0])
+                (changed if row[0] in existing else added).append(entry)
+            self._notify(IndexChanges(added, changed, []))
+        return added + changed
+
+    def remove_path(self, filepath):
+        with self.lock:
+            entry = self.get_by_path(filepath)
+            if entry is None:
+                return
+            with self.conn:
+                self.conn.execute("DELETE FROM entries WHERE id = ?", (entry.id,))
+            self._notify(IndexChanges([], [], [entry]))
+
+    def _read_row(self, filepath):
+        try:
+            stat = os.stat(filepath)
+            parsed = self.loader.load(filepath, (stat.st_mtime, stat.st_size))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Could not index {filepath}: {str(e)}", file=sys.stderr)
+            return None
+
+        return (
+            filepath, os.path.dirname(filepath), parsed.date, parsed.counter,
+            stat.st_size, stat.st_mtime, json.dumps(parsed.items)
+        )
+
+    def _to_entry(self, row):
+        if row is None:
+            return None
+        return JournalEntry(*row[:6], json.loads(row[6]))
+
+    def _entries_where(self, condition, params=()):
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM entries WHERE {condition}", params
+            ).fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def get(self, entry_id):
+        with self.lock:
+            return self._to_entry(self.conn.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM entries WHERE id = ?", (entry_id,)
+            ).fetchone())
+
+    def get_many(self, entry_ids):
+        """The entries with the given ids, in no particular order; missing ids are skipped."""
+        entry_ids = list(entry_ids)
+        entries = []
+        for start in range(0, len(entry_ids), ID_CHUNK_SIZE):
+            chunk = entry_ids[start:start + ID_CHUNK_SIZE]
+            entries.extend(self._entries_where(f"id IN ({', '.join('?' * len(chunk))})", chunk))
+        return entries
+
+    def get_by_path(self, filepath):
+        with self.lock:
+            return self._to_entry(self.conn.execute(
+                f"SELECT {_ENTRY_COLUMNS} FROM entries WHERE path = ?", (filepath,)
+            ).fetchone())
+
+    def entries_in_range(self, date_from=None, date_to=None, limit=-1, newest_first=False):
+        """Entries dated within [date_from, date_to], in date order."""
+        order = "DESC" if newest_first else "ASC"
+        return self._entries_where(
+            f"date >= ? AND date <= ? ORDER BY date {order}, counter {order} LIMIT ?",
+            (date_from or "0000-00-00", date_to or "9999-99-99", limit)
+        )
+
+    def all_entries(self):
+        """Every entry, undated ones first, then in date order."""
+        return self._entries_where("1 ORDER BY date, counter")
+
+    def iter_entries(self, page_size=500):
+        """Every entry in all_entries() order, read from the index a page at a time.
+
+        The lock is only held while a page is read, so a long export neither
+        holds the whole journal in memory nor blocks saves meanwhile.
+        """
+        last = (-1, 0)
+        while True:
+            page = self._entries_where(
+                "date IS NULL AND (counter, id) > (?, ?) ORDER BY counter, id LIMIT ?", (*last, page_size)
+            )
+            yield from page
+            if len(page) < page_size:
+                break
+            last = (page[-1].counter, page[-1].id)
+
+        last = ("", -1, 0)
+        while True:
+            page = self._entries_where(
+                "date IS NOT NULL AND (date, counter, id) > (?, ?, ?) ORDER BY date, counter, id LIMIT ?",
+                (*last, page_size)
+            )
+            yield from page
+            if len(page) < page_size:
+                break
+            last = (page[-1].date, page[-1].counter, page[-1].id)
+
+    def next_counter(self, folder_path, date_str):
+        """One past the highest counter indexed for date_str in folder_path."""
+        with self.lock:
+            highest = self.conn.execute(
+                "SELECT MAX(counter) FROM entries WHERE folder = ? AND date = ?",
+                (folder_path, date_str)
+            ).fetchone()[0]
+        return 0 if highest is None else highest + 1
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class JournalWatcher(threading.Thread):
+    """Background thread that keeps the index in step with the journal folders.
+
+    The standard library has no portable change-notification API (and Drive's
+    virtual filesystem does not reliably emit native events), so this polls
+    the folder mtimes, which costs one stat per folder while nothing changes,
+    and pushes any IndexChanges to on_change from this thread.
+    """
+
+    def __init__(self, index, folder_paths, interval=5.0, on_change=None):
+        """folder_paths is a list, or a callable returning the folders to check."""
+        super().__init__(name="JournalWatcher", daemon=True)
+        self.index = index
+        self.folder_paths = folder_paths
+        self.interval = interval
+        self.on_change = on_change
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                folder_paths = self.folder_paths
+                if callable(folder_paths):
+                    folder_paths = folder_paths()
+                changes = self.index.refresh(folder_paths)
+            except Exception as e:
+                print(f"Journal watcher refresh failed: {str(e)}", file=sys.stderr)
+                continue
+            if self.on_change and (changes.added or changes.changed or changes.removed):
+                self.on_change(changes)
+
+    def stop(self):
+        self._stopped.set()
+
+
+def open_journal_index(folder_paths, loader=None, prepare=None):
+    """Open the index in the first existing journal folder and refresh it.
+
+    The first open indexes every entry; later opens only pick up what changed.
+    prepare(index), if given, is called before that first refresh, e.g. to
+    attach the packed archive. Returns None when none of the folders are
+    reachable.
+    """
+    for folder_path in folder_paths:
+        if os.path.isdir(folder_path):
+            index_path = os.path.join(folder_path, INDEX_FILENAME)
+            try:
+                return _open_and_refresh(index_path, folder_paths, loader, prepare)
+            except sqlite3.OperationalError:
+                raise  # locked or busy, not damaged
+            except sqlite3.DatabaseError as e:
+                # The index is only a cache of the markdown files
+                print(f"Rebuilding unreadable entry index {index_path}: {str(e)}", file=sys.stderr)
+                discard_index(index_path)
+                return _open_and_refresh(index_path, folder_paths, loader, prepare)
+    return None
+
+
+def _open_and_refresh(index_path, folder_paths, loader, prepare):
+    index = JournalIndex(index_path, loader)
+    try:
+        if prepare is not None:
+            prepare(index)
+        index.refresh(folder_paths)
+    except BaseException:
+        index.close()
+        raise
+    return index
+
+
+def discard_index(index_path):
+    """Delete an index database and its rollback journal, which must not outlive it."""
+    for path in (index_path, index_path + "-journal"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,92 @@
+"""Shared loader for entry files with a bounded LRU cache of parsed results.
+
+Parsed entries are cached by path and validated against the file's
+(mtime, size). When the caller already knows that signature - e.g. from the
+entry index - a cache hit does not touch the disk at all.
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from journal_entries import (
+    parse_entry_filename, parse_entry_header, parse_entry_items, parse_entry_tags
+)
+from journal_trace import span
+
+ParsedEntry = namedtuple(
+    'ParsedEntry', ['path', 'date', 'counter', 'header', 'header_type', 'items', 'tags']
+)
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'entries', 'bytes'])
+
+
+def parse_entry(filepath, content):
+    date_str, counter = parse_entry_filename(os.path.basename(filepath))
+    header, header_type = parse_entry_header(content)
+    return ParsedEntry(
+        filepath, date_str, counter, header, header_type,
+        parse_entry_items(content), parse_entry_tags(content)
+    )
+
+
+class EntryLoader:
+    def __init__(self, max_entries=256, max_bytes=4 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()  # path -> (mtime, size, ParsedEntry)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def load(self, filepath, signature=None):
+        """Return the ParsedEntry for filepath, reading it only on a cache miss.
+
+        signature is the file's (mtime, size) if already known; otherwise the
+        file is stat'ed to validate the cached copy.
+        """
+        if signature is None:
+            stat = os.stat(filepath)
+            signature = (stat.st_mtime, stat.st_size)
+
+        with self._lock:
+            cached = self._cache.get(filepath)
+            if cached is not None and cached[:2] == signature:
+                self._cache.move_to_end(filepath)
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+
+        with span("EntryLoader.read"):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+        with span("EntryLoader.parse"):
+            parsed = parse_entry(filepath, content)
+        self.store(filepath, signature, parsed)
+        return parsed
+
+    def store(self, filepath, signature, parsed):
+        with self._lock:
+            previous = self._cache.pop(filepath, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._cache[filepath] = (signature[0], signature[1], parsed)
+            self._bytes += signature[1]
+            self._evict()
+
+    def invalidate(self, filepath):
+        with self._lock:
+            previous = self._cache.pop(filepath, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+    def _evict(self):
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, size, _) = self._cache.popitem(last=False)
+            self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self.hits, self.misses, len(self._cache), self._bytes)
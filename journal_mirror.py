@@ -0,0 +1,260 @@
+"""Keep entry files mirrored across several journal roots (drives).
+
+Each root has a manifest, .gratitude_manifest.jsonl, recording each entry
+file's name, size and mtime and a key made of the entry's date and a hash of
+its bytes. The manifest is append-only, one JSON line per change with the
+last line for a name winning, and is compacted when mostly superseded.
+
+After a save or import, replicate() copies just the new files to every
+other reachable root whose manifest does not already have their key. When a
+root is reachable again after being offline, reconcile() first brings every
+manifest up to date from the entry index, which only lists folders whose
+mtime changed; only files whose size or mtime differ from the manifest are
+hashed. It then copies to each root the keys the other roots have and it
+lacks. Nothing is listed or copied wholesale.
+
+A copy keeps its name unless another file already holds that name on the
+target, in which case the next free counter is used. Deleting an entry from
+one root only does not propagate; it is copied back from the others.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import defaultdict, namedtuple
+
+from journal_entries import parse_entry_filename
+from journal_trace import traced
+from journal_writer import EntryWriter, FilenameAllocator
+
+MANIFEST_FILENAME = ".gratitude_manifest.jsonl"
+
+# Superseded lines tolerated before a manifest is rewritten
+COMPACT_SLACK = 1000
+
+ManifestRecord = namedtuple('ManifestRecord', ['key', 'size', 'mtime'])
+
+
+def file_key(filename, data):
+    """Mirror key of an entry file: its date plus a hash of its bytes."""
+    date_str, _ = parse_entry_filename(os.path.basename(filename))
+    return f"{date_str or ''}:{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+
+
+class RootManifest:
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.path = os.path.join(root_path, MANIFEST_FILENAME)
+        self.files = {}  # name -> ManifestRecord
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        try:
+            f = open(self.path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a torn trailing write
+                self._lines += 1
+                if record.get('removed'):
+                    self.files.pop(record['name'], None)
+                else:
+                    self.files[record['name']] = ManifestRecord(record['key'], record['size'], record['mtime'])
+
+    def keys(self):
+        """{key: name} for every file in the root."""
+        return {record.key: name for name, record in self.files.items()}
+
+    def update(self, recorded=(), removed=()):
+        """Record (name, ManifestRecord) pairs and forget removed names."""
+        lines = [
+            json.dumps({'name': name, 'key': record.key, 'size': record.size, 'mtime': record.mtime},
+                       ensure_ascii=False)
+            for name, record in recorded
+        ]
+        lines.extend(json.dumps({'name': name, 'removed': True}, ensure_ascii=False) for name in removed)
+        if not lines:
+            return
+        for name, record in recorded:
+            self.files[name] = record
+        for name in removed:
+            self.files.pop(name, None)
+
+        self._lines += len(lines)
+        if self._lines > 2 * len(self.files) + COMPACT_SLACK:
+            self.compact()
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def compact(self):
+        """Rewrite the manifest with one line per file."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for name, record in self.files.items():
+                f.write(json.dumps(
+                    {'name': name, 'key': record.key, 'size': record.size, 'mtime': record.mtime},
+                    ensure_ascii=False
+                ) + "\n")
+        os.replace(temp_path, self.path)
+        self._lines = len(self.files)
+
+
+class JournalMirror:
+    """Mirror entry files across the roots of a FolderResolver.
+
+    The roots must also be journal folders, so that the entry index covers
+    them. replicate() and reconcile() return the paths of the copies they
+    made, for the caller to add to the index.
+
+    journal_index may be None while the index is not open yet (set it once
+    it is): replicate() then still copies, numbering from a folder listing,
+    but leaves catching up to the first reconcile after it is set.
+    """
+
+    def __init__(self, folders, journal_index=None):
+        self.folders = folders
+        self.index = journal_index
+        self._manifests = {}
+        self._online = set()
+        self._lock = threading.Lock()
+
+    def _manifest(self, root):
+        manifest = self._manifests.get(root)
+        if manifest is None:
+            manifest = self._manifests[root] = RootManifest(root)
+        return manifest
+
+    def _read(self, filepath):
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        stat = os.stat(filepath)
+        return data, ManifestRecord(file_key(filepath, data), stat.st_size, stat.st_mtime)
+
+    def _catch_up(self, root):
+        """Bring root's manifest in line with what the index knows is in it."""
+        manifest = self._manifest(root)
+        with self.index.lock:
+            indexed = {
+                os.path.basename(path): (size, mtime)
+                for path, size, mtime in self.index.conn.execute(
+                    "SELECT path, size, mtime FROM entries WHERE folder = ?", (root,)
+                )
+            }
+        recorded = []
+        for name, (size, mtime) in indexed.items():
+            record = manifest.files.get(name)
+            if record is not None and (record.size, record.mtime) == (size, mtime):
+                continue
+            try:
+                recorded.append((name, self._read(os.path.join(root, name))[1]))
+            except OSError as e:
+                print(f"Could not hash {os.path.join(root, name)}: {str(e)}", file=sys.stderr)
+        removed = [name for name in manifest.files if name not in indexed]
+        manifest.update(recorded, removed)
+
+    def _copy(self, sources, root):
+        """Copy source files into root; returns the new paths."""
+        if not sources:
+            return []
+        def lookup(date_str):
+            if self.index is None:
+                return None
+            return self.index.next_counter(root, date_str)
+
+        allocator = FilenameAllocator(root, lookup)
+        writer = EntryWriter(root, allocator, fsync_every=len(sources))
+        recorded, written = [], []
+        for source in sources:
+            name = os.path.basename(source)
+            target = os.path.join(root, name)
+            date_str, _ = parse_entry_filename(name)
+            try:
+                with open(source, 'rb') as f:
+                    data = f.read()
+                if date_str is None and os.path.exists(target):
+                    print(f"Not copying {source}: {target} exists and undated entries cannot be renumbered",
+                          file=sys.stderr)
+                    continue
+                target = writer.write(date_str, data, target)
+                stat = os.stat(target)
+            except OSError as e:
+                print(f"Could not copy {source} to {root}: {str(e)}", file=sys.stderr)
+                continue
+            recorded.append((os.path.basename(target), ManifestRecord(file_key(name, data), stat.st_size, stat.st_mtime)))
+            written.append(target)
+        writer.flush()
+        self._manifest(root).update(recorded)
+        return written
+
+    @traced()
+    def replicate(self, filepaths):
+        """Copy newly written entry files to the other reachable roots."""
+        copied = self.sync() if self.index is not None else []
+        with self._lock:
+            roots = self.folders.reachable()
+            by_root = defaultdict(list)
+            for filepath in filepaths:
+                by_root[os.path.dirname(filepath)].append(filepath)
+
+            sources = []
+            for root, paths in by_root.items():
+                if root not in roots:
+                    continue  # written outside the mirrored roots
+                recorded = []
+                for path in paths:
+                    try:
+                        record = self._read(path)[1]
+                    except OSError as e:
+                        print(f"Could not hash {path}: {str(e)}", file=sys.stderr)
+                        continue
+                    recorded.append((os.path.basename(path), record))
+                    sources.append((record.key, path))
+                self._manifest(root).update(recorded)
+
+            for root in roots:
+                have = self._manifest(root).keys()
+                copied.extend(self._copy(
+                    [path for key, path in sources if key not in have and os.path.dirname(path) != root], root
+                ))
+        return copied
+
+    def sync(self):
+        """Reconcile if a root has come online since the last look."""
+        roots = set(self.folders.reachable())
+        with self._lock:
+            returned = roots - self._online
+            self._online = roots
+        if returned and len(roots) > 1:
+            return self.reconcile()
+        return []
+
+    @traced()
+    def reconcile(self):
+        """Copy to every reachable root the entries the others have and it lacks."""
+        with self._lock:
+            roots = self.folders.reachable()
+            self._online = set(roots)
+            if len(roots) < 2:
+                return []
+            self.index.refresh(roots)
+            for root in roots:
+                self._catch_up(root)
+
+            # Where each key can be copied from; the earlier root wins
+            wanted = {}
+            for root in roots:
+                for key, name in self._manifest(root).keys().items():
+                    wanted.setdefault(key, os.path.join(root, name))
+
+            copied = []
+            for root in roots:
+                have = self._manifest(root).keys()
+                copied.extend(self._copy([source for key, source in wanted.items() if key not in have], root))
+        return copied
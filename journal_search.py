@@ -0,0 +1,154 @@
+"""Full-text search over journal entries.
+
+Each entry's items are kept in an SQLite FTS5 table in the entry index's
+database, next to the journal, and updated from the index's change
+notifications so saves and imports are searchable at once. Queries support
+ranked keywords, "quoted phrases" and date ranges, e.g.
+
+    family "long walk" from:2024-01-01 to:2024-12-31
+
+Matching, BM25 ranking, the date range and the result limit are all done
+by SQLite, so only the top results are read into Python. A phrase must lie
+within one item; the few matches that run across two items are dropped
+afterwards.
+"""
+import re
+from collections import namedtuple
+
+TOKEN_PATTERN = re.compile(r"[\w']+")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+SearchResult = namedtuple('SearchResult', ['entry', 'score', 'matched_items'])
+
+# Tokens are runs of letters, digits, apostrophes and underscores, as in
+# TOKEN_PATTERN; search_entries records what search_text was built from
+_SCHEMA = """
+DROP TABLE IF EXISTS search_postings;
+DROP TABLE IF EXISTS search_docs;
+CREATE VIRTUAL TABLE IF NOT EXISTS search_text USING fts5(
+    items,
+    tokenize = "unicode61 remove_diacritics 0 tokenchars '''_'"
+);
+CREATE TABLE IF NOT EXISTS search_entries (
+    entry_id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+"""
+
+# Items are stored one per line; phrases are checked per item afterwards
+_ITEM_SEPARATOR = "\n"
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+def parse_query(query):
+    """Split a query string into (keywords, phrases, date_from, date_to)."""
+    keywords, phrases = [], []
+    date_from = date_to = None
+    for phrase, word in QUERY_PATTERN.findall(query):
+        if phrase:
+            tokens = tokenize(phrase)
+            if len(tokens) == 1:
+                keywords.extend(tokens)
+            elif tokens:
+                phrases.append(tokens)
+        elif word.lower().startswith('from:'):
+            date_from = word[5:] or None
+        elif word.lower().startswith('to:'):
+            date_to = word[3:] or None
+        else:
+            keywords.extend(tokenize(word))
+    return keywords, phrases, date_from, date_to
+
+
+def match_expression(keywords, phrases):
+    """An FTS5 query requiring every keyword and phrase."""
+    terms = [f'"{keyword}"' for keyword in keywords]
+    terms.extend('"' + " ".join(phrase) + '"' for phrase in phrases)
+    return " AND ".join(terms)
+
+
+def _contains(words, phrase):
+    width = len(phrase)
+    return any(words[i:i + width] == phrase for i in range(len(words) - width + 1))
+
+
+class SearchIndex:
+    def __init__(self, journal_index):
+        self.index = journal_index
+        self.conn = journal_index.conn
+        with self.index.lock:
+            self.conn.executescript(_SCHEMA)
+        journal_index.follow('search_entries', self._remove, self._add)
+
+    def _remove(self, entry_ids):
+        params = [(entry_id,) for entry_id in entry_ids]
+        self.conn.executemany("DELETE FROM search_text WHERE rowid = ?", params)
+        self.conn.executemany("DELETE FROM search_entries WHERE entry_id = ?", params)
+
+    def _add(self, entries):
+        self.conn.executemany(
+            "INSERT INTO search_text (rowid, items) VALUES (?, ?)",
+            [(entry.id, _ITEM_SEPARATOR.join(entry.items)) for entry in entries]
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO search_entries (entry_id, size, mtime) VALUES (?, ?, ?)",
+            [(entry.id, entry.size, entry.mtime) for entry in entries]
+        )
+
+    def search(self, query, date_from=None, date_to=None, limit=50):
+        """Return SearchResults for entries matching every keyword and phrase.
+
+        Results are ranked by BM25; a query with only a date range lists the
+        entries in that range, newest first.
+        """
+        keywords, phrases, query_from, query_to = parse_query(query)
+        date_from = date_from or query_from
+        date_to = date_to or query_to
+        if not (keywords or phrases):
+            return self._date_range(date_from, date_to, limit)
+
+        conditions, params = ["search_text MATCH ?"], [match_expression(keywords, phrases)]
+        if date_from:
+            conditions.append("e.date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("e.date <= ?")
+            params.append(date_to)
+        sql = (
+            "SELECT e.id, -bm25(search_text) FROM search_text JOIN entries e ON e.id = search_text.rowid "
+            f"WHERE {' AND '.join(conditions)} ORDER BY bm25(search_text) LIMIT ? OFFSET ?"
+        )
+
+        tokens = set(keywords).union(*phrases)
+        results = []
+        offset = 0
+        with self.index.lock:
+            # Rarely, a phrase only matched across two items; read on past those
+            while len(results) < limit:
+                rows = self.conn.execute(sql, params + [limit, offset]).fetchall()
+                entries = {entry.id: entry for entry in self.index.get_many([entry_id for entry_id, _ in rows])}
+                for entry_id, score in rows:
+                    entry = entries.get(entry_id)
+                    if entry is None:
+                        continue
+                    items = [tokenize(item) for item in entry.items]
+                    if not all(any(_contains(words, phrase) for words in items) for phrase in phrases):
+                        continue
+                    matched = [number for number, words in enumerate(items) if tokens.intersection(words)]
+                    results.append(SearchResult(entry, score, matched))
+                    if len(results) >= limit:
+                        break
+                if len(rows) < limit:
+                    break
+                offset += limit
+        return results
+
+    def _date_range(self, date_from, date_to, limit):
+        if not (date_from or date_to):
+            return []
+        entries = self.index.entries_in_range(date_from, date_to, limit, newest_first=True)
+        return [SearchResult(entry, 0.0, []) for entry in entries]
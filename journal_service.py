@@ -0,0 +1,306 @@
+"""Optional resident journal service and the thin client that talks to it.
+
+"journal serve" keeps one Journal open: the entry index (kept current by its
+watcher), the parsed-entry cache, the shuffle deck, the search and month-day
+indexes and the resolved drives all stay in memory. Commands such as
+"journal random", and the window's random-entry viewer, save and search,
+then connect to it and get an answer without starting cold or rescanning
+the journal; when no service is running they simply do the work themselves.
+
+The service listens on localhost TCP (any OS) or on a Unix domain socket,
+and speaks one JSON object per line each way:
+
+    {"token": ..., "op": "random", "mode": "shuffle"}
+    {"ok": true, "result": {"date": ..., "path": ..., "items": [...]}}
+
+Where it listens, and a random token every request must carry, are written
+to a service file readable only by the user (~/.gratitude_service.json, or
+GRATITUDE_SERVICE_FILE, e.g. a temp directory for tests), which is removed
+when the service stops.
+"""
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+from collections import namedtuple
+from datetime import date
+
+SERVICE_FILE_ENV_VAR = "GRATITUDE_SERVICE_FILE"
+SERVICE_FILENAME = ".gratitude_service.json"
+DEFAULT_PORT = 47321
+
+# Longest request line accepted, in bytes
+MAX_REQUEST_BYTES = 1024 * 1024
+
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 60.0
+
+# The parts of an entry the service sends back
+RemoteEntry = namedtuple('RemoteEntry', ['path', 'date', 'items'])
+RemoteSearchResult = namedtuple('RemoteSearchResult', ['entry', 'score', 'matched_items'])
+
+
+class ServiceError(OSError):
+    """The service answered a request with an error."""
+
+
+def service_file_path():
+    return os.environ.get(SERVICE_FILE_ENV_VAR) or os.path.join(os.path.expanduser("~"), SERVICE_FILENAME)
+
+
+def _entry_record(entry):
+    return {'date': entry.date, 'path': entry.path, 'items': entry.items}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        service = self.server.service
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                self._reply({'ok': False, 'error': "Request too large"})
+                return
+            try:
+                request = json.loads(line)
+                if not secrets.compare_digest(str(request.get('token', '')), service.token):
+                    self._reply({'ok': False, 'error': "Bad token"})
+                    return
+                reply = {'ok': True, 'result': service.dispatch(request)}
+            except Exception as e:
+                reply = {'ok': False, 'error': f"{type(e).__name__}: {str(e)}"}
+            self._reply(reply)
+
+    def _reply(self, reply):
+        self.wfile.write(json.dumps(reply, ensure_ascii=False).encode('utf-8') + b"\n")
+        self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class JournalService:
+    """Serve random, save, search, on-this-day and stats requests from one warm Journal.
+
+    The window's random-entry viewer peeks ahead with 'peek' and reports what
+    it showed with 'shown', so it shares one deck with the command line.
+    """
+
+    def __init__(self, journal, port=DEFAULT_PORT, socket_path=None, service_file=None):
+        self.journal = journal
+        self.token = secrets.token_hex(16)
+        self.service_file = service_file or service_file_path()
+        if socket_path:
+            if _UnixServer is None:
+                raise OSError("Unix domain sockets are not available here; use a port instead")
+            if os.path.exists(socket_path):
+                os.remove(socket_path)  # left behind by a service that did not stop cleanly
+            self.server = _UnixServer(socket_path, _RequestHandler)
+            self.address = {'family': 'unix', 'path': socket_path}
+        else:
+            self.server = _TCPServer(('127.0.0.1', port), _RequestHandler)
+            self.address = {'family': 'tcp', 'host': '127.0.0.1', 'port': self.server.server_address[1]}
+        self.server.service = self
+
+    def warm_up(self):
+        """Open the index, deck, search and month-day indexes now rather than on the first request."""
+        self.journal.warm_up()
+
+    def _write_service_file(self):
+        record = dict(self.address, token=self.token, pid=os.getpid())
+        temp_path = f"{self.service_file}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        os.replace(temp_path, self.service_file)
+
+    def serve_forever(self):
+        self._write_service_file()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            try:
+                os.remove(self.service_file)
+            except OSError:
+                pass
+            if self.address['family'] == 'unix':
+                try:
+                    os.remove(self.address['path'])
+                except OSError:
+                    pass
+
+    def shutdown(self):
+        # serve_forever() must be stopped from another thread
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def dispatch(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return {'pid': os.getpid()}
+        if op == 'random':
+            entry = self.journal.load_random_entry(request.get('mode'))
+            return None if entry is None else _entry_record(entry)
+        if op == 'peek':
+            entry = self.journal.peek_random_entry(request.get('mode'))
+            return None if entry is None else _entry_record(entry)
+        if op == 'shown':
+            self.journal.mark_entry_shown(str(request['path']), request.get('mode'))
+            return {}
+        if op == 'save':
+            items = [str(item) for item in request.get('items') or []]
+            if not items:
+                raise ValueError("Nothing to save")
+            filename, folder_path = self.journal.write_entry(items, request.get('date'))
+            return {'file': filename, 'folder': folder_path}
+        if op == 'search':
+            results = self.journal.search(request.get('query', ''), limit=int(request.get('limit', 50)))
+            if results is None:
+                return None
+            return [
+                dict(_entry_record(result.entry), score=result.score, matched_items=result.matched_items)
+                for result in results
+            ]
+        if op == 'on_this_day':
+            day = date.fromisoformat(request['date']) if request.get('date') else None
+            years = request.get('years')
+            if years is None:
+                entries = self.journal.on_this_day(day)
+                return None if entries is None else [_entry_record(entry) for entry in entries]
+            week = self.journal.week_years_ago(int(years), day)
+            if week is None:
+                return None
+            return {'first': week[0].isoformat(), 'last': week[1].isoformat(),
+                    'entries': [_entry_record(entry) for entry in week[2]]}
+        if op == 'stats':
+            summary = self.journal.stats_summary()
+            return None if summary is None else summary._asdict()
+        if op == 'shutdown':
+            self.shutdown()
+            return {}
+        raise ValueError(f"Unknown operation {op!r}")
+
+
+class ServiceClient:
+    """Connection to a running JournalService; see connect()."""
+
+    def __init__(self, record, timeout=REQUEST_TIMEOUT):
+        if record['family'] == 'unix':
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = record['path']
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (record['host'], record['port'])
+        try:
+            self.sock.settimeout(CONNECT_TIMEOUT)
+            self.sock.connect(address)
+            self.sock.settimeout(timeout)
+        except OSError:
+            self.sock.close()
+            raise
+        self.token = record['token']
+        self.reader = self.sock.makefile('rb')
+        # The window sends requests from several background threads
+        self.lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, service_file=None, timeout=REQUEST_TIMEOUT):
+        """A client for the running service, or None if there is none."""
+        try:
+            with open(service_file or service_file_path(), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            return cls(record, timeout)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def request(self, op, **params):
+        """Send one request and return its result.
+
+        Raises ServiceError if the service reports a failure, and
+        ConnectionError if it cannot be reached or does not answer within the
+        timeout; the client is then closed, since a late reply would be read
+        as the answer to the next request.
+        """
+        params.update(op=op, token=self.token)
+        with self.lock:
+            try:
+                self.sock.sendall(json.dumps(params, ensure_ascii=False).encode('utf-8') + b"\n")
+                line = self.reader.readline()
+            except OSError as e:
+                self.close()
+                raise ConnectionError(f"The journal service did not answer: {str(e)}") from e
+            if not line:
+                self.close()
+                raise ConnectionError("The journal service closed the connection")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise ServiceError(reply.get('error') or "Request failed")
+        return reply.get('result')
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class RemoteJournal:
+    """The subset of Journal that the command line and the window use, answered by the service."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def load_random_entry(self, mode=None):
+        record = self.client.request('random', mode=mode)
+        return None if record is None else RemoteEntry(record['path'], record['date'], record['items'])
+
+    def peek_random_entry(self, mode=None):
+        record = self.client.request('peek', mode=mode)
+        return None if record is None else RemoteEntry(record['path'], record['date'], record['items'])
+
+    def mark_entry_shown(self, filepath, mode=None):
+        self.client.request('shown', path=filepath, mode=mode)
+
+    def write_entry(self, gratitude_entries, date_str=None):
+        saved = self.client.request('save', items=list(gratitude_entries), date=date_str)
+        return saved['file'], saved['folder']
+
+    def search(self, query, limit=50):
+        records = self.client.request('search', query=query, limit=limit)
+        if records is None:
+            return None
+        return [
+            RemoteSearchResult(
+                RemoteEntry(record['path'], record['date'], record['items']),
+                record['score'], record['matched_items']
+            )
+            for record in records
+        ]
+
+    def on_this_day(self, day=None):
+        records = self.client.request('on_this_day', date=day and day.isoformat())
+        if records is None:
+            return None
+        return [RemoteEntry(record['path'], record['date'], record['items']) for record in records]
+
+    def week_years_ago(self, years=1, day=None):
+        week = self.client.request('on_this_day', date=day and day.isoformat(), years=years)
+        if week is None:
+            return None
+        return (
+            date.fromisoformat(week['first']), date.fromisoformat(week['last']),
+            [RemoteEntry(record['path'], record['date'], record['items']) for record in week['entries']]
+        )
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,290 @@
+"""Journal statistics kept as running aggregates in the entry index database.
+
+Each entry's day, item count and items are recorded once, so when the index
+reports an entry added, changed or removed the daily and per-month term totals
+are adjusted by exactly that entry's delta instead of re-reading the journal.
+A full rebuild fills the per-entry and per-day tables with single SQL
+statements and counts terms a month at a time over the joined item text, so
+the per-token work runs inside str.split, re.findall and Counter.
+
+"People" are a heuristic: capitalised words that follow another word (so do
+not start a sentence or item) and are not common words, months or weekdays.
+"""
+import json
+import re
+import string
+from collections import Counter, defaultdict, namedtuple
+from datetime import date, timedelta
+
+from journal_index import ID_CHUNK_SIZE
+
+KIND_WORD = "word"
+KIND_PERSON = "person"
+
+# Stripped from the ends of whitespace-separated words
+WORD_PUNCTUATION = string.punctuation + "\u2018\u2019\u201c\u201d\u2026\u2013\u2014"
+NAME_PATTERN = re.compile(r"(?<=[\w,'\)] )([A-Z][a-z]+)\b")
+
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be because been before
+being but by can could did do does doing don't for from get got had has have
+having he her here him his how i i'm i've if in into is it it's its just
+like me more most my myself no not now of on one only or other our out over
+really so some such than that that's the their them then there these they
+this those through to today too up us very was way we were what when where
+which while who will with would you your grateful gratitude thankful thank
+thanks things thing day
+""".split())
+
+NOT_PEOPLE = frozenset(word.capitalize() for word in STOPWORDS | frozenset("""
+monday tuesday wednesday thursday friday saturday sunday january february
+march april may june july august september october november december god
+christmas easter
+""".split()))
+
+StatsSummary = namedtuple('StatsSummary', [
+    'entries', 'items', 'average_items', 'first_date', 'last_date',
+    'current_streak', 'longest_streak', 'longest_streak_end',
+    'entries_per_week', 'entries_per_month', 'top_words', 'top_people'
+])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_entries (
+    entry_id INTEGER PRIMARY KEY,
+    date TEXT,
+    items INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    item_text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats_days (
+    date TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL,
+    items INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats_terms (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    month TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, term, month)
+);
+CREATE TABLE IF NOT EXISTS stats_term_totals (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, term)
+);
+CREATE INDEX IF NOT EXISTS stats_term_totals_by_count ON stats_term_totals(kind, count);
+"""
+
+
+def count_terms(items):
+    """Return {"word": Counter, "person": Counter} over a list of item strings."""
+    text = "\n".join(items)
+    # Count raw words first; only the distinct ones are then cleaned up in Python
+    words = Counter()
+    for word, count in Counter(text.lower().split()).items():
+        word = word.strip(WORD_PUNCTUATION)
+        if len(word) > 2 and word[0].isalpha() and word not in STOPWORDS:
+            words[word] += count
+    people = Counter(NAME_PATTERN.findall(text))
+    for common in NOT_PEOPLE.intersection(people):
+        del people[common]
+    return {KIND_WORD: words, KIND_PERSON: people}
+
+
+def streaks(dates, today=None):
+    """Return (current, longest, longest_end) for sorted 'YYYY-MM-DD' dates.
+
+    The current streak still counts if the last entry was yesterday, since
+    today's entry may not have been written yet.
+    """
+    today = today or date.today()
+    current = longest = run = 0
+    longest_end = None
+    previous = None
+    for date_str in dates:
+        try:
+            day = date.fromisoformat(date_str)
+        except ValueError:
+            continue
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        if run > longest:
+            longest, longest_end = run, date_str
+        previous = day
+    if previous is not None and today - previous <= timedelta(days=1):
+        current = run
+    return current, longest, longest_end
+
+
+class JournalStats:
+    def __init__(self, journal_index):
+        self.index = journal_index
+        self.conn = journal_index.conn
+        self._summary = None
+        with self.index.lock:
+            self.conn.executescript(_SCHEMA)
+        with self.index.lock:
+            # A first run builds everything in one pass rather than entry by entry
+            if (not self.conn.execute("SELECT 1 FROM stats_entries LIMIT 1").fetchone()
+                    and self.conn.execute("SELECT 1 FROM entries LIMIT 1").fetchone()):
+                self.rebuild()
+        journal_index.follow('stats_entries', self._remove, self._add)
+
+    def rebuild(self):
+        """Recompute every aggregate from the entry index (not the markdown files)."""
+        with self.index.lock:
+            with self.conn:
+                for table in ('stats_entries', 'stats_days', 'stats_terms', 'stats_term_totals'):
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute(
+                    "INSERT INTO stats_entries (entry_id, date, items, size, mtime, item_text) "
+                    "SELECT id, date, json_array_length(items), size, mtime, items FROM entries"
+                )
+                self.conn.execute(
+                    "INSERT INTO stats_days (date, entries, items) "
+                    "SELECT date, COUNT(*), SUM(items) FROM stats_entries "
+                    "WHERE date IS NOT NULL GROUP BY date"
+                )
+
+                # Entries come back in date order, so each month is counted in one go
+                terms = Counter()
+                month, month_items = None, []
+                for entry_date, item_text in self.conn.execute(
+                    "SELECT date, item_text FROM stats_entries ORDER BY date"
+                ):
+                    entry_month = entry_date[:7] if entry_date else ""
+                    if entry_month != month:
+                        self._count_month(month, month_items, terms)
+                        month, month_items = entry_month, []
+                    month_items.extend(json.loads(item_text))
+                self._count_month(month, month_items, terms)
+                self._apply_terms(terms)
+            self._summary = None
+
+    @staticmethod
+    def _count_month(month, items, terms, sign=1):
+        if month is None or not items:
+            return
+        for kind, counts in count_terms(items).items():
+            for term, count in counts.items():
+                terms[(kind, term, month)] += sign * count
+
+    def _add(self, entries):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO stats_entries (entry_id, date, items, size, mtime, item_text) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(entry.id, entry.date, len(entry.items), entry.size, entry.mtime,
+              json.dumps(entry.items)) for entry in entries]
+        )
+        self._apply_deltas([(entry.date, entry.items) for entry in entries], 1)
+
+    def _remove(self, entry_ids):
+        entry_ids = list(entry_ids)
+        removed = []
+        for start in range(0, len(entry_ids), ID_CHUNK_SIZE):
+            chunk = entry_ids[start:start + ID_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            removed.extend(
+                (entry_date, json.loads(item_text)) for entry_date, item_text in self.conn.execute(
+                    f"SELECT date, item_text FROM stats_entries WHERE entry_id IN ({placeholders})",
+                    chunk
+                )
+            )
+            self.conn.execute(f"DELETE FROM stats_entries WHERE entry_id IN ({placeholders})", chunk)
+        self._apply_deltas(removed, -1)
+
+    def _apply_deltas(self, dated_items, sign):
+        """Add (sign=1) or subtract (sign=-1) the given entries' contributions."""
+        if not dated_items:
+            return
+        self._summary = None
+        days = defaultdict(lambda: [0, 0])
+        by_month = defaultdict(list)
+        for entry_date, items in dated_items:
+            if entry_date:
+                days[entry_date][0] += sign
+                days[entry_date][1] += sign * len(items)
+            by_month[entry_date[:7] if entry_date else ""].extend(items)
+
+        self.conn.executemany(
+            "INSERT INTO stats_days (date, entries, items) VALUES (?, ?, ?) "
+            "ON CONFLICT(date) DO UPDATE SET entries = entries + excluded.entries, "
+            "items = items + excluded.items",
+            [(day, entries, items) for day, (entries, items) in days.items()]
+        )
+        self.conn.execute("DELETE FROM stats_days WHERE entries <= 0")
+
+        terms = Counter()
+        for month, items in by_month.items():
+            self._count_month(month, items, terms, sign)
+        self._apply_terms(terms)
+
+    def _apply_terms(self, terms):
+        """Add signed per-month term counts to the running totals."""
+        if not terms:
+            return
+        self.conn.executemany(
+            "INSERT INTO stats_terms (kind, term, month, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(kind, term, month) DO UPDATE SET count = count + excluded.count",
+            [(kind, term, month, count) for (kind, term, month), count in terms.items() if count]
+        )
+        totals = Counter()
+        for (kind, term, _), count in terms.items():
+            totals[(kind, term)] += count
+        self.conn.executemany(
+            "INSERT INTO stats_term_totals (kind, term, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(kind, term) DO UPDATE SET count = count + excluded.count",
+            [(kind, term, count) for (kind, term), count in totals.items() if count]
+        )
+        self.conn.execute("DELETE FROM stats_terms WHERE count <= 0")
+        self.conn.execute("DELETE FROM stats_term_totals WHERE count <= 0")
+
+    def top_terms(self, kind=KIND_WORD, limit=10, month_from=None, month_to=None):
+        """[(term, count)] most frequent overall, or within a 'YYYY-MM' range."""
+        with self.index.lock:
+            if month_from is None and month_to is None:
+                return self.conn.execute(
+                    "SELECT term, count FROM stats_term_totals WHERE kind = ? "
+                    "ORDER BY count DESC, term LIMIT ?",
+                    (kind, limit)
+                ).fetchall()
+            return self.conn.execute(
+                "SELECT term, SUM(count) AS total FROM stats_terms "
+                "WHERE kind = ? AND month >= ? AND month <= ? "
+                "GROUP BY term ORDER BY total DESC, term LIMIT ?",
+                (kind, month_from or "0000-00", month_to or "9999-99", limit)
+            ).fetchall()
+
+    def summary(self, today=None, top=10):
+        """A StatsSummary from the aggregates; cached until the next index change."""
+        with self.index.lock:
+            if self._summary is not None and today is None:
+                return self._summary
+
+            entries, items, first_date, last_date = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(items), 0), MIN(date), MAX(date) FROM stats_entries"
+            ).fetchone()
+            day_rows = self.conn.execute("SELECT date, entries FROM stats_days ORDER BY date").fetchall()
+
+            per_week = Counter()
+            per_month = Counter()
+            for day, count in day_rows:
+                try:
+                    year, week, _ = date.fromisoformat(day).isocalendar()
+                except ValueError:
+                    continue
+                per_week[f"{year}-W{week:02d}"] += count
+                per_month[day[:7]] += count
+            current, longest, longest_end = streaks([day for day, _ in day_rows], today)
+
+            summary = StatsSummary(
+                entries, items, items / entries if entries else 0.0, first_date, last_date,
+                current, longest, longest_end,
+                sorted(per_week.items()), sorted(per_month.items()),
+                self.top_terms(KIND_WORD, top), self.top_terms(KIND_PERSON, top)
+            )
+            if today is None:
+                self._summary = summary
+            return summary
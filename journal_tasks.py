@@ -0,0 +1,152 @@
+"""Background executor that keeps disk I/O off the Tk main thread.
+
+Work is run on a thread pool; results are queued and handed back on the main
+thread by a root.after poll, since Tk must only be touched from the thread
+that runs mainloop. Reads can time out or be cancelled - the worker thread
+cannot be interrupted, but its result is then discarded. Writes therefore
+never time out and cannot be cancelled: a write reported as abandoned would
+still land on disk, and retrying it would write it twice.
+"""
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Task:
+    def __init__(self, description, on_success, on_error, timeout, quiet=False, cancellable=True):
+        self.description = description
+        # Quiet tasks (e.g. prefetching) do not count towards busy
+        self.quiet = quiet
+        self.cancellable = cancellable
+        self.on_success = on_success
+        self.on_error = on_error
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.finished = False
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Stop waiting for the task; long-running work may poll cancel_event.
+
+        A task that is not cancellable is only stopped if it has not started.
+        """
+        if self.cancellable:
+            self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.cancel_event.set()
+
+
+class BackgroundExecutor:
+    def __init__(self, root, max_workers=4, poll_interval=50, on_busy_changed=None):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.on_busy_changed = on_busy_changed
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="JournalIO")
+        self._results = queue.Queue()
+        self._active = []
+        self._polling = False
+        self._was_busy = (False, False)
+
+    @property
+    def busy(self):
+        return any(not task.quiet for task in self._active)
+
+    @property
+    def cancellable(self):
+        """True if some busy task could be cancelled."""
+        return any(not task.quiet and task.cancellable for task in self._active)
+
+    def _busy_changed(self):
+        state = (self.busy, self.cancellable)
+        if state != self._was_busy:
+            self._was_busy = state
+            if self.on_busy_changed is not None:
+                self.on_busy_changed(*state)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, timeout=None, description=None, quiet=False,
+               cancellable=True):
+        """Run fn(*args) in the background.
+
+        on_success(result) or on_error(exception) is then called on the Tk
+        thread; a timeout raises TimeoutError and a cancel() is silent.
+        Quiet tasks do not switch on the busy indicator. Pass
+        cancellable=False for writes; they take no timeout and cancel() only
+        stops them if they have not started yet.
+        """
+        if not cancellable and timeout is not None:
+            raise ValueError("A task that cannot be cancelled cannot time out either")
+        task = Task(description or getattr(fn, '__name__', 'task'), on_success, on_error, timeout, quiet, cancellable)
+        task.future = self._pool.submit(self._run, task, fn, args)
+        self._active.append(task)
+        self._busy_changed()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+        return task
+
+    def _run(self, task, fn, args):
+        if task.cancelled:
+            return
+        try:
+            self._results.put((task, True, fn(*args)))
+        except Exception as e:
+            self._results.put((task, False, e))
+
+    def _poll(self):
+        while True:
+            try:
+                task, succeeded, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if task.finished:
+                continue  # already timed out or cancelled
+            self._finish(task)
+            if task.cancelled:
+                continue
+            if succeeded:
+                self._call(task.on_success, value)
+            else:
+                self._call(task.on_error, value)
+
+        now = time.monotonic()
+        for task in list(self._active):
+            if task.cancelled:
+                # Running work cannot be interrupted; just stop tracking it
+                # (a write is only ever cancelled before it started)
+                self._finish(task)
+            elif task.deadline is not None and now > task.deadline:
+                task.cancel_event.set()
+                self._finish(task)
+                self._call(task.on_error, TimeoutError(
+                    f"{task.description} did not finish in time"
+                ))
+
+        if self._active:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self._polling = False
+
+    def _finish(self, task):
+        task.finished = True
+        if task in self._active:
+            self._active.remove(task)
+            self._busy_changed()
+
+    def _call(self, callback, value):
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Background task callback failed: {str(e)}", file=sys.stderr)
+
+    def shutdown(self):
+        for task in list(self._active):
+            task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,98 @@
+"""Date-ordered view of the whole journal for the timeline browser.
+
+Only the entry ids and dates are held for every entry, in an array sorted by
+(date, counter). Entries themselves are read from the index a page at a time
+when the browser scrolls to them and kept in a small LRU of pages, so a
+decade of entries costs a few hundred kilobytes until it is looked at.
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from journal_dedupe import MIRROR_COPY_IDS
+
+PAGE_SIZE = 50
+MAX_PAGES = 40
+
+
+class JournalTimeline:
+    def __init__(self, journal_index, page_size=PAGE_SIZE, max_pages=MAX_PAGES, content_hashes=None):
+        """With a ContentHashIndex, copies of an entry on other folders are left out."""
+        self.index = journal_index
+        self.content_hashes = content_hashes
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()
+        self._generation = 0
+        self.stale = False
+        self.reload()
+        journal_index.add_listener(self._on_index_changes)
+
+    def reload(self):
+        """Re-read the date order from the index and drop cached pages."""
+        condition = "1" if self.content_hashes is None else f"id NOT IN ({MIRROR_COPY_IDS})"
+        # Cleared before reading, so a change made meanwhile leaves it stale
+        self.stale = False
+        with self.index.lock:
+            rows = self.index.conn.execute(
+                f"SELECT id, date FROM entries WHERE {condition} ORDER BY date, counter"
+            ).fetchall()
+        ids = array('I', (entry_id for entry_id, _ in rows))
+        # Undated entries sort first, as in JournalIndex.all_entries()
+        dates = [entry_date or "" for _, entry_date in rows]
+        with self._lock:
+            self.ids, self.dates = ids, dates
+            self._pages.clear()
+            self._generation += 1
+
+    def _on_index_changes(self, changes):
+        # Reloaded by the browser when it next renders, not on every batch
+        self.stale = True
+
+    def __len__(self):
+        return len(self.ids)
+
+    def cached_page(self, page_number):
+        """The page's entries if already loaded, else None; never touches the index."""
+        with self._lock:
+            page = self._pages.get(page_number)
+            if page is not None:
+                self._pages.move_to_end(page_number)
+            return page
+
+    def load_page(self, page_number):
+        """Read one page of entries from the index (call off the Tk thread)."""
+        page = self.cached_page(page_number)
+        if page is not None:
+            return page
+
+        with self._lock:
+            generation = self._generation
+            page_ids = list(self.ids[page_number * self.page_size:(page_number + 1) * self.page_size])
+        by_id = {entry.id: entry for entry in self.index.get_many(page_ids)}
+        page = [by_id.get(entry_id) for entry_id in page_ids]
+        if len(by_id) < len(page_ids):
+            # Deleted since the order was read; a reload drops the gap
+            self.stale = True
+
+        with self._lock:
+            if generation != self._generation:
+                return page  # reloaded meanwhile; do not cache the old order
+            self._pages[page_number] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def entry_at(self, position):
+        """The entry at a timeline position if its page is loaded, else None."""
+        page = self.cached_page(position // self.page_size)
+        if page is None or position % self.page_size >= len(page):
+            return None
+        return page[position % self.page_size]
+
+    def position_of(self, date_str):
+        """Position of the first entry on or after date_str (any 'YYYY', 'YYYY-MM' prefix works)."""
+        with self._lock:
+            return min(bisect_left(self.dates, date_str), max(len(self.dates) - 1, 0))
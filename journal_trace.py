@@ -0,0 +1,283 @@
+"""Opt-in timing spans on the slow paths, written out as a Chrome trace.
+
+Run with --trace, or set GRATITUDE_TRACE to 1 or to a file path, and each
+traced stage (drive probing, index refreshes, entry reads and parses, saves,
+imports and the Tk windows that show them) is recorded as a span. At exit
+the spans are written in Chrome's trace event format, for chrome://tracing
+or Perfetto, and a per-stage summary of p50/p95 latency and file I/O counts
+is printed to stderr and saved next to it as .summary.json.
+
+File I/O is counted with an audit hook (files opened for reading and for
+writing, directory listings, renames and removals) and charged to the
+innermost open span on the same thread, and through it to its parents. The
+hook is only installed once tracing starts. While tracing is off, traced()
+costs one attribute check per call and span() returns a shared no-op.
+"""
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+TRACE_ENV_VAR = "GRATITUDE_TRACE"
+
+# Spans kept for the trace file; the summary still counts every one
+MAX_EVENTS = 200_000
+
+IO_KINDS = ('reads', 'writes', 'listings', 'renames', 'removes')
+READS, WRITES, LISTINGS, RENAMES, REMOVES = range(len(IO_KINDS))
+
+_AUDIT_EVENTS = {
+    'os.listdir': LISTINGS,
+    'os.scandir': LISTINGS,
+    'glob.glob': LISTINGS,
+    'os.rename': RENAMES,
+    'os.link': RENAMES,
+    'os.remove': REMOVES,
+}
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND
+
+
+def _open_kind(mode, flags):
+    if mode:
+        return WRITES if any(c in mode for c in 'wax+') else READS
+    return WRITES if (flags or 0) & _WRITE_FLAGS else READS
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(int(len(sorted_values) * p / 100.0 + 0.999999) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'stack', 'parent', 'io', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.stack = self.tracer._stack()
+        self.parent = self.stack[-1] if self.stack else None
+        self.io = [0] * len(IO_KINDS)
+        self.stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.stack.pop()
+        if self.parent is not None:
+            for kind, count in enumerate(self.io):
+                self.parent.io[kind] += count
+        self.tracer._record(self.name, self.start, end - self.start, self.args, self.io, exc_type is not None)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.events = []
+        self.dropped = 0
+        self.durations = defaultdict(list)
+        self.io_totals = defaultdict(lambda: [0] * len(IO_KINDS))
+        self._threads = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = 0.0
+        self._hooked = False
+
+    def start(self, path):
+        with self._lock:
+            if self.enabled:
+                return
+            self.path = path
+            self._origin = time.perf_counter()
+            self.enabled = True
+            if not self._hooked:
+                # Audit hooks cannot be removed; _audit checks enabled instead
+                sys.addaudithook(self._audit)
+                atexit.register(self.finish)
+                self._hooked = True
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _audit(self, event, args):
+        if not self.enabled:
+            return
+        if event == 'open':
+            kind = _open_kind(args[1], args[2])
+        else:
+            kind = _AUDIT_EVENTS.get(event)
+            if kind is None:
+                return
+        stack = getattr(self._local, 'stack', None)
+        if stack:
+            stack[-1].io[kind] += 1
+
+    def _record(self, name, start, duration, args, io, failed):
+        thread = threading.current_thread()
+        with self._lock:
+            if not self.enabled:
+                return
+            self.durations[name].append(duration)
+            totals = self.io_totals[name]
+            for kind, count in enumerate(io):
+                totals[kind] += count
+            self._threads.setdefault(thread.ident, thread.name)
+            if len(self.events) < MAX_EVENTS:
+                self.events.append((name, start, duration, thread.ident, args, tuple(io), failed))
+            else:
+                self.dropped += 1
+
+    def summary(self):
+        """Per-stage calls, p50/p95/max/total milliseconds and I/O counts, slowest first."""
+        with self._lock:
+            stages = []
+            for name, durations in self.durations.items():
+                ordered = sorted(durations)
+                stage = {
+                    'stage': name,
+                    'calls': len(ordered),
+                    'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+                    'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+                    'max_ms': round(ordered[-1] * 1000, 3),
+                    'total_ms': round(sum(ordered) * 1000, 3),
+                }
+                stage.update(zip(IO_KINDS, self.io_totals[name]))
+                stages.append(stage)
+        stages.sort(key=lambda stage: stage['total_ms'], reverse=True)
+        return stages
+
+    def _trace_events(self):
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                   'args': {'name': 'Gratitude Journal'}}]
+        for ident, thread_name in self._threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': ident,
+                           'args': {'name': thread_name}})
+        for name, start, duration, ident, args, io, failed in self.events:
+            event_args = dict(args or {})
+            event_args.update((kind, count) for kind, count in zip(IO_KINDS, io) if count)
+            if failed:
+                event_args['error'] = True
+            events.append({
+                'name': name, 'cat': 'journal', 'ph': 'X', 'pid': pid, 'tid': ident,
+                'ts': round((start - self._origin) * 1e6, 1), 'dur': round(duration * 1e6, 1),
+                'args': event_args,
+            })
+        return events
+
+    def finish(self):
+        """Stop tracing, write the trace and its summary, and print the summary."""
+        import json
+
+        if not self.enabled:
+            return
+        stages = self.summary()
+        with self._lock:
+            self.enabled = False
+            trace = {'traceEvents': self._trace_events(), 'displayTimeUnit': 'ms'}
+            dropped = self.dropped
+
+        summary_path = os.path.splitext(self.path)[0] + ".summary.json"
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump({'stages': stages, 'dropped_events': dropped}, f, indent=1)
+        except OSError as e:
+            print(f"Could not write trace {self.path}: {str(e)}", file=sys.stderr)
+            return
+
+        print(f"Trace written to {self.path}" + (f" ({dropped} spans not kept)" if dropped else ""), file=sys.stderr)
+        print(f"  {'stage':48s} {'calls':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'total ms':>10s}"
+              f" {'reads':>7s} {'writes':>7s} {'lists':>6s}", file=sys.stderr)
+        for stage in stages:
+            print(f"  {stage['stage'][:48]:48s} {stage['calls']:7d} {stage['p50_ms']:9.2f} {stage['p95_ms']:9.2f}"
+                  f" {stage['total_ms']:10.1f} {stage['reads']:7d} {stage['writes']:7d} {stage['listings']:6d}",
+                  file=sys.stderr)
+
+
+tracer = Tracer()
+
+
+def span(name, **args):
+    """Context manager timing a stage; args are shown on the span in the trace."""
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return _Span(tracer, name, args)
+
+
+def traced(name=None):
+    """Decorator timing every call of a function as stage name (default: its qualified name)."""
+    def decorate(func):
+        stage = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, stage, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def clock():
+    """A start time for complete(), or None while tracing is off."""
+    return time.perf_counter() if tracer.enabled else None
+
+
+def complete(name, started, **args):
+    """Record a stage that began at clock() time started, e.g. on another thread."""
+    if started is None or not tracer.enabled:
+        return
+    tracer._record(name, started, time.perf_counter() - started, args, [0] * len(IO_KINDS), False)
+
+
+def default_trace_path():
+    from datetime import datetime
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), f"trace-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+
+
+def start(path=None):
+    tracer.start(path or default_trace_path())
+
+
+def start_from_environment(flag=False):
+    """Start tracing if flag is set or GRATITUDE_TRACE asks; returns whether it is on.
+
+    GRATITUDE_TRACE may be a path for the trace file or just 1.
+    """
+    value = os.environ.get(TRACE_ENV_VAR, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        value = None
+        if not flag:
+            return tracer.enabled
+    elif value.lower() in ("1", "true", "yes", "on"):
+        value = None
+    start(value)
+    return True
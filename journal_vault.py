@@ -0,0 +1,244 @@
+"""Import gratitude notes from a markdown vault (Obsidian and the like).
+
+The vault is walked once for candidate notes, which are then read and parsed
+in batches on a process pool, so a vault of 100k notes is parsed on every
+core. Each note is tried against a rule set and the first rule that finds
+items wins. The default rules are:
+
+- "journal": this app's own "*Gratitude*.md" files and numbered items
+  (ITEM_PATTERN), e.g. an old copy of the journal kept in the vault;
+- "gratitude section": any note with a heading that mentions gratitude,
+  thanks or being grateful, taking the numbered, bulleted or task-list items
+  under it.
+
+A note's date comes from its filename (daily notes are named by date), or
+else from a date:/created: line in its front matter. Other rule sets can be
+passed in as VaultRule lists or loaded from JSON with load_vault_rules().
+The parsed entries are deduplicated and written exactly as a Presently
+import's are.
+"""
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from journal_entries import DATE_PATTERN, ENTRY_GLOB, ITEM_PATTERN, format_vault_entry
+from journal_import import EntryImporter, valid_date
+from journal_trace import traced
+from journal_writer import EntryWriter, FilenameAllocator
+
+# section_pattern, if set, must match a heading line; items are then only
+# looked for between it and the next heading
+VaultRule = namedtuple('VaultRule', ['name', 'filename_glob', 'item_pattern', 'section_pattern'])
+
+LIST_ITEM_PATTERN = re.compile(
+    r'^[ \t]*(?:[-*+]|\d+[.)])[ \t]+(?:\[[ xX]\][ \t]+)?(.+?)[ \t]*$', re.MULTILINE
+)
+GRATITUDE_HEADING_PATTERN = re.compile(
+    r'^#{1,6}[ \t]+.*\b(?:grateful|gratitude|thankful|thanks)\b.*$', re.MULTILINE | re.IGNORECASE
+)
+HEADING_PATTERN = re.compile(r'^#{1,6}[ \t]', re.MULTILINE)
+FRONT_MATTER_PATTERN = re.compile(r'\A---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)', re.DOTALL)
+FRONT_MATTER_DATE_PATTERN = re.compile(
+    r'^(?:date|created|day):[ \t]*["\']?(\d{4}-\d{2}-\d{2})', re.MULTILINE | re.IGNORECASE
+)
+
+DEFAULT_RULES = (
+    VaultRule("journal", ENTRY_GLOB, ITEM_PATTERN, None),
+    VaultRule("gratitude section", "*.md", LIST_ITEM_PATTERN, GRATITUDE_HEADING_PATTERN),
+)
+
+# Folders that hold app settings, version control or deleted notes, not notes
+SKIPPED_FOLDER_PREFIX = "."
+
+
+def load_vault_rules(path):
+    """Read a rule set from JSON: a list of {name, filename_glob, item_pattern, section_pattern}.
+
+    Patterns are Python regular expressions compiled with re.MULTILINE; use
+    inline flags such as (?is) for more. An item pattern with a group takes
+    the item from its first group.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        specs = json.load(f)
+    if not isinstance(specs, list) or not specs:
+        raise ValueError(f"{path} must contain a non-empty list of rules")
+    rules = []
+    for position, spec in enumerate(specs, 1):
+        try:
+            section_pattern = spec.get('section_pattern')
+            rules.append(VaultRule(
+                spec.get('name') or f"rule {position}",
+                spec.get('filename_glob') or "*.md",
+                re.compile(spec['item_pattern'], re.MULTILINE),
+                re.compile(section_pattern, re.MULTILINE) if section_pattern else None
+            ))
+        except (AttributeError, KeyError, TypeError, re.error) as e:
+            raise ValueError(f"Rule {position} in {path} is invalid: {str(e)}")
+    return rules
+
+
+def note_date(filename, content):
+    """The note's YYYY-MM-DD date from its filename or front matter, or None."""
+    date_match = DATE_PATTERN.search(filename)
+    if date_match and valid_date(date_match.group(1)):
+        return date_match.group(1)
+    front_matter = FRONT_MATTER_PATTERN.match(content)
+    if front_matter:
+        date_match = FRONT_MATTER_DATE_PATTERN.search(front_matter.group(1))
+        if date_match:
+            return valid_date(date_match.group(1))
+    return None
+
+
+def apply_rule(rule, content):
+    """The items rule finds in content (possibly none)."""
+    if rule.section_pattern is not None:
+        section = rule.section_pattern.search(content)
+        if section is None:
+            return []
+        following = HEADING_PATTERN.search(content, section.end())
+        content = content[section.end():following.start() if following else len(content)]
+    items = []
+    for match in rule.item_pattern.finditer(content):
+        item = (match.group(1) if rule.item_pattern.groups else match.group(0)).strip()
+        if item:
+            items.append(item)
+    return items
+
+
+def parse_note(filename, content, rules=DEFAULT_RULES):
+    """(date, items) for a note; items is empty if no rule matched it."""
+    for rule in rules:
+        if fnmatch.fnmatch(filename, rule.filename_glob):
+            items = apply_rule(rule, content)
+            if items:
+                return note_date(filename, content), items
+    return None, []
+
+
+def parse_notes(paths, rules):
+    """Read and parse a batch of notes; runs in a worker process.
+
+    Returns (path, date, items, error) for each, error being None or a message.
+    """
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            results.append((path, None, [], str(e)))
+            continue
+        entry_date, items = parse_note(os.path.basename(path), content, rules)
+        results.append((path, entry_date, items, None))
+    return results
+
+
+class VaultImporter(EntryImporter):
+    """Import the gratitude notes under vault_path into folder_path; see EntryImporter.
+
+    Progress counts notes: rows are notes parsed, skipped those with no
+    gratitude items or already in the journal, and failed those that could
+    not be read, dated or written. exclude_paths (e.g. the journal's own
+    folders) are not walked.
+    """
+
+    def __init__(self, vault_path, folder_path, rules=None, exclude_paths=(), **options):
+        options.setdefault('workers', os.cpu_count() or 1)
+        super().__init__(folder_path, **options)
+        self.vault_path = vault_path
+        self.rules = tuple(rules or DEFAULT_RULES)
+        self.exclude_paths = {os.path.normcase(os.path.abspath(path)) for path in exclude_paths}
+
+    def iter_notes(self):
+        globs = {rule.filename_glob for rule in self.rules}
+        for folder_path, folder_names, filenames in os.walk(self.vault_path):
+            folder_names[:] = sorted(
+                name for name in folder_names
+                if not name.startswith(SKIPPED_FOLDER_PREFIX)
+                and os.path.normcase(os.path.abspath(os.path.join(folder_path, name))) not in self.exclude_paths
+            )
+            for name in sorted(filenames):
+                if not name.startswith('.') and any(fnmatch.fnmatch(name, glob) for glob in globs):
+                    yield os.path.join(folder_path, name)
+
+    @traced()
+    def run(self):
+        self._started = time.perf_counter()
+        if os.path.normcase(os.path.abspath(self.vault_path)) in self.exclude_paths:
+            raise ValueError("Choose a vault folder other than the journal folder itself")
+        paths = list(self.iter_notes())
+        total = max(len(paths), 1)
+        allocator = FilenameAllocator(self.folder_path)
+        writer = EntryWriter(self.folder_path, allocator, fsync_every=self.fsync_every)
+
+        # Parsing runs ahead on the pool while this thread writes; at most two
+        # batches per worker are in flight so memory stays flat
+        pending = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for start in range(0, len(paths), self.batch_size):
+                if self._cancelled.is_set():
+                    break
+                batch = paths[start:start + self.batch_size]
+                pending[executor.submit(parse_notes, batch, self.rules)] = len(batch)
+                while len(pending) >= self.workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._ingest(future, pending.pop(future), allocator, writer, total)
+
+            while pending:
+                if self._cancelled.is_set():
+                    for future in pending:
+                        future.cancel()
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._ingest(future, pending.pop(future), allocator, writer, total)
+
+        writer.flush()
+        return self._result()
+
+    def _ingest(self, future, batch_size, allocator, writer, total):
+        """Count a parsed batch and write the new entries found in it."""
+        try:
+            results = future.result()
+        except Exception as e:
+            # e.g. a worker process was killed
+            print(f"Error parsing {batch_size} notes: {str(e)}", file=sys.stderr)
+            with self._lock:
+                self._rows += batch_size
+                self._failed += batch_size
+                self._fraction = min(self._rows / total, 1.0)
+            return
+
+        batch = []
+        skipped = failed = 0
+        for path, entry_date, items, error in results:
+            if error is not None:
+                print(f"Error reading {path}: {error}", file=sys.stderr)
+                failed += 1
+            elif not items:
+                skipped += 1
+            elif entry_date is None:
+                print(f"No date found for {path}", file=sys.stderr)
+                failed += 1
+            elif self._is_known(entry_date, items):
+                skipped += 1
+            else:
+                batch.append((entry_date, allocator.allocate(entry_date), items))
+
+        with self._lock:
+            self._rows += len(results)
+            self._skipped += skipped
+            self._failed += failed
+            self._fraction = min(self._rows / total, 1.0)
+        if batch and not self._cancelled.is_set():
+            self._write_batch(writer, batch)
+
+    def format_entry(self, items):
+        return format_vault_entry(items)
@@ -0,0 +1,219 @@
+"""Race-free creation of entry files.
+
+Names come from an in-memory map of the next free counter per date, so
+picking "{date} Gratitude_N.md" costs no stat calls. Content is written to a
+temporary file in the same folder and then published under its final name
+in one step that fails if the name is already taken (another machine on the
+shared Drive folder may have just created it), in which case the next
+counter is tried. A crash mid-write leaves at most a stray temp file, never
+a truncated entry; temp files left that way are swept when a writer for the
+folder is next opened.
+
+fsync is grouped: with fsync_every=N the files are flushed to disk together,
+once N have been written (and on flush()), followed by one sync of the
+folder, instead of a disk flush per entry.
+"""
+import errno
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from journal_entries import entry_filename, parse_entry_filename
+
+TEMP_PREFIX = ".tmp-"
+LOCK_PREFIX = ".lock-"
+
+# Seconds after which a temp or lock file is taken to be left by a crash
+# rather than by a write still in progress on this or another machine
+STALE_AFTER = 3600
+
+# Folders already swept by this process
+_swept = set()
+_swept_lock = threading.Lock()
+
+# Attempts at a fresh name before giving up on a busy date
+MAX_ATTEMPTS = 100
+
+
+class FilenameAllocator:
+    """Hand out free "{date} Gratitude_N.md" names from an in-memory counter map.
+
+    By default the map is filled from one listing of the folder. Pass
+    lookup(date) -> next counter instead to fill it lazily a date at a time,
+    e.g. from the entry index; when lookup returns None (the index is not
+    open, say) the folder is listed after all, once. Names that turn out to
+    be taken are skipped by the writer.
+    """
+
+    def __init__(self, folder_path, lookup=None):
+        self.folder_path = folder_path
+        self.lookup = lookup
+        self.next_counter = defaultdict(int)
+        self._listed = None
+        self._lock = threading.Lock()
+        if lookup is None:
+            self.next_counter.update(self._list_folder())
+
+    def _list_folder(self):
+        if self._listed is None:
+            listed = defaultdict(int)
+            for name in os.listdir(self.folder_path):
+                date_str, counter = parse_entry_filename(name)
+                if date_str and name == entry_filename(date_str, counter):
+                    listed[date_str] = max(listed[date_str], counter + 1)
+            self._listed = listed
+        return self._listed
+
+    def allocate(self, date_str):
+        with self._lock:
+            if self.lookup is not None and date_str not in self.next_counter:
+                counter = self.lookup(date_str)
+                self.next_counter[date_str] = self._list_folder()[date_str] if counter is None else counter
+            counter = self.next_counter[date_str]
+            self.next_counter[date_str] = counter + 1
+        return os.path.join(self.folder_path, entry_filename(date_str, counter))
+
+
+def _publish(temp_path, final_path):
+    """Give temp_path the name final_path, raising FileExistsError if it is taken."""
+    if os.name == 'nt':
+        # Unlike os.replace, os.rename refuses to overwrite on Windows
+        os.rename(temp_path, final_path)
+        return
+    try:
+        os.link(temp_path, final_path)
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links on this filesystem: claim the name with a hidden lock
+        # file rather than an empty entry, then move the content in
+        folder_path, name = os.path.split(final_path)
+        lock_path = os.path.join(folder_path, LOCK_PREFIX + name)
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        try:
+            if os.path.lexists(final_path):
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), final_path)
+            os.replace(temp_path, final_path)
+        finally:
+            os.remove(lock_path)
+        return
+    os.unlink(temp_path)
+
+
+def sweep_temp_files(folder_path, max_age=STALE_AFTER):
+    """Delete temp and lock files older than max_age seconds; returns how many."""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        with os.scandir(folder_path) as it:
+            for dir_entry in it:
+                if not dir_entry.name.startswith((TEMP_PREFIX, LOCK_PREFIX)):
+                    continue
+                try:
+                    if dir_entry.stat().st_mtime < cutoff:
+                        os.remove(dir_entry.path)
+                        removed += 1
+                except OSError:
+                    pass  # removed by another writer meanwhile
+    except OSError as e:
+        print(f"Could not sweep temp files in {folder_path}: {str(e)}", file=sys.stderr)
+    return removed
+
+
+def _fsync_path(path):
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_folder(folder_path):
+    # Makes the new names durable; directories cannot be opened on Windows
+    if os.name == 'nt':
+        return
+    fd = os.open(folder_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class EntryWriter:
+    """Write new entry files into folder_path; safe to share between threads."""
+
+    def __init__(self, folder_path, allocator=None, fsync_every=1):
+        self.folder_path = folder_path
+        self.allocator = allocator or FilenameAllocator(folder_path)
+        self.fsync_every = max(1, fsync_every)
+        self._pending = []
+        self._lock = threading.Lock()
+        with _swept_lock:
+            sweep = folder_path not in _swept
+            _swept.add(folder_path)
+        if sweep:
+            sweep_temp_files(folder_path)
+
+    def write(self, date_str, content, filepath=None):
+        """Create a new entry for date_str and return its path.
+
+        filepath, if given, is tried first (e.g. a name allocated up front to
+        keep an import in file order); otherwise, or if it is taken, the next
+        free name for the date is used. bytes content (e.g. a file copied from
+        another drive) is written exactly as given.
+        """
+        temp_path = os.path.join(self.folder_path, f"{TEMP_PREFIX}{uuid.uuid4().hex}.md")
+        try:
+            if isinstance(content, bytes):
+                temp_file = open(temp_path, 'wb')
+            else:
+                temp_file = open(temp_path, 'w', encoding='utf-8')
+            with temp_file as f:
+                f.write(content)
+                if self.fsync_every == 1:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            for _ in range(MAX_ATTEMPTS):
+                target = filepath or self.allocator.allocate(date_str)
+                filepath = None
+                try:
+                    _publish(temp_path, target)
+                    break
+                except FileExistsError:
+                    continue  # created elsewhere since the counter was read
+            else:
+                raise FileExistsError(f"No free entry name for {date_str} after {MAX_ATTEMPTS} attempts")
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        if self.fsync_every == 1:
+            _fsync_folder(self.folder_path)
+        else:
+            with self._lock:
+                self._pending.append(target)
+                due = len(self._pending) >= self.fsync_every
+            if due:
+                self.flush()
+        return target
+
+    def flush(self):
+        """fsync every file written since the last flush, then the folder."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        # Back-to-back fsyncs mostly find the journal already committed
+        for path in pending:
+            try:
+                _fsync_path(path)
+            except OSError as e:
+                print(f"Could not flush {path}: {str(e)}", file=sys.stderr)
+        _fsync_folder(self.folder_path)
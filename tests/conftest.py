@@ -0,0 +1,33 @@
+"""Shared fixtures: a throwaway journal folder and a Journal over it."""
+import os
+import sys
+
+import pytest
+
+# The application modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal_core import Journal  # noqa: E402
+from journal_entries import entry_filename, format_journal_entry  # noqa: E402
+
+
+def write_entry_file(folder, date_str, items, counter=0):
+    """Write an entry the way the app names and formats it; returns its path."""
+    path = os.path.join(folder, entry_filename(date_str, counter))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(format_journal_entry(items))
+    return path
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    folder = tmp_path / "journal"
+    folder.mkdir()
+    return str(folder)
+
+
+@pytest.fixture
+def journal(journal_dir):
+    journal = Journal([journal_dir], mirror_folder_paths=[])
+    yield journal
+    journal.close()
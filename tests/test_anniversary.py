@@ -0,0 +1,66 @@
+import os
+from datetime import date
+
+import pytest
+
+from conftest import write_entry_file
+from journal_anniversary import years_before
+
+
+def _dates(entries):
+    return [(entry.date, entry.counter) for entry in entries]
+
+
+def _write(journal_dir, *dates):
+    for date_str in dates:
+        write_entry_file(journal_dir, date_str, [f"on {date_str}"])
+
+
+def test_on_this_day_lists_earlier_years_newest_first(journal, journal_dir):
+    _write(journal_dir, "2021-05-06", "2023-05-06", "2023-05-07", "2024-05-06", "2025-05-06")
+    write_entry_file(journal_dir, "2023-05-06", ["again"], counter=1)
+
+    assert _dates(journal.on_this_day(date(2024, 5, 6))) == [
+        ("2023-05-06", 1), ("2023-05-06", 0), ("2021-05-06", 0)
+    ]
+
+
+def test_leap_day_entries_show_on_the_28th_in_other_years(journal, journal_dir):
+    _write(journal_dir, "2020-02-28", "2020-02-29", "2022-02-28", "2020-03-01")
+
+    assert _dates(journal.on_this_day(date(2023, 2, 28))) == [
+        ("2022-02-28", 0), ("2020-02-29", 0), ("2020-02-28", 0)
+    ]
+    assert _dates(journal.on_this_day(date(2024, 2, 28))) == [("2022-02-28", 0), ("2020-02-28", 0)]
+    assert _dates(journal.on_this_day(date(2024, 2, 29))) == [("2020-02-29", 0)]
+
+
+def test_years_before_moves_the_29th_to_the_28th():
+    assert years_before(date(2024, 2, 29), 1) == date(2023, 2, 28)
+    assert years_before(date(2024, 2, 29), 4) == date(2020, 2, 29)
+    assert years_before(date(2024, 3, 1), 1) == date(2023, 3, 1)
+
+
+def test_a_week_years_ago_can_span_new_year(journal, journal_dir):
+    _write(journal_dir, "2024-12-29", "2024-12-30", "2024-12-31", "2025-01-02", "2025-01-05",
+           "2025-01-06", "2023-12-31", "2026-01-01")
+
+    monday, sunday, entries = journal.week_years_ago(1, date(2026, 1, 1))
+
+    assert (monday, sunday) == (date(2024, 12, 30), date(2025, 1, 5))
+    assert [date_str for date_str, _ in _dates(entries)] == ["2025-01-05", "2025-01-02", "2024-12-31", "2024-12-30"]
+    with pytest.raises(ValueError):
+        journal.week_years_ago(0)
+
+
+def test_the_index_follows_saves_and_deletes(journal, journal_dir):
+    _write(journal_dir, "2023-05-06")
+    index = journal.get_index()
+    assert len(journal.on_this_day(date(2024, 5, 6))) == 1
+
+    os.remove(os.path.join(journal_dir, "2023-05-06 Gratitude.md"))
+    _write(journal_dir, "2022-05-06")
+    write_entry_file(journal_dir, "2021-05-06", [])
+    index.refresh([journal_dir], force=True)
+
+    assert _dates(journal.on_this_day(date(2024, 5, 6))) == [("2022-05-06", 0)]
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+import journal_index
+from conftest import write_entry_file
+from journal_archive import OFFSETS_FILENAME, PACK_FILENAME, PackedArchive
+from journal_core import Journal
+from journal_index import INDEX_FILENAME, JournalIndex
+
+
+def _write_days(journal_dir, days):
+    return [write_entry_file(journal_dir, f"2024-01-{day:02d}", [f"item {day}"]) for day in days]
+
+
+def test_build_keeps_entry_ids_and_archives_every_entry(journal, journal_dir):
+    _write_days(journal_dir, range(1, 4))
+    index = journal.get_index()
+    ids = {entry.path: entry.id for entry in index.all_entries()}
+
+    count, pack_path = journal.build_packed_archive()
+
+    assert count == 3
+    assert pack_path == os.path.join(journal_dir, PACK_FILENAME)
+    assert {entry.path: entry.id for entry in index.all_entries()} == ids
+    archived = PackedArchive(journal_dir).load_all()
+    assert {path: entry.items for path, entry in archived.items()} == {
+        entry.path: entry.items for entry in index.all_entries()
+    }
+
+
+def test_saves_and_deletes_are_appended_and_compacted_away(journal, journal_dir):
+    first, second = _write_days(journal_dir, [1, 2])
+    journal.build_packed_archive()
+    index = journal.get_index()
+
+    write_entry_file(journal_dir, "2024-01-01", ["changed"])
+    os.utime(first, (1, 1))
+    os.remove(second)
+    index.refresh([journal_dir], force=True)
+
+    archive = PackedArchive(journal_dir)
+    assert len(list(archive.iter_records())) == 4
+    assert {path: entry.items for path, entry in archive.load_all().items()} == {first: ["changed"]}
+
+    assert archive.compact() == 1
+    assert [record['path'] for record in archive.iter_records()] == [first]
+
+
+def test_a_torn_tail_is_skipped(journal, journal_dir):
+    _write_days(journal_dir, [1, 2])
+    journal.build_packed_archive()
+    with open(os.path.join(journal_dir, OFFSETS_FILENAME), 'ab') as f:
+        f.write((10 ** 9).to_bytes(8, 'little') + b"\x01\x02\x03")
+
+    assert len(PackedArchive(journal_dir).load_all()) == 2
+
+
+def test_a_file_that_is_not_an_archive_is_refused(journal_dir):
+    archive = PackedArchive(journal_dir)
+    with open(archive.pack_path, 'wb') as f:
+        f.write(b"NOTAPACK" + b"\0" * 16)
+    with open(archive.offsets_path, 'wb'):
+        pass
+
+    with pytest.raises(ValueError):
+        archive.load_all()
+
+
+def test_a_lost_index_is_seeded_from_the_archive(journal_dir, monkeypatch):
+    paths = _write_days(journal_dir, range(1, 6))
+    journal = Journal([journal_dir], mirror_folder_paths=[])
+    journal.build_packed_archive()
+    journal.close()
+    os.remove(os.path.join(journal_dir, INDEX_FILENAME))
+    write_entry_file(journal_dir, "2024-01-05", ["edited since"])
+    os.utime(paths[-1], (2, 2))
+
+    parsed = []
+    read_row = JournalIndex._read_row
+
+    def counting_read_row(self, filepath):
+        parsed.append(filepath)
+        return read_row(self, filepath)
+
+    monkeypatch.setattr(journal_index, 'ARCHIVE_MIN_FILES', 1)
+    monkeypatch.setattr(JournalIndex, '_read_row', counting_read_row)
+
+    journal = Journal([journal_dir], mirror_folder_paths=[])
+    try:
+        entries = journal.get_index().all_entries()
+        assert parsed == [paths[-1]]
+        assert [entry.items for entry in entries] == [[f"item {day}"] for day in range(1, 5)] + [["edited since"]]
+    finally:
+        journal.close()
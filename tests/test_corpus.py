@@ -0,0 +1,37 @@
+import os
+from datetime import date
+
+from benchmarks import corpus
+from journal_entries import parse_entry_filename
+
+
+def test_a_seed_always_gives_the_same_entries():
+    first = list(corpus.iter_dated_entries(200, seed=7))
+    assert list(corpus.iter_dated_entries(200, seed=7)) == first
+    assert list(corpus.iter_dated_entries(200, seed=8)) != first
+    assert first[0][0] == corpus.ANCHOR_DATE.isoformat()
+
+
+def test_large_corpora_stay_within_the_span(monkeypatch):
+    # Scaled down: 1,000 entries over 10 days stands in for 1M over 3,650
+    monkeypatch.setattr(corpus, 'SPAN_DAYS', 10)
+    dates = [date_str for date_str, _, _ in corpus.iter_dated_entries(1000)]
+
+    assert len(dates) == 1000
+    oldest = date.fromisoformat(min(dates))
+    assert (corpus.ANCHOR_DATE - oldest).days < 10
+    assert len(set(dates)) <= 10
+
+
+def test_write_journal_numbers_each_days_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(corpus, 'SPAN_DAYS', 5)
+    folder = tmp_path / "journal"
+    assert corpus.write_journal(str(folder), 50) == 50
+
+    names = os.listdir(folder)
+    assert len(names) == 50
+    per_day = {}
+    for name in names:
+        date_str, counter = parse_entry_filename(name)
+        per_day.setdefault(date_str, []).append(counter)
+    assert all(sorted(counters) == list(range(len(counters))) for counters in per_day.values())
@@ -0,0 +1,142 @@
+import os
+import random
+
+import pytest
+
+from conftest import write_entry_file
+from journal_deck import MODE_OLDER, MODE_RARELY_SEEN, FenwickTree, ShuffleDeck
+from journal_index import INDEX_FILENAME, JournalIndex
+
+
+@pytest.fixture
+def index(journal_dir):
+    for day in range(1, 11):
+        write_entry_file(journal_dir, f"2024-01-{day:02d}", [f"item {day}"])
+    index = JournalIndex(os.path.join(journal_dir, INDEX_FILENAME))
+    index.refresh([journal_dir])
+    yield index
+    index.close()
+
+
+def _draw_ids(deck, count):
+    return [deck.draw().id for _ in range(count)]
+
+
+def test_every_entry_is_drawn_once_per_pass(index):
+    deck = ShuffleDeck(index, rng=random.Random(1))
+    all_ids = {entry.id for entry in index.all_entries()}
+
+    first_pass = _draw_ids(deck, 10)
+    second_pass = _draw_ids(deck, 10)
+
+    assert set(first_pass) == all_ids and len(set(first_pass)) == 10
+    assert set(second_pass) == all_ids and len(set(second_pass)) == 10
+    assert second_pass[0] != first_pass[-1]
+
+
+def test_deck_position_survives_reopening(index):
+    first = _draw_ids(ShuffleDeck(index, rng=random.Random(2)), 4)
+    rest = _draw_ids(ShuffleDeck(index, rng=random.Random(3)), 6)
+    assert len(set(first + rest)) == 10
+
+
+def test_peeking_does_not_use_up_an_entry(index):
+    deck = ShuffleDeck(index, rng=random.Random(4))
+    peeked = deck.peek()
+    assert deck.peek().id == peeked.id
+    assert deck.views(peeked.id) == 0
+
+    deck.mark_shown(peeked.id)
+    assert deck.views(peeked.id) == 1
+    assert peeked.id not in _draw_ids(deck, 9)
+
+
+def test_a_peeked_entry_drawn_elsewhere_is_not_shown_twice_in_a_pass(index):
+    deck = ShuffleDeck(index, rng=random.Random(5))
+    later = deck.ids[deck.cursor + 3]
+    deck.mark_shown(later)
+
+    assert later not in _draw_ids(deck, 9)
+
+
+def test_entries_added_mid_pass_are_drawn_in_that_pass(index, journal_dir):
+    deck = ShuffleDeck(index, rng=random.Random(6))
+    drawn = _draw_ids(deck, 5)
+
+    added = write_entry_file(journal_dir, "2024-02-01", ["new"])
+    index.refresh([journal_dir], force=True)
+    drawn += _draw_ids(deck, 6)
+
+    assert len(set(drawn)) == 11
+    assert index.get_by_path(added).id in drawn
+
+
+def test_deleted_entries_are_skipped(index, journal_dir):
+    deck = ShuffleDeck(index, rng=random.Random(7))
+    removed = index.get(deck.ids[deck.cursor])
+    os.remove(removed.path)
+    index.refresh([journal_dir], force=True)
+
+    drawn = _draw_ids(deck, 9)
+    assert removed.id not in drawn and len(set(drawn)) == 9
+
+
+def test_fenwick_tree_keeps_prefix_sums_through_updates_and_appends():
+    weights = [3.0, 1.0, 0.0, 2.0, 5.0]
+    tree = FenwickTree(weights)
+    tree.set(1, 4.0)
+    weights[1] = 4.0
+    for weight in (1.5, 2.5, 0.5):
+        weights.append(weight)
+        assert tree.append(weight) == len(weights) - 1
+
+    assert tree.total() == sum(weights)
+    for slot in range(len(weights)):
+        assert tree.find(sum(weights[:slot]) + 0.25) == slot or weights[slot] == 0.0
+
+
+def test_rarely_seen_mode_favours_unseen_entries(index):
+    deck = ShuffleDeck(index, rng=random.Random(9))
+    favourite = index.all_entries()[-1]
+    for entry in index.all_entries():
+        if entry.id != favourite.id:
+            for _ in range(50):
+                deck.mark_shown(entry.id, MODE_RARELY_SEEN)
+
+    # Its weight is 1 against 9 x 1/51, and drops once it has been shown
+    assert deck.draw(MODE_RARELY_SEEN).id == favourite.id
+    assert deck.views(favourite.id) == 1
+
+
+def test_weighted_draws_skip_deleted_entries(index, journal_dir):
+    deck = ShuffleDeck(index, rng=random.Random(10))
+    deck.draw(MODE_OLDER)
+    removed = index.all_entries()[:9]
+    for entry in removed:
+        os.remove(entry.path)
+    index.refresh([journal_dir], force=True)
+
+    survivor = index.all_entries()[0]
+    assert {deck.draw(MODE_OLDER).id for _ in range(10)} == {survivor.id}
+
+
+def test_weighted_peek_records_no_view(index):
+    deck = ShuffleDeck(index, rng=random.Random(8))
+    peeked = deck.peek(MODE_RARELY_SEEN)
+    assert deck.views(peeked.id) == 0
+    deck.mark_shown(peeked.id, MODE_RARELY_SEEN)
+    assert deck.views(peeked.id) == 1
+
+
+def test_discarded_prefetch_leaves_the_next_entry_in_place(journal):
+    peeked = journal.peek_random_entry()
+    assert peeked is None  # empty journal
+
+    write_entry_file(journal.journal_folder_paths[0], "2024-01-01", ["tea"])
+    write_entry_file(journal.journal_folder_paths[0], "2024-01-02", ["sun"])
+    journal.get_index().refresh(journal.journal_folder_paths, force=True)
+
+    peeked = journal.peek_random_entry()
+    assert journal.peek_random_entry().path == peeked.path
+    journal.mark_entry_shown(peeked.path)
+    assert journal.load_random_entry().path != peeked.path
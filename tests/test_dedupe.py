@@ -0,0 +1,87 @@
+import csv
+import os
+
+from conftest import write_entry_file
+from journal_core import Journal
+from journal_dedupe import content_key
+from journal_export import PRESENTLY_COLUMNS
+
+
+def _write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(PRESENTLY_COLUMNS)
+        writer.writerows(rows)
+    return path
+
+
+def _import(journal, csv_path):
+    return journal.presently_importer(csv_path, workers=2, batch_size=2).run()
+
+
+def _dated_items(journal):
+    index = journal.get_index()
+    index.refresh(journal.journal_folder_paths, force=True)
+    return sorted((entry.date, tuple(entry.items)) for entry in index.all_entries())
+
+
+def test_content_keys_ignore_case_and_spacing_but_not_the_date():
+    key = content_key("2024-01-01", ["Morning  tea", "sun"])
+    assert content_key("2024-01-01", [" morning tea ", "SUN", ""]) == key
+    assert content_key("2024-01-02", ["Morning tea", "sun"]) != key
+    assert content_key("2024-01-01", ["sun", "Morning tea"]) != key
+
+
+def test_import_skips_rows_already_in_the_journal(journal, journal_dir, tmp_path):
+    write_entry_file(journal_dir, "2024-01-01", ["tea", "sun"])
+    csv_path = _write_csv(str(tmp_path / "backup.csv"), [
+        ("2024-01-01", "tea\n\nsun"),      # already written by the app
+        ("2024-01-02", "rain"),
+        ("2024-01-02", "rain"),            # repeated within the backup
+        ("2024-01-03", "snow\n\nfrost"),
+    ])
+
+    first = _import(journal, csv_path)
+    assert (first.imported, first.skipped, first.failed) == (2, 2, 0)
+
+    second = _import(journal, csv_path)
+    assert (second.imported, second.skipped) == (0, 4)
+    assert _dated_items(journal) == [
+        ("2024-01-01", ("tea", "sun")),
+        ("2024-01-02", ("rain",)),
+        ("2024-01-03", ("snow", "frost")),
+    ]
+
+
+def test_same_items_on_another_day_are_not_duplicates(journal, tmp_path):
+    csv_path = _write_csv(str(tmp_path / "backup.csv"), [("2024-01-01", "tea"), ("2024-01-02", "tea")])
+    assert _import(journal, csv_path).imported == 2
+
+
+def test_earlier_reimports_are_found_and_removed(journal, journal_dir):
+    kept = write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    copies = [write_entry_file(journal_dir, "2024-01-01", ["Tea"], counter=n) for n in (1, 2)]
+    write_entry_file(journal_dir, "2024-01-01", ["sun"], counter=3)
+
+    assert [entry.path for entry in journal.find_duplicates()] == copies
+    removed, failed = journal.remove_duplicates()
+
+    assert (removed, failed) == (copies, [])
+    assert not any(os.path.exists(path) for path in copies) and os.path.exists(kept)
+    assert journal.find_duplicates() == []
+    assert journal.get_index().count() == 2
+
+
+def test_copies_on_another_folder_are_mirror_copies_not_duplicates(tmp_path):
+    first, second = str(tmp_path / "a"), str(tmp_path / "b")
+    os.makedirs(first)
+    os.makedirs(second)
+    write_entry_file(first, "2024-01-01", ["tea"])
+    copy = write_entry_file(second, "2024-01-01", ["tea"])
+    journal = Journal([first, second], mirror_folder_paths=[])
+    try:
+        content_hashes = journal.get_content_hashes()
+        assert journal.find_duplicates() == []
+        assert content_hashes.is_mirror_copy(journal.get_index().get_by_path(copy).id)
+    finally:
+        journal.close()
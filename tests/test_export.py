@@ -0,0 +1,96 @@
+import csv
+import gzip
+import json
+import os
+
+import pytest
+
+from conftest import write_entry_file
+from journal_core import Journal
+from journal_export import PRESENTLY_COLUMNS, export_format
+
+
+def _import(journal, csv_path):
+    return journal.presently_importer(csv_path, workers=2, batch_size=2).run()
+
+
+def _dated_items(journal):
+    index = journal.get_index()
+    index.refresh(journal.journal_folder_paths, force=True)
+    return sorted((entry.date, tuple(entry.items)) for entry in index.all_entries())
+
+
+def test_csv_export_imports_back_to_the_same_entries(journal, journal_dir, tmp_path):
+    write_entry_file(journal_dir, "2023-12-31", ["a first item", "a second, with a comma"])
+    write_entry_file(journal_dir, "2024-01-01", ["quotes \"inside\" an item"])
+    write_entry_file(journal_dir, "2024-01-01", ["the same day again"], counter=1)
+    out_path = str(tmp_path / "export.csv")
+
+    result = journal.export(out_path)
+    assert result.exported == 3
+
+    restored = Journal([str(tmp_path / "restored")], mirror_folder_paths=[])
+    try:
+        os.makedirs(restored.journal_folder_paths[0])
+        imported = _import(restored, out_path)
+        assert (imported.imported, imported.skipped, imported.failed) == (3, 0, 0)
+        assert _dated_items(restored) == _dated_items(journal)
+    finally:
+        restored.close()
+
+
+def test_jsonl_export_lists_every_entry_in_date_order(journal, journal_dir, tmp_path):
+    write_entry_file(journal_dir, "2024-01-02", ["sun"])
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    out_path = str(tmp_path / "export.jsonl.gz")
+
+    journal.export(out_path)
+
+    with gzip.open(out_path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [(record['date'], record['items']) for record in records] == [
+        ("2024-01-01", ["tea"]), ("2024-01-02", ["sun"])
+    ]
+
+
+
+def test_the_format_follows_the_suffix():
+    assert [export_format(path) for path in ("a.csv", "a.CSV.gz", "a.jsonl", "a.jsonl.gz", "a.txt")] == [
+        "csv", "csv", "jsonl", "jsonl", "csv"
+    ]
+
+
+def test_csv_rows_keep_items_apart_and_leave_out_undated_entries(journal, journal_dir, tmp_path):
+    write_entry_file(journal_dir, "2024-01-01", ["one line\n\nafter a blank line", "second"])
+    with open(os.path.join(journal_dir, "Old Gratitude.md"), 'w', encoding='utf-8') as f:
+        f.write("## Three things I'm grateful for today:\n1. undated\n")
+    csv_path, jsonl_path = str(tmp_path / "export.csv"), str(tmp_path / "export.jsonl")
+
+    assert journal.export(csv_path)[:2] == (1, 1)
+    with open(csv_path, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows == [PRESENTLY_COLUMNS, ["2024-01-01", "one line\nafter a blank line\n\nsecond"]]
+
+    assert journal.export(jsonl_path)[:2] == (2, 0)
+
+
+def test_copies_on_mirrored_folders_are_exported_once(tmp_path):
+    first, second = str(tmp_path / "a"), str(tmp_path / "b")
+    os.makedirs(first)
+    os.makedirs(second)
+    write_entry_file(first, "2024-01-01", ["tea"])
+    write_entry_file(second, "2024-01-01", ["tea"])
+    journal = Journal([first, second], mirror_folder_paths=[])
+    try:
+        result = journal.export(str(tmp_path / "export.csv"))
+        assert (result.exported, result.skipped) == (1, 1)
+    finally:
+        journal.close()
+
+
+def test_a_failed_export_leaves_no_partial_file(journal, journal_dir, tmp_path):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    out_path = str(tmp_path / "export.csv")
+    with pytest.raises(ValueError):
+        journal.export(out_path, fmt="xml")
+    assert os.listdir(tmp_path) == ["journal"]
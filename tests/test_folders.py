@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+import journal_folders
+from conftest import write_entry_file
+from journal_core import Journal
+from journal_folders import FolderResolver
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """Record every probe; paths in probes.slow block until released, probes.down are unreachable."""
+    calls = []
+    release = threading.Event()
+
+    def fake_probe(path, create):
+        calls.append(path)
+        if path in fake_probe.slow:
+            release.wait(5)
+        return path not in fake_probe.down
+
+    fake_probe.calls, fake_probe.slow, fake_probe.down, fake_probe.release = calls, set(), set(), release
+    monkeypatch.setattr(journal_folders, '_probe', fake_probe)
+    yield fake_probe
+    release.set()
+
+
+def test_reachable_folders_keep_their_preference_order(probes):
+    probes.down.add("B")
+    assert FolderResolver(["A", "B", "C"]).reachable() == ["A", "C"]
+    assert FolderResolver(["C", "A"]).resolve() == "C"
+
+
+def test_the_answer_is_cached_for_the_ttl(probes):
+    resolver = FolderResolver(["A", "B"], ttl=300)
+    resolver.reachable()
+    resolver.reachable()
+    assert len(probes.calls) == 2
+
+    resolver.ttl = 0
+    time.sleep(0.01)
+    resolver.reachable()
+    assert len(probes.calls) == 4
+
+
+def test_a_hung_drive_is_left_out_after_the_timeout(probes):
+    probes.slow.add("A")
+    resolver = FolderResolver(["A", "B"], timeout=0.2)
+
+    started = time.monotonic()
+    assert resolver.reachable() == ["B"]
+    assert time.monotonic() - started < 2
+
+
+def test_resolve_raises_and_forgets_when_nothing_answers(probes):
+    probes.down.update(["A", "B"])
+    resolver = FolderResolver(["A", "B"])
+    with pytest.raises(OSError):
+        resolver.resolve()
+
+    probes.down.clear()
+    assert resolver.resolve() == "A"
+
+
+def test_invalidate_forces_a_new_probe(probes):
+    resolver = FolderResolver(["A"])
+    resolver.reachable()
+    resolver.invalidate()
+    resolver.reachable()
+    assert probes.calls == ["A", "A"]
+
+
+def test_create_makes_missing_folders(tmp_path):
+    target = tmp_path / "new" / "journal"
+    assert FolderResolver([str(target)], create=True).resolve() == str(target)
+    assert target.is_dir()
+    assert FolderResolver([str(tmp_path / "missing")]).reachable() == []
+
+
+def test_warm_up_opens_everything_a_click_needs(journal, journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    assert journal.warm_up() is journal.index
+    assert None not in (journal.deck, journal.search_index, journal.anniversaries)
+
+
+def test_warm_up_without_a_reachable_folder(tmp_path):
+    journal = Journal([str(tmp_path / "offline")], mirror_folder_paths=[])
+    try:
+        assert journal.warm_up() is None
+    finally:
+        journal.close()
@@ -0,0 +1,75 @@
+import csv
+import os
+
+from journal_entries import parse_entry_items
+from journal_export import PRESENTLY_COLUMNS
+from journal_import import PresentlyImporter
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(PRESENTLY_COLUMNS)
+        writer.writerows(rows)
+    return path
+
+
+def _read_items(path):
+    with open(path, encoding='utf-8') as f:
+        return parse_entry_items(f.read())
+
+
+def test_rows_become_dated_entries(journal_dir, tmp_path):
+    csv_path = write_csv(str(tmp_path / "backup.csv"), [
+        ("2024-01-01", "tea\n\nsun"),
+        ("2024-01-01", "rain"),
+        ("2024-01-02", ""),                # empty rows are not rows
+    ])
+    result = PresentlyImporter(csv_path, journal_dir, workers=2, batch_size=1).run()
+
+    assert (result.imported, result.skipped, result.failed, result.cancelled) == (2, 0, 0, False)
+    assert sorted(os.listdir(journal_dir)) == ["2024-01-01 Gratitude.md", "2024-01-01 Gratitude_1.md"]
+    assert _read_items(os.path.join(journal_dir, "2024-01-01 Gratitude.md")) == ["tea", "sun"]
+
+
+def test_rows_with_a_bad_date_are_counted_as_failed(journal_dir, tmp_path):
+    csv_path = write_csv(str(tmp_path / "backup.csv"), [
+        ("../outside", "escape"),
+        ("2024-02-30", "no such day"),
+        ("yesterday", "not a date"),
+        ("2024-01-01", "tea"),
+    ])
+    result = PresentlyImporter(csv_path, journal_dir).run()
+
+    assert (result.imported, result.failed) == (1, 3)
+    assert os.listdir(journal_dir) == ["2024-01-01 Gratitude.md"]
+    assert sorted(os.listdir(tmp_path)) == ["backup.csv", "journal"]
+
+
+def test_progress_reaches_every_row(journal_dir, tmp_path):
+    csv_path = write_csv(str(tmp_path / "backup.csv"), [(f"2024-01-{day:02d}", "tea") for day in range(1, 21)])
+    importer = PresentlyImporter(csv_path, journal_dir, workers=2, batch_size=3)
+    assert importer.progress().rows == 0
+
+    importer.run()
+    progress = importer.progress()
+    assert (progress.rows, progress.imported, progress.fraction) == (20, 20, 1.0)
+
+
+def test_cancel_stops_the_import(journal_dir, tmp_path):
+    csv_path = write_csv(str(tmp_path / "backup.csv"), [(f"2024-01-{day:02d}", "tea") for day in range(1, 29)])
+    importer = PresentlyImporter(
+        csv_path, journal_dir, workers=1, batch_size=1,
+        on_batch_written=lambda paths: importer.cancel()
+    )
+    result = importer.run()
+
+    assert result.cancelled
+    assert 1 <= result.imported < 28
+    assert len(os.listdir(journal_dir)) == result.imported
+
+
+def test_imported_batches_reach_the_index(journal, tmp_path):
+    csv_path = write_csv(str(tmp_path / "backup.csv"), [("2024-01-01", "tea"), ("2024-01-02", "sun")])
+    journal.presently_importer(csv_path).run()
+    assert sorted(entry.items[0] for entry in journal.get_index().all_entries()) == ["sun", "tea"]
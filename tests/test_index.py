@@ -0,0 +1,168 @@
+import os
+import threading
+
+from conftest import write_entry_file
+from journal_index import INDEX_FILENAME, JournalIndex, JournalWatcher, open_journal_index
+
+
+def _open(journal_dir):
+    index = JournalIndex(os.path.join(journal_dir, INDEX_FILENAME))
+    index.refresh([journal_dir])
+    return index
+
+
+def test_refresh_indexes_dates_counters_and_items(journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea", "sun"])
+    write_entry_file(journal_dir, "2024-01-01", ["rain"], counter=2)
+    index = _open(journal_dir)
+    try:
+        entries = index.all_entries()
+        assert [(entry.date, entry.counter, entry.items) for entry in entries] == [
+            ("2024-01-01", 0, ["tea", "sun"]),
+            ("2024-01-01", 2, ["rain"]),
+        ]
+    finally:
+        index.close()
+
+
+def test_rebuild_reindexes_every_file(journal_dir):
+    for day in range(1, 6):
+        write_entry_file(journal_dir, f"2024-01-0{day}", [f"item {day}"])
+    index = _open(journal_dir)
+    try:
+        before = [(entry.path, entry.items) for entry in index.all_entries()]
+        index.rebuild([journal_dir])
+        assert [(entry.path, entry.items) for entry in index.all_entries()] == before
+    finally:
+        index.close()
+
+
+def test_index_survives_reopening(journal_dir):
+    path = write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    index = _open(journal_dir)
+    entry_id = index.get_by_path(path).id
+    index.close()
+
+    index = _open(journal_dir)
+    try:
+        assert index.get_by_path(path).id == entry_id
+        assert index.count() == 1
+    finally:
+        index.close()
+
+
+def test_unreadable_index_is_rebuilt_from_the_files(journal_dir, capsys):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    with open(os.path.join(journal_dir, INDEX_FILENAME), 'wb') as f:
+        f.write(b"this is not a database" * 100)
+
+    index = open_journal_index([journal_dir])
+    try:
+        assert [entry.items for entry in index.all_entries()] == [["tea"]]
+    finally:
+        index.close()
+    assert "Rebuilding unreadable entry index" in capsys.readouterr().err
+
+
+def test_no_reachable_folder_gives_no_index(tmp_path):
+    assert open_journal_index([str(tmp_path / "offline")]) is None
+
+
+def test_get_many_skips_missing_ids(journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    write_entry_file(journal_dir, "2024-01-02", ["sun"])
+    index = _open(journal_dir)
+    try:
+        ids = [entry.id for entry in index.all_entries()]
+        assert sorted(entry.id for entry in index.get_many(ids + [9999])) == sorted(ids)
+        assert index.get_many([]) == []
+    finally:
+        index.close()
+
+
+def test_refresh_picks_up_added_changed_and_removed_files(journal_dir):
+    kept = write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    gone = write_entry_file(journal_dir, "2024-01-02", ["sun"])
+    index = _open(journal_dir)
+    try:
+        kept_id = index.get_by_path(kept).id
+        seen = []
+        index.add_listener(seen.append)
+
+        write_entry_file(journal_dir, "2024-01-01", ["tea", "biscuits"])
+        os.utime(kept, (1, 1))
+        os.remove(gone)
+        added = write_entry_file(journal_dir, "2024-01-03", ["snow"])
+        index.refresh([journal_dir], force=True)
+
+        assert index.get_by_path(kept).id == kept_id
+        assert index.get_by_path(kept).items == ["tea", "biscuits"]
+        assert index.get_by_path(gone) is None
+        assert index.get_by_path(added).items == ["snow"]
+        changes = seen[-1]
+        assert [entry.path for entry in changes.added] == [added]
+        assert [entry.path for entry in changes.changed] == [kept]
+        assert [entry.path for entry in changes.removed] == [gone]
+    finally:
+        index.close()
+
+
+def test_refresh_without_changes_reports_nothing(journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    index = _open(journal_dir)
+    try:
+        seen = []
+        index.add_listener(seen.append)
+        index.refresh([journal_dir])
+        index.refresh([journal_dir], force=True)
+        assert seen == []
+    finally:
+        index.close()
+
+
+def test_unchanged_folder_is_not_listed_again(journal_dir, monkeypatch):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    index = _open(journal_dir)
+    try:
+        listed = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, 'scandir', lambda path: listed.append(path) or real_scandir(path))
+        real_listdir = os.listdir
+        monkeypatch.setattr(os, 'listdir', lambda path: listed.append(path) or real_listdir(path))
+        index.refresh([journal_dir])
+        assert listed == []
+        index.refresh([journal_dir], force=True)
+        assert listed
+    finally:
+        index.close()
+
+
+def test_unreachable_folder_keeps_its_entries(journal_dir, tmp_path):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    index = _open(journal_dir)
+    try:
+        index.refresh([journal_dir, str(tmp_path / "offline")], force=True)
+        assert index.count() == 1
+    finally:
+        index.close()
+
+
+def test_watcher_reports_files_synced_in(journal_dir):
+    index = _open(journal_dir)
+    seen = threading.Event()
+    changes = []
+
+    def on_change(found):
+        changes.append(found)
+        seen.set()
+
+    watcher = JournalWatcher(index, [journal_dir], interval=0.05, on_change=on_change)
+    watcher.start()
+    try:
+        path = write_entry_file(journal_dir, "2024-01-01", ["tea"])
+        assert seen.wait(5)
+        assert [entry.path for entry in changes[0].added] == [path]
+    finally:
+        watcher.stop()
+        watcher.join(5)
+        index.close()
@@ -0,0 +1,81 @@
+import os
+
+from conftest import write_entry_file
+from journal_loader import EntryLoader
+
+
+def test_repeated_loads_are_cache_hits(journal_dir):
+    path = write_entry_file(journal_dir, "2024-01-01", ["tea", "sun"])
+    loader = EntryLoader()
+
+    first = loader.load(path)
+    second = loader.load(path)
+
+    assert second is first
+    assert first.items == ["tea", "sun"]
+    assert (loader.stats().hits, loader.stats().misses) == (1, 1)
+
+
+def test_a_changed_file_is_read_again(journal_dir):
+    path = write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    loader = EntryLoader()
+    loader.load(path)
+
+    write_entry_file(journal_dir, "2024-01-01", ["tea", "biscuits"])
+    os.utime(path, (1, 1))
+
+    assert loader.load(path).items == ["tea", "biscuits"]
+    assert loader.stats().misses == 2
+
+
+def test_a_known_signature_skips_the_stat(journal_dir, monkeypatch):
+    path = write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    loader = EntryLoader()
+    stat = os.stat(path)
+    loader.load(path, (stat.st_mtime, stat.st_size))
+
+    def no_stat(*args, **kwargs):
+        raise AssertionError("the file was stat'ed")
+
+    monkeypatch.setattr(os, 'stat', no_stat)
+    assert loader.load(path, (stat.st_mtime, stat.st_size)).items == ["tea"]
+    assert loader.stats().hits == 1
+
+
+def test_least_recently_used_entries_are_evicted_first(journal_dir):
+    paths = [write_entry_file(journal_dir, f"2024-01-0{day}", [f"item {day}"]) for day in range(1, 5)]
+    loader = EntryLoader(max_entries=3)
+    for path in paths[:3]:
+        loader.load(path)
+    loader.load(paths[0])        # now the most recently used
+    loader.load(paths[3])        # evicts paths[1]
+
+    assert loader.stats().entries == 3
+    misses = loader.stats().misses
+    loader.load(paths[0])
+    loader.load(paths[2])
+    assert loader.stats().misses == misses
+    loader.load(paths[1])
+    assert loader.stats().misses == misses + 1
+
+
+def test_the_byte_budget_bounds_the_cache(journal_dir):
+    paths = [write_entry_file(journal_dir, f"2024-01-0{day}", ["x" * 200]) for day in range(1, 6)]
+    loader = EntryLoader(max_bytes=700)
+    for path in paths:
+        loader.load(path)
+
+    stats = loader.stats()
+    assert stats.bytes <= 700
+    assert stats.entries == stats.bytes // os.path.getsize(paths[0])
+
+
+def test_invalidate_forgets_an_entry(journal_dir):
+    path = write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    loader = EntryLoader()
+    loader.load(path)
+    loader.invalidate(path)
+
+    assert loader.stats().entries == 0
+    loader.load(path)
+    assert loader.stats().misses == 2
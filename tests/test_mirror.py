@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+import journal_mirror
+from conftest import write_entry_file
+from journal_core import Journal
+from journal_mirror import MANIFEST_FILENAME, RootManifest, file_key
+
+
+@pytest.fixture
+def roots(tmp_path):
+    first, second = str(tmp_path / "a"), str(tmp_path / "b")
+    os.makedirs(first)
+    os.makedirs(second)
+    return first, second
+
+
+@pytest.fixture
+def mirrored(roots):
+    journal = Journal([roots[0]], save_folder_paths=[roots[0]], mirror_folder_paths=list(roots))
+    yield journal
+    journal.close()
+
+
+def _contents(folder):
+    contents = {}
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".md") and not name.startswith("."):
+            with open(os.path.join(folder, name), 'rb') as f:
+                contents[name] = f.read()
+    return contents
+
+
+def test_saves_are_copied_to_every_root(mirrored, roots):
+    mirrored.get_index()
+    mirrored.write_entry(["tea"], "2024-01-01")
+    mirrored.write_entry(["sun"], "2024-01-01")
+
+    assert _contents(roots[1]) == _contents(roots[0])
+    assert len(_contents(roots[0])) == 2
+    assert mirrored.reconcile_mirrors() == 0
+
+
+def test_reconcile_copies_what_each_root_lacks(mirrored, roots):
+    write_entry_file(roots[0], "2024-01-01", ["only on a"])
+    write_entry_file(roots[1], "2024-01-02", ["only on b"])
+    write_entry_file(roots[0], "2024-01-03", ["on both"])
+    write_entry_file(roots[1], "2024-01-03", ["on both"])
+
+    assert mirrored.reconcile_mirrors() == 2
+    assert _contents(roots[0]) == _contents(roots[1])
+    assert len(_contents(roots[0])) == 3
+    assert mirrored.reconcile_mirrors() == 0
+
+
+def test_a_taken_name_gets_the_next_counter(mirrored, roots):
+    write_entry_file(roots[0], "2024-01-01", ["from a"])
+    write_entry_file(roots[1], "2024-01-01", ["from b"])
+
+    assert mirrored.reconcile_mirrors() == 2
+    assert sorted(_contents(roots[0])) == ["2024-01-01 Gratitude.md", "2024-01-01 Gratitude_1.md"]
+    assert sorted(_contents(roots[0]).values()) == sorted(_contents(roots[1]).values())
+
+
+def test_an_entry_deleted_from_one_root_comes_back(mirrored, roots):
+    path = write_entry_file(roots[0], "2024-01-01", ["tea"])
+    mirrored.reconcile_mirrors()
+    os.remove(path)
+    os.utime(roots[0], (1, 1))
+
+    assert mirrored.reconcile_mirrors() == 1
+    assert os.path.exists(path)
+
+
+def test_manifests_record_only_changed_files(mirrored, roots, monkeypatch):
+    write_entry_file(roots[0], "2024-01-01", ["tea"])
+    mirrored.reconcile_mirrors()
+
+    hashed = []
+    read = journal_mirror.JournalMirror._read
+
+    def counting_read(self, filepath):
+        hashed.append(filepath)
+        return read(self, filepath)
+
+    monkeypatch.setattr(journal_mirror.JournalMirror, '_read', counting_read)
+    write_entry_file(roots[0], "2024-01-02", ["sun"])
+    os.utime(roots[0], (1, 1))
+    mirrored.reconcile_mirrors()
+
+    assert [os.path.basename(path) for path in hashed] == ["2024-01-02 Gratitude.md"]
+
+
+def test_the_manifest_ignores_a_torn_line_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal_mirror, 'COMPACT_SLACK', 0)
+    manifest = RootManifest(str(tmp_path))
+    record = journal_mirror.ManifestRecord(file_key("2024-01-01 Gratitude.md", b"tea"), 3, 1.0)
+    manifest.update([("2024-01-01 Gratitude.md", record)])
+    manifest.update([("2024-01-01 Gratitude.md", record._replace(mtime=2.0))])
+    with open(manifest.path, 'a', encoding='utf-8') as f:
+        f.write('{"name": "torn')
+
+    reloaded = RootManifest(str(tmp_path))
+    assert reloaded.files == {"2024-01-01 Gratitude.md": record._replace(mtime=2.0)}
+
+    reloaded.update(removed=["2024-01-01 Gratitude.md"])
+    with open(os.path.join(str(tmp_path), MANIFEST_FILENAME), encoding='utf-8') as f:
+        assert f.read() == ""
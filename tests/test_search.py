@@ -0,0 +1,69 @@
+import os
+
+from conftest import write_entry_file
+from journal_core import Journal
+
+
+def _dates(results):
+    return [result.entry.date for result in results]
+
+
+def test_every_keyword_must_match(journal, journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["morning tea", "quiet garden"])
+    write_entry_file(journal_dir, "2024-01-02", ["morning run"])
+    assert _dates(journal.search("morning garden")) == ["2024-01-01"]
+    assert sorted(_dates(journal.search("morning"))) == ["2024-01-01", "2024-01-02"]
+
+
+def test_phrases_match_within_one_item(journal, journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["a cup of tea with friends"])
+    write_entry_file(journal_dir, "2024-01-02", ["tea", "a cup that broke"])
+    results = journal.search('"cup of tea"')
+    assert _dates(results) == ["2024-01-01"]
+    assert results[0].matched_items == [0]
+
+
+def test_date_range_limits_the_results(journal, journal_dir):
+    for day in ("2023-12-31", "2024-01-01", "2024-02-01"):
+        write_entry_file(journal_dir, day, ["sunshine"])
+    assert _dates(journal.search("sunshine from:2024-01-01 to:2024-01-31")) == ["2024-01-01"]
+
+
+def test_more_matches_rank_higher(journal, journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["family", "work"])
+    write_entry_file(journal_dir, "2024-01-02", ["family dinner", "family walk", "family call"])
+    assert _dates(journal.search("family"))[0] == "2024-01-02"
+
+
+def test_saved_entries_are_searchable_at_once(journal):
+    journal.get_search_index()
+    journal.write_entry(["an unusual aardvark"], "2024-01-01")
+    assert _dates(journal.search("aardvark")) == ["2024-01-01"]
+
+
+def test_edited_and_deleted_entries_leave_the_results(journal, journal_dir):
+    edited = write_entry_file(journal_dir, "2024-01-01", ["walrus"])
+    deleted = write_entry_file(journal_dir, "2024-01-02", ["walrus"])
+    journal.get_search_index()
+
+    write_entry_file(journal_dir, "2024-01-01", ["penguin"])
+    os.utime(edited, (1, 1))
+    os.remove(deleted)
+    journal.get_index().refresh(journal.journal_folder_paths, force=True)
+
+    assert journal.search("walrus") == []
+    assert _dates(journal.search("penguin")) == ["2024-01-01"]
+
+
+def test_entries_changed_while_closed_are_caught_up(journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["walrus"])
+    first = Journal([journal_dir], mirror_folder_paths=[])
+    first.get_search_index()
+    first.close()
+
+    write_entry_file(journal_dir, "2024-01-02", ["walrus"])
+    second = Journal([journal_dir], mirror_folder_paths=[])
+    try:
+        assert sorted(_dates(second.search("walrus"))) == ["2024-01-01", "2024-01-02"]
+    finally:
+        second.close()
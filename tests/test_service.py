@@ -0,0 +1,98 @@
+import os
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import journal_cli
+import journal_service
+from conftest import write_entry_file
+from gratitude_journal import GratitudeJournal
+from journal_service import JournalService, RemoteJournal, ServiceClient, ServiceError
+
+
+@pytest.fixture
+def remote(journal, tmp_path):
+    service_file = str(tmp_path / "service.json")
+    service = JournalService(journal, port=0, service_file=service_file)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not os.path.exists(service_file):
+        assert time.monotonic() < deadline, "service did not start"
+        time.sleep(0.01)
+
+    remote = RemoteJournal(ServiceClient.connect(service_file))
+    yield remote
+    remote.close()
+    service.server.shutdown()
+    thread.join(5)
+
+
+@pytest.mark.parametrize('bad_date', ["../../evil", "2024-13-01", "2024-01-01/../x", 20240101])
+def test_save_rejects_anything_but_a_date(remote, journal_dir, tmp_path, bad_date):
+    with pytest.raises(ServiceError, match="ValueError"):
+        remote.write_entry(["tea"], bad_date)
+    assert os.listdir(journal_dir) == []
+    assert sorted(os.listdir(tmp_path)) == ["journal", "service.json"]
+
+
+def test_save_writes_the_dated_entry(remote, journal_dir):
+    filename, folder_path = remote.write_entry(["tea", "sun"], "2024-01-01")
+    assert folder_path == journal_dir
+    assert os.listdir(journal_dir) == [filename]
+    assert filename.startswith("2024-01-01 ")
+
+
+def test_write_entry_validates_the_date_without_the_service(journal, journal_dir):
+    with pytest.raises(ValueError):
+        journal.write_entry(["tea"], "../evil")
+    assert os.listdir(journal_dir) == []
+
+
+def test_viewer_operations_share_the_service_deck(remote, journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    write_entry_file(journal_dir, "2024-01-02", ["sun"])
+
+    peeked = remote.peek_random_entry("shuffle")
+    assert remote.peek_random_entry("shuffle").path == peeked.path
+    remote.mark_entry_shown(peeked.path, "shuffle")
+    assert remote.load_random_entry("shuffle").path != peeked.path
+    assert [result.entry.items for result in remote.search("tea")] == [["tea"]]
+
+
+@pytest.fixture
+def silent_server():
+    """A listener that accepts connections and never answers."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    yield {'family': 'inet', 'host': "127.0.0.1", 'port': server.getsockname()[1], 'token': "t"}
+    server.close()
+
+
+def test_a_service_that_stops_answering_is_a_connection_error(silent_server):
+    client = ServiceClient(silent_server, timeout=0.2)
+
+    with pytest.raises(ConnectionError):
+        client.request('random')
+    # Closed, so a late reply can never be taken for the next answer
+    with pytest.raises(ConnectionError):
+        client.request('random')
+
+
+def test_the_window_falls_back_to_its_own_journal(silent_server, journal, journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    window = SimpleNamespace(service=RemoteJournal(ServiceClient(silent_server, timeout=0.2)), journal=journal)
+
+    entry = GratitudeJournal.via_service(window, 'load_random_entry')
+
+    assert entry.items == ["tea"]
+    assert window.service is None
+
+
+def test_serve_listens_on_the_default_port():
+    args = journal_cli.build_parser().parse_args(["serve"])
+    assert args.port == journal_service.DEFAULT_PORT
@@ -0,0 +1,86 @@
+import os
+from datetime import date
+
+from conftest import write_entry_file
+from journal_stats import KIND_PERSON, count_terms, streaks
+
+TODAY = date(2024, 3, 10)
+
+
+def test_streaks_count_consecutive_days():
+    dates = ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-05", "2024-03-09", "2024-03-10"]
+    assert streaks(dates, TODAY) == (2, 3, "2024-03-03")
+
+
+def test_the_current_streak_survives_until_today_is_written():
+    assert streaks(["2024-03-08", "2024-03-09"], TODAY) == (2, 2, "2024-03-09")
+    assert streaks(["2024-03-07", "2024-03-08"], TODAY) == (0, 2, "2024-03-08")
+
+
+def test_streaks_run_across_month_and_leap_days():
+    dates = ["2024-02-28", "2024-02-29", "2024-03-01"]
+    assert streaks(dates, TODAY) == (0, 3, "2024-03-01")
+
+
+def test_streaks_skip_undated_entries_and_handle_none():
+    assert streaks([], TODAY) == (0, 0, None)
+    assert streaks(["not a date", "2024-03-10"], TODAY) == (1, 1, "2024-03-10")
+
+
+def test_count_terms_drops_stopwords_and_finds_people():
+    terms = count_terms(["I'm grateful for coffee with Anna.", "Monday coffee, and Tom called"])
+    assert terms["word"]["coffee"] == 2
+    assert "for" not in terms["word"] and "grateful" not in terms["word"]
+    assert terms[KIND_PERSON] == {"Anna": 1, "Tom": 1}
+
+
+def _write(journal_dir):
+    write_entry_file(journal_dir, "2024-03-08", ["coffee with Anna", "rain"])
+    write_entry_file(journal_dir, "2024-03-09", ["coffee again"])
+    write_entry_file(journal_dir, "2024-03-09", ["long walk"], counter=1)
+    write_entry_file(journal_dir, "2024-02-01", ["snow"])
+
+
+def test_summary_totals_streaks_and_terms(journal, journal_dir):
+    _write(journal_dir)
+    journal.get_index()
+
+    summary = journal.stats.summary(today=TODAY)
+    assert (summary.entries, summary.items) == (4, 5)
+    assert summary.average_items == 1.25
+    assert (summary.first_date, summary.last_date) == ("2024-02-01", "2024-03-09")
+    assert (summary.current_streak, summary.longest_streak) == (2, 2)
+    assert summary.entries_per_month == [("2024-02", 1), ("2024-03", 3)]
+    assert summary.top_words[0] == ("coffee", 2)
+    assert summary.top_people == [("Anna", 1)]
+    assert journal.stats.top_terms(month_to="2024-02") == [("snow", 1)]
+
+
+def test_index_changes_update_the_aggregates_incrementally(journal, journal_dir):
+    _write(journal_dir)
+    index = journal.get_index()
+    journal.stats.summary()
+
+    os.remove(os.path.join(journal_dir, "2024-02-01 Gratitude.md"))
+    changed = write_entry_file(journal_dir, "2024-03-08", ["tea with Anna and Tom"])
+    os.utime(changed, (1, 1))
+    write_entry_file(journal_dir, "2024-03-10", ["coffee"])
+    index.refresh([journal_dir], force=True)
+
+    incremental = journal.stats.summary(today=TODAY)
+    assert (incremental.entries, incremental.current_streak) == (4, 3)
+    assert ("snow", 1) not in incremental.top_words
+    assert dict(incremental.top_people) == {"Anna": 1, "Tom": 1}
+
+    journal.stats.rebuild()
+    assert journal.stats.summary(today=TODAY) == incremental
+
+
+def test_the_cached_summary_is_dropped_on_change(journal, journal_dir):
+    _write(journal_dir)
+    index = journal.get_index()
+    assert journal.stats_summary().entries == 4
+
+    write_entry_file(journal_dir, "2024-03-10", ["coffee"])
+    index.refresh([journal_dir], force=True)
+    assert journal.stats_summary().entries == 5
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from journal_tasks import BackgroundExecutor
+
+
+class FakeRoot:
+    """Just enough of a Tk root for the executor: after() callbacks run by pump()."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay, callback):
+        self.pending.append(callback)
+
+    def run_pending(self):
+        callbacks, self.pending = self.pending, []
+        for callback in callbacks:
+            callback()
+
+    def pump(self, until, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not until():
+            assert time.monotonic() < deadline, "timed out waiting"
+            self.run_pending()
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def busy():
+    return []
+
+
+@pytest.fixture
+def executor(root, busy):
+    executor = BackgroundExecutor(root, poll_interval=1, on_busy_changed=lambda *state: busy.append(state))
+    yield executor
+    executor.shutdown()
+
+
+def test_results_come_back_through_the_poll(executor, root, busy):
+    results = []
+    executor.submit(lambda x: x * 2, 21, on_success=results.append)
+    root.pump(lambda: results)
+    assert results == [42]
+    assert busy == [(True, True), (False, False)]
+
+
+def test_errors_come_back_through_the_poll(executor, root):
+    errors = []
+    executor.submit(lambda: 1 / 0, on_error=errors.append)
+    root.pump(lambda: errors)
+    assert isinstance(errors[0], ZeroDivisionError)
+
+
+def test_a_slow_read_times_out_and_its_late_result_is_dropped(executor, root):
+    release = threading.Event()
+    results, errors = [], []
+    executor.submit(release.wait, on_success=results.append, on_error=errors.append, timeout=0.05)
+    root.pump(lambda: errors)
+    release.set()
+    time.sleep(0.05)
+    root.run_pending()
+    assert isinstance(errors[0], TimeoutError) and results == []
+
+
+def test_a_write_cannot_take_a_timeout(executor):
+    with pytest.raises(ValueError):
+        executor.submit(lambda: None, timeout=1, cancellable=False)
+
+
+def test_a_cancelled_write_still_reports_back(executor, root, busy):
+    release = threading.Event()
+    started = threading.Event()
+    results = []
+
+    def write():
+        started.set()
+        release.wait(5)
+        return "written"
+
+    task = executor.submit(write, on_success=results.append, cancellable=False)
+    assert started.wait(5)
+    assert busy[-1] == (True, False)
+    task.cancel()
+    release.set()
+    root.pump(lambda: results)
+    assert results == ["written"]
+
+
+def test_a_cancelled_read_reports_nothing(executor, root):
+    release = threading.Event()
+    results, errors = [], []
+    task = executor.submit(release.wait, on_success=results.append, on_error=errors.append)
+    task.cancel()
+    release.set()
+    root.pump(lambda: not executor.busy)
+    time.sleep(0.05)
+    assert results == [] and errors == []
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from conftest import write_entry_file
+from journal_index import INDEX_FILENAME, JournalIndex
+from journal_timeline import JournalTimeline
+
+
+@pytest.fixture
+def index(journal_dir):
+    for month in (1, 2, 3):
+        for day in range(1, 8):
+            write_entry_file(journal_dir, f"2024-{month:02d}-{day:02d}", [f"{month}/{day}"])
+    write_entry_file(journal_dir, "2024-01-01", ["second"], counter=1)
+    index = JournalIndex(os.path.join(journal_dir, INDEX_FILENAME))
+    index.refresh([journal_dir])
+    yield index
+    index.close()
+
+
+def test_pages_follow_date_then_counter_order(index):
+    timeline = JournalTimeline(index, page_size=5)
+    assert len(timeline) == 22
+
+    first = timeline.load_page(0)
+    assert [entry.items[0] for entry in first] == ["1/1", "second", "1/2", "1/3", "1/4"]
+    assert len(timeline.load_page(4)) == 2
+    assert timeline.load_page(5) == []
+
+
+def test_entries_are_only_available_once_their_page_is_loaded(index):
+    timeline = JournalTimeline(index, page_size=5)
+    assert timeline.entry_at(7) is None
+    timeline.load_page(1)
+    assert timeline.entry_at(7).items == ["1/7"]
+    assert timeline.load_page(1) is timeline.cached_page(1)
+
+
+def test_only_max_pages_are_kept(index):
+    timeline = JournalTimeline(index, page_size=2, max_pages=3)
+    for page_number in range(5):
+        timeline.load_page(page_number)
+    assert [timeline.cached_page(n) is not None for n in range(5)] == [False, False, True, True, True]
+
+
+def test_position_of_finds_the_first_entry_on_or_after_a_date(index):
+    timeline = JournalTimeline(index)
+    assert timeline.position_of("2024-02") == 8
+    assert timeline.position_of("2024-01-03") == 3
+    assert timeline.position_of("2099") == 21
+
+
+def test_index_changes_mark_it_stale_until_reloaded(index, journal_dir):
+    timeline = JournalTimeline(index)
+    timeline.load_page(0)
+    write_entry_file(journal_dir, "2024-04-01", ["new"])
+    index.refresh([journal_dir], force=True)
+
+    assert timeline.stale
+    timeline.reload()
+    assert not timeline.stale and len(timeline) == 23
+    assert timeline.cached_page(0) is None
+
+
+def test_an_entry_deleted_before_its_page_loads_leaves_no_gap(index):
+    timeline = JournalTimeline(index, page_size=5)
+    gone = timeline.ids[2]
+    with index.lock, index.conn:
+        index.conn.execute("DELETE FROM entries WHERE id = ?", (gone,))
+
+    assert None in timeline.load_page(0)
+    assert timeline.stale
+
+    timeline.reload()
+    page = timeline.load_page(0)
+    assert None not in page and gone not in [entry.id for entry in page]
+    assert not timeline.stale
@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+
+import pytest
+
+import journal_trace
+from journal_export import PRESENTLY_COLUMNS
+from journal_import import PresentlyImporter
+from journal_trace import Tracer, span, traced
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(journal_trace, 'tracer', tracer)
+    yield tracer
+    tracer.enabled = False
+
+
+def _stages(tracer):
+    return {stage['stage']: stage for stage in tracer.summary()}
+
+
+@traced()
+def _traced_function(path):
+    with open(path, 'w') as f:
+        f.write("x")
+    return "done"
+
+
+def test_nothing_is_recorded_until_tracing_starts(tracer, tmp_path):
+    assert span("stage") is journal_trace._NULL_SPAN
+    assert _traced_function(str(tmp_path / "f")) == "done"
+    assert tracer.summary() == []
+
+
+def test_io_is_charged_to_the_innermost_span_and_its_parents(tracer, tmp_path):
+    tracer.start(str(tmp_path / "trace.json"))
+    with span("outer"):
+        _traced_function(str(tmp_path / "f"))
+        with span("inner"):
+            with open(tmp_path / "f") as f:
+                f.read()
+            os.listdir(tmp_path)
+
+    stages = _stages(tracer)
+    assert (stages["_traced_function"]['writes'], stages["_traced_function"]['reads']) == (1, 0)
+    assert (stages["inner"]['reads'], stages["inner"]['listings']) == (1, 1)
+    assert (stages["outer"]['writes'], stages["outer"]['reads'], stages["outer"]['listings']) == (1, 1, 1)
+
+
+def test_finish_writes_a_chrome_trace_and_a_summary(tracer, tmp_path, capsys):
+    trace_path = str(tmp_path / "trace.json")
+    tracer.start(trace_path)
+    with span("saved", entries=2):
+        pass
+    with pytest.raises(ValueError):
+        with span("failed"):
+            raise ValueError("boom")
+    tracer.finish()
+
+    with open(trace_path, encoding='utf-8') as f:
+        events = {event['name']: event for event in json.load(f)['traceEvents'] if event['ph'] == 'X'}
+    assert events["saved"]['args'] == {'entries': 2}
+    assert events["failed"]['args'] == {'error': True}
+    with open(str(tmp_path / "trace.summary.json"), encoding='utf-8') as f:
+        summary = json.load(f)
+    assert {stage['stage'] for stage in summary['stages']} == {"saved", "failed"}
+    assert "Trace written to" in capsys.readouterr().err
+    assert not tracer.enabled
+
+
+def test_the_presently_write_stage_is_traced(tracer, journal_dir, tmp_path):
+    csv_path = str(tmp_path / "backup.csv")
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(PRESENTLY_COLUMNS)
+        writer.writerows([("2024-01-01", "tea"), ("2024-01-02", "sun"), ("2024-01-03", "rain")])
+    tracer.start(str(tmp_path / "trace.json"))
+
+    PresentlyImporter(csv_path, journal_dir, workers=1, batch_size=3).run()
+
+    stages = _stages(tracer)
+    write_stage = stages["EntryImporter._write_batch"]
+    assert write_stage['calls'] == 1
+    assert write_stage['writes'] >= 3 and write_stage['renames'] == 3
+    # Batches are written on worker threads, so their I/O is not charged to run()
+    assert stages["PresentlyImporter.run"]['calls'] == 1
+
+
+def test_start_from_environment(tracer, tmp_path, monkeypatch):
+    monkeypatch.setenv(journal_trace.TRACE_ENV_VAR, "off")
+    assert journal_trace.start_from_environment() is False
+
+    trace_path = str(tmp_path / "env-trace.json")
+    monkeypatch.setenv(journal_trace.TRACE_ENV_VAR, trace_path)
+    assert journal_trace.start_from_environment() is True
+    assert tracer.path == trace_path
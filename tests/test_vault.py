@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+
+from conftest import write_entry_file
+from journal_vault import DEFAULT_RULES, VaultImporter, load_vault_rules, note_date, parse_note
+
+
+def _note(folder, name, content):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path
+
+
+DAILY_NOTE = """# Monday
+
+Met Anna for lunch.
+
+## Things I'm grateful for
+- the sun
+* [x] a long walk
+1. fresh bread
+
+## Tasks
+- buy milk
+"""
+
+
+def test_a_date_in_the_filename_wins_over_front_matter():
+    front_matter = "---\ntitle: x\ncreated: 2023-05-06\n---\nbody"
+    assert note_date("2024-01-02 Daily.md", front_matter) == "2024-01-02"
+    assert note_date("Daily.md", front_matter) == "2023-05-06"
+    assert note_date("Daily.md", "---\ndate: '2023-07-08'\n---\n") == "2023-07-08"
+
+
+def test_impossible_dates_are_not_note_dates():
+    assert note_date("2024-02-30.md", "---\ndate: 2024-02-29\n---\n") == "2024-02-29"
+    assert note_date("Daily.md", "---\ndate: 2023-13-01\n---\n") is None
+    assert note_date("Daily.md", "created: 2023-05-06 outside front matter") is None
+
+
+def test_the_gratitude_section_stops_at_the_next_heading():
+    assert parse_note("2024-01-02.md", DAILY_NOTE) == ("2024-01-02", ["the sun", "a long walk", "fresh bread"])
+
+
+def test_the_journal_rule_reads_the_apps_own_files():
+    content = "## Three things I'm grateful for today:\n1. tea\n2. sun\n\n---\nTags: #gratitude"
+    assert parse_note("2024-01-02 Gratitude_1.md", content) == ("2024-01-02", ["tea", "sun"])
+
+
+def test_notes_without_a_gratitude_section_have_no_items():
+    assert parse_note("2024-01-02.md", "# Shopping\n- milk\n") == (None, [])
+
+
+def test_custom_rules_are_loaded_from_json(tmp_path):
+    rules_path = str(tmp_path / "rules.json")
+    with open(rules_path, 'w', encoding='utf-8') as f:
+        json.dump([{"name": "thanks", "item_pattern": r"^Thanks: (.+)$"}], f)
+    rules = load_vault_rules(rules_path)
+
+    assert [rule.name for rule in rules] == ["thanks"]
+    assert parse_note("2024-01-02.md", "Thanks: tea\nThanks: sun\nother", rules) == ("2024-01-02", ["tea", "sun"])
+
+
+@pytest.mark.parametrize("specs", [[], {"item_pattern": "x"}, [{"name": "no pattern"}], [{"item_pattern": "("}]])
+def test_invalid_rule_files_are_refused(tmp_path, specs):
+    rules_path = str(tmp_path / "rules.json")
+    with open(rules_path, 'w', encoding='utf-8') as f:
+        json.dump(specs, f)
+    with pytest.raises(ValueError):
+        load_vault_rules(rules_path)
+
+
+def test_vault_import_counts_notes_and_skips_what_it_already_has(journal_dir, tmp_path):
+    vault = str(tmp_path / "vault")
+    _note(vault, "2024-01-02.md", DAILY_NOTE)
+    _note(os.path.join(vault, "daily"), "2024-01-03.md", "## Gratitude\n- rain\n")
+    _note(vault, "Undated.md", "## Thankful\n- cake\n")
+    _note(vault, "Shopping.md", "- milk\n")
+    _note(os.path.join(vault, ".trash"), "2024-01-04.md", "## Gratitude\n- deleted\n")
+    write_entry_file(journal_dir, "2024-01-05", ["journal folder"])
+
+    first = VaultImporter(vault, journal_dir, rules=DEFAULT_RULES, exclude_paths=[journal_dir],
+                          workers=1, batch_size=2, known_keys=set()).run()
+    assert (first.imported, first.skipped, first.failed) == (2, 1, 1)
+    written = sorted(name for name in os.listdir(journal_dir) if name.startswith("2024-01-0"))
+    assert written == ["2024-01-02 Gratitude.md", "2024-01-03 Gratitude.md", "2024-01-05 Gratitude.md"]
+
+
+def test_the_journal_folder_cannot_be_the_vault(journal_dir):
+    with pytest.raises(ValueError):
+        VaultImporter(journal_dir, journal_dir, exclude_paths=[journal_dir], workers=1).run()
+
+
+def test_reimporting_a_vault_adds_nothing(journal, tmp_path):
+    vault = str(tmp_path / "vault")
+    _note(vault, "2024-01-02.md", DAILY_NOTE)
+
+    assert journal.vault_importer(vault, workers=1).run().imported == 1
+    again = journal.vault_importer(vault, workers=1).run()
+    assert (again.imported, again.skipped) == (0, 1)
@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+
+import pytest
+
+import journal_writer
+from conftest import write_entry_file
+from journal_core import Journal
+from journal_entries import entry_filename, parse_entry_items
+from journal_writer import LOCK_PREFIX, TEMP_PREFIX, EntryWriter, FilenameAllocator, _publish
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_allocator_continues_after_existing_files(journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    write_entry_file(journal_dir, "2024-01-01", ["sun"], counter=3)
+    allocator = FilenameAllocator(journal_dir)
+    assert os.path.basename(allocator.allocate("2024-01-01")) == entry_filename("2024-01-01", 4)
+    assert os.path.basename(allocator.allocate("2024-01-01")) == entry_filename("2024-01-01", 5)
+    assert os.path.basename(allocator.allocate("2024-01-02")) == entry_filename("2024-01-02", 0)
+
+
+def test_allocator_lists_the_folder_when_lookup_has_no_answer(journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    allocator = FilenameAllocator(journal_dir, lookup=lambda date_str: None)
+    assert os.path.basename(allocator.allocate("2024-01-01")) == entry_filename("2024-01-01", 1)
+
+
+def test_writer_skips_a_name_taken_since_it_was_allocated(journal_dir):
+    writer = EntryWriter(journal_dir)
+    taken = writer.allocator.allocate("2024-01-01")
+    # Another machine creates the file first
+    write_entry_file(journal_dir, "2024-01-01", ["theirs"])
+
+    path = writer.write("2024-01-01", "mine", taken)
+    assert path != taken
+    assert _read(path) == "mine"
+    assert parse_entry_items(_read(taken)) == ["theirs"]
+
+
+def test_concurrent_writers_never_overwrite_each_other(journal_dir):
+    # Two writers with separate counter maps, as on two machines sharing a folder
+    writers = [EntryWriter(journal_dir), EntryWriter(journal_dir)]
+    paths = []
+    lock = threading.Lock()
+
+    def write(writer, n):
+        for i in range(20):
+            path = writer.write("2024-01-01", f"{n}-{i}")
+            with lock:
+                paths.append(path)
+
+    threads = [threading.Thread(target=write, args=(writers[n % 2], n)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(paths)) == 80
+    assert sorted(_read(path) for path in paths) == sorted(f"{n}-{i}" for n in range(4) for i in range(20))
+    assert not [name for name in os.listdir(journal_dir) if name.startswith(".tmp-")]
+
+
+def test_saving_does_not_open_the_index(journal, journal_dir):
+    write_entry_file(journal_dir, "2024-01-01", ["tea"])
+    first, _ = journal.write_entry(["sun"], "2024-01-01")
+    second, _ = journal.write_entry(["rain"], "2024-01-01")
+
+    assert journal.index is None
+    assert {first, second} == {entry_filename("2024-01-01", 1), entry_filename("2024-01-01", 2)}
+    # Picked up the next time the index is opened
+    assert journal.get_index().count() == 3
+
+
+@pytest.fixture
+def no_hard_links(monkeypatch):
+    def link(source, target):
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(os, 'link', link)
+
+
+def test_without_hard_links_no_empty_entry_is_ever_visible(journal_dir, no_hard_links, monkeypatch):
+    replace = os.replace
+
+    def checked_replace(source, target):
+        assert not os.path.exists(target)
+        assert os.path.exists(os.path.join(journal_dir, LOCK_PREFIX + os.path.basename(target)))
+        replace(source, target)
+
+    monkeypatch.setattr(os, 'replace', checked_replace)
+    taken = write_entry_file(journal_dir, "2024-01-01", ["theirs"])
+
+    path = EntryWriter(journal_dir).write("2024-01-01", "mine", taken)
+
+    assert os.path.basename(path) == entry_filename("2024-01-01", 1)
+    assert _read(path) == "mine"
+    assert sorted(os.listdir(journal_dir)) == [entry_filename("2024-01-01", 0), entry_filename("2024-01-01", 1)]
+
+
+def test_a_held_lock_is_treated_as_a_taken_name(journal_dir, no_hard_links):
+    temp = os.path.join(journal_dir, TEMP_PREFIX + "x.md")
+    final = os.path.join(journal_dir, entry_filename("2024-01-01", 0))
+    with open(temp, 'w') as f:
+        f.write("mine")
+    open(os.path.join(journal_dir, LOCK_PREFIX + os.path.basename(final)), 'w').close()
+
+    with pytest.raises(FileExistsError):
+        _publish(temp, final)
+    assert not os.path.exists(final)
+
+
+def test_opening_a_writer_sweeps_stale_temp_files(journal_dir, monkeypatch):
+    monkeypatch.setattr(journal_writer, '_swept', set())
+    stale = [os.path.join(journal_dir, TEMP_PREFIX + "old.md"), os.path.join(journal_dir, LOCK_PREFIX + "old.md")]
+    fresh = os.path.join(journal_dir, TEMP_PREFIX + "in-progress.md")
+    for path in stale + [fresh]:
+        open(path, 'w').close()
+    old = time.time() - journal_writer.STALE_AFTER - 60
+    for path in stale:
+        os.utime(path, (old, old))
+
+    EntryWriter(journal_dir)
+    assert os.listdir(journal_dir) == [os.path.basename(fresh)]
+
+    # Only the first writer for a folder lists it
+    os.utime(fresh, (old, old))
+    EntryWriter(journal_dir)
+    assert os.path.exists(fresh)
+
+
+def test_saves_reach_the_mirrors_before_the_index_is_opened(tmp_path):
+    first, second = str(tmp_path / "a"), str(tmp_path / "b")
+    journal = Journal([first], save_folder_paths=[first], mirror_folder_paths=[first, second])
+    try:
+        filename, folder = journal.write_entry(["tea"], "2024-01-01")
+
+        assert journal.index is None
+        assert folder == first
+        assert _read(os.path.join(second, filename)) == _read(os.path.join(first, filename))
+        assert journal.get_index().count() == 2
+        assert journal.get_mirror().index is journal.index
+    finally:
+        journal.close()